@@ -1,8 +1,10 @@
 # type: ignore
-import pandas as pd
-import numpy as np  # Add this import for NaN handling
+import math, threading
+
+import numpy as np
+from airport_data.snapshot import build_code_index, load_snapshot, snapshot_value
 from .types import AirportBase
-from typing import Tuple
+from typing import Dict, Tuple
 
 
 class AirportBaseAIS:
@@ -24,23 +26,47 @@ class AirportBaseAIS:
         "USER_FEE_FLAG", "CTA"
     ]
 
-    try:
-        df = pd.read_csv("APT_BASE.csv", names=column_names, header=0)
-    except Exception as e:
-        raise RuntimeError("APT_BASE.csv does not exist or is not in the current directory.")
+    source_path = "APT_BASE.csv"
+    # Only the columns lookups need are kept in the snapshot
+    snapshot_columns = ["ARPT_ID", "ICAO_ID", "ARPT_NAME", "COUNTRY_CODE", "STATE_NAME", "LAT_DECIMAL", "LONG_DECIMAL", "ELEV"]
+
+    # Loaded on first use, see _load
+    _data: np.ndarray | None = None
+    _code_index: Dict[str, int] = {}
+    _load_lock = threading.Lock()
+
+    @staticmethod
+    def _read_source():
+        import pandas as pd
+        return pd.read_csv(AirportBaseAIS.source_path, names=AirportBaseAIS.column_names, header=0)
+
+    @staticmethod
+    def _load() -> np.ndarray:
+        if AirportBaseAIS._data is None:
+            with AirportBaseAIS._load_lock:
+                if AirportBaseAIS._data is None:
+                    try:
+                        data = load_snapshot(AirportBaseAIS.source_path, AirportBaseAIS.snapshot_columns, AirportBaseAIS._read_source)
+                    except Exception as e:
+                        raise RuntimeError("APT_BASE.csv does not exist or is not in the current directory.") from e
+                    if len(data) == 0:
+                        raise RuntimeError("APT_BASE.csv is empty. Check if the file exists and is correctly formatted.")
+
+                    AirportBaseAIS._code_index = build_code_index(data["ARPT_ID"].tolist(), data["ICAO_ID"].tolist())
+                    AirportBaseAIS._data = data
+        return AirportBaseAIS._data
 
     @staticmethod
     def _get_airport_info(airport_code: str, column_name: str):
-        if AirportBaseAIS.df.empty:
-            raise RuntimeError("APT_BASE.csv is empty. Check if the file exists and is correctly formatted.")
+        AirportBaseAIS._load()
 
-        airport = AirportBaseAIS.df[(AirportBaseAIS.df["ARPT_ID"] == airport_code) | (AirportBaseAIS.df["ICAO_ID"] == airport_code)]
-        if airport.empty:
+        position = AirportBaseAIS._code_index.get(airport_code)
+        if position is None:
             raise ValueError(f"Airport code '{airport_code}' not found in APT_BASE. Check for typos or use a valid code.")
 
-        value = airport.iloc[0][column_name]
+        value = snapshot_value(AirportBaseAIS._data, column_name, position)
         # Handle NaN values explicitly
-        if pd.isna(value):  # Check if the value is NaN
+        if isinstance(value, float) and math.isnan(value):
             return None
         return None if value == "" else value
 
@@ -1,44 +1,73 @@
 # type: ignore
-import pandas as pd
+import threading
 
+import numpy as np
+
+from .snapshot import build_code_index, load_snapshot, snapshot_value
 from .types import Airport
 
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 
 class AirportData:
     column_names = ["Airport ID", "Name", "City", "Country", "IATA", "ICAO", "Latitude", "Longitude", 
                "Altitude", "Timezone", "DST", "Tz Database Timezone", "Type", "Source"]
+    source_path = "airports.dat"
+    # Only the columns lookups need are kept in the snapshot
+    snapshot_columns = ["Name", "Country", "IATA", "ICAO", "Latitude", "Longitude", "Altitude", "Tz Database Timezone"]
 
-    try:
-        df = pd.read_csv("airports.dat", names=column_names, header=1)
-    except Exception as e:
-        raise RuntimeError("airports_data does not exist or is not in the current directory. Make sure you have run create_airport_data.py to generate the file.")
+    # Loaded on first use, see _load
+    _data: np.ndarray | None = None
+    _code_index: Dict[str, int] = {}
+    _airports: Dict[int, Airport] = {}
+    _load_lock = threading.Lock()
 
     @staticmethod
-    def _get_airport_info(airport_code: str, column_name: str):
+    def _read_source():
+        import pandas as pd
+        return pd.read_csv(AirportData.source_path, names=AirportData.column_names, header=1)
+
+    @staticmethod
+    def _load() -> np.ndarray:
         '''
-        Helper method to retrieve airport information by code.
+        Loads the airport data and builds the code index the first time it is needed.
 
-        Args:
-            airport_code (str): Airport code (IATA or ICAO).
-            column (str): The column name to retrieve.
+        Raises:
+            RuntimeError: If the airport data file is missing or empty.
+        '''
+        if AirportData._data is None:
+            with AirportData._load_lock:
+                if AirportData._data is None:
+                    try:
+                        data = load_snapshot(AirportData.source_path, AirportData.snapshot_columns, AirportData._read_source)
+                    except Exception as e:
+                        raise RuntimeError("airports_data does not exist or is not in the current directory. Make sure you have run create_airport_data.py to generate the file.") from e
+                    if len(data) == 0:
+                        raise RuntimeError("airports_data is empty. Check if the file exists and is correctly formatted.")
+
+                    AirportData._code_index = build_code_index(data["IATA"].tolist(), data["ICAO"].tolist())
+                    AirportData._data = data
+        return AirportData._data
 
-        Returns:
-            Any: The value from the specified column.
+    @staticmethod
+    def _get_airport_position(airport_code: str) -> int:
+        '''
+        Returns the row position of the airport with the IATA or ICAO code.
 
         Raises:
             RuntimeError: If the airport data file is missing or empty.
-            ValueError: If the airport code is not found or the requested value is missing.
+            ValueError: If the airport code is not found.
         '''
-        if AirportData.df.empty:
-            raise RuntimeError("airports_data is empty. Check if the file exists and is correctly formatted.")
+        AirportData._load()
 
-        airport = AirportData.df[(AirportData.df["IATA"] == airport_code) | (AirportData.df["ICAO"] == airport_code)]
-        if airport.empty:
+        position = AirportData._code_index.get(airport_code)
+        if position is None:
             raise ValueError(f"Airport code '{airport_code}' not found in airports_data.")
+        return position
 
-        value = airport.iloc[0][column_name]
+    @staticmethod
+    def _get_value(position: int, column_name: str):
+        value = snapshot_value(AirportData._data, column_name, position)
 
         # airport.dat created by 'create_airport_csv.py' encodes null values as '\N'
         #   Accessed columns with null values ('\N')
@@ -49,6 +78,24 @@ class AirportData:
             return None
         return value
 
+    @staticmethod
+    def _get_airport_info(airport_code: str, column_name: str):
+        '''
+        Helper method to retrieve airport information by code.
+
+        Args:
+            airport_code (str): Airport code (IATA or ICAO).
+            column (str): The column name to retrieve.
+
+        Returns:
+            Any: The value from the specified column.
+
+        Raises:
+            RuntimeError: If the airport data file is missing or empty.
+            ValueError: If the airport code is not found or the requested value is missing.
+        '''
+        return AirportData._get_value(AirportData._get_airport_position(airport_code), column_name)
+
     @staticmethod
     def get_airport_latlong(airport_code: str) -> Tuple[float, float]:
         ''' Retrieves the latitude and longitude of an airport. '''
@@ -98,12 +145,38 @@ class AirportData:
             ValueError: If the airport code is not found.
 
         '''
-        return Airport(
-            name=AirportData.get_airport_name(airport_code),
-            country=AirportData.get_airport_country(airport_code),
-            iata=AirportData.get_airport_iata(airport_code),
-            icao=AirportData.get_airport_icao(airport_code),
-            coordinates=AirportData.get_airport_latlong(airport_code),
-            elevation=AirportData.get_airport_elevation(airport_code),
-            tz_name=AirportData.get_airport_tz_name(airport_code),
-        )
\ No newline at end of file
+        position = AirportData._get_airport_position(airport_code)
+        airport = AirportData._airports.get(position)
+        if airport is None:
+            airport = Airport(
+                name=AirportData._get_value(position, "Name"),
+                country=AirportData._get_value(position, "Country"),
+                iata=AirportData._get_value(position, "IATA"),
+                icao=AirportData._get_value(position, "ICAO"),
+                coordinates=(float(AirportData._get_value(position, "Latitude")), float(AirportData._get_value(position, "Longitude"))),
+                elevation=int(AirportData._get_value(position, "Altitude")),
+                tz_name=AirportData._get_value(position, "Tz Database Timezone"),
+            )
+            AirportData._airports[position] = airport
+        return airport
+
+    @staticmethod
+    def get_airports(airport_codes: List[str]) -> List[Airport]:
+        '''
+        Returns an Airport object for each Airport code, in the same order.
+        Args:
+            airport_codes (List[str]): Airport codes (IATA or ICAO).
+
+        Returns:
+            List[Airport]: The airports associated with the codes.
+
+        Raises:
+            ValueError: If any airport code is not found. The message lists every code not found.
+
+        '''
+        AirportData._load()
+
+        missing = [code for code in airport_codes if code not in AirportData._code_index]
+        if missing:
+            raise ValueError(f"Airport codes {missing} not found in airports_data.")
+        return [AirportData.get_airport(code) for code in airport_codes]
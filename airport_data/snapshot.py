@@ -0,0 +1,115 @@
+'''
+Compact binary snapshots of airport CSV files.
+
+Parsing a CSV with pandas takes most of a cold start, so the columns a lookup needs are saved once as a NumPy
+structured array. Later runs memory-map the snapshot without importing pandas. A snapshot is rebuilt
+whenever the size or modification time of its source file changes.
+'''
+from typing import Any, Callable, Dict, Iterable, List, TYPE_CHECKING
+import json, logging, os
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SNAPSHOT_DIR = "__snapshot__"
+SNAPSHOT_VERSION = 2
+
+logger = logging.getLogger("AirportSnapshot")
+
+
+def _snapshot_paths(source_path: str) -> tuple[str, str]:
+    directory, name = os.path.split(os.path.abspath(source_path))
+    snapshot_dir = os.path.join(directory, SNAPSHOT_DIR)
+    return os.path.join(snapshot_dir, f"{name}.npy"), os.path.join(snapshot_dir, f"{name}.json")
+
+
+def _to_structured_array(df: "pd.DataFrame", columns: List[str]) -> np.ndarray:
+    '''
+    Converts columns of df to a structured array.
+
+    Numeric columns keep their dtype. Every other column is stored as fixed width UTF-8 bytes with missing values as "".
+    '''
+    arrays = []
+    for column in columns:
+        values = df[column]
+        if values.dtype.kind in "iuf":
+            arrays.append(values.to_numpy())
+        else:
+            arrays.append(np.array([value.encode() if isinstance(value, str) else b"" for value in values], dtype=bytes))
+    return np.rec.fromarrays(arrays, names=columns).view(np.ndarray)
+
+
+def load_snapshot(source_path: str, columns: List[str], read_source: Callable[[], "pd.DataFrame"]) -> np.ndarray:
+    '''
+    Returns columns of source_path as a structured array.
+
+    The array is memory-mapped from the snapshot when one exists for the current version of source_path.
+    Otherwise read_source is called to parse the file and the snapshot is rebuilt from the result.
+
+    Args:
+        source_path (str): The CSV file the snapshot is built from.
+        columns (List[str]): The columns to keep.
+        read_source (Callable[[], pd.DataFrame]): Parses source_path.
+
+    Returns:
+        np.ndarray: A structured array with one field per column.
+
+    Raises:
+        OSError: If source_path does not exist.
+    '''
+    source_stat = os.stat(source_path)
+    signature = {
+        "version": SNAPSHOT_VERSION,
+        "size": source_stat.st_size,
+        "mtime_ns": source_stat.st_mtime_ns,
+        "columns": columns,
+    }
+    snapshot_path, signature_path = _snapshot_paths(source_path)
+
+    try:
+        with open(signature_path) as file:
+            if json.load(file) == signature:
+                return np.load(snapshot_path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    logger.info(f"Building snapshot of {source_path}")
+    data = _to_structured_array(read_source(), columns)
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        # Write to temporary files first so a concurrent reader never sees a partial snapshot
+        np.save(f"{snapshot_path}.tmp.npy", data)
+        os.replace(f"{snapshot_path}.tmp.npy", snapshot_path)
+        with open(f"{signature_path}.tmp", "w") as file:
+            json.dump(signature, file)
+        os.replace(f"{signature_path}.tmp", signature_path)
+    except OSError as e:
+        logger.warning(f"Could not save snapshot of {source_path}: {e}")
+    return data
+
+
+def snapshot_value(data: np.ndarray, column: str, position: int) -> Any:
+    '''
+    Returns the value of column at position as a Python object, decoding strings.
+    '''
+    value = data[column][position].item()
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
+
+
+def build_code_index(*code_columns: Iterable[bytes]) -> Dict[str, int]:
+    '''
+    Maps every code in the code columns to the position of the first row with that code.
+
+    Matches the row a scan of all code columns would find first. Empty codes and '\\N' (null in airports.dat) are skipped.
+    '''
+    index: Dict[str, int] = {}
+    for position, codes in enumerate(zip(*code_columns)):
+        for code in codes:
+            code = code.decode()
+            if code and code != "\\N":
+                index.setdefault(code, position)
+    return index
@@ -0,0 +1,99 @@
+from dotenv import load_dotenv
+import argparse, logging, os, sys
+
+from airport_data.airport_data import AirportData
+from airport_code_validator.airport_code_validator import AirportCodeValidator
+from briefing_config import CORRIDOR_WIDTH_NM, ROUTE_WAYPOINT_GAP_MILES
+from notam_fetcher import NotamFetcher, RateLimiter, SQLiteNotamCache, SQLiteNotamSyncStore
+from notam_fetcher.exceptions import NotamFetcherRateLimitError, NotamFetcherRequestError, NotamFetcherUnauthenticatedError
+from notam_printer.notam_printer import NotamPrinter
+from route_briefing import BatchBriefer
+from sorting_algorithm.sorting_algorithm import NotamSorter
+
+logger = logging.getLogger("batch_driver")
+
+
+def get_routes_input() -> list[tuple[str, str]]:
+    """
+    Parses command-line arguments into (departure, destination) airport codes.
+
+    Routes are given as DEP-DEST arguments, or one "DEP DEST" per line of a file.
+    """
+    parser = argparse.ArgumentParser(description="Brief many routes at once, fetching shared regions once.")
+    parser.add_argument("routes", nargs="*", help="Routes as DEP-DEST airport codes, ex: JFK-LAX")
+    parser.add_argument("--file", help="File with one route per line, as DEP DEST")
+    args = parser.parse_args()
+
+    routes = [tuple(route.split("-", 1)) for route in args.routes]
+    if args.file:
+        with open(args.file) as file:
+            routes += [tuple(line.split()[:2]) for line in file if line.strip() and not line.startswith("#")]
+    if not routes or any(len(route) != 2 for route in routes):
+        parser.error("give at least one route as DEP-DEST or in --file")
+    return routes
+
+
+def main():
+    """
+    Briefs a batch of routes:
+    - Load environment variables for CLIENT_ID and CLIENT_SECRET
+    - Validates every route's airports.
+    - Merges the NOTAM queries of all routes with BatchBriefer, fetching each shared region once.
+    - Prints each route's NOTAMs sorted by NotamSorter, with a warning listing the areas of the route whose NOTAMs
+      could not be fetched in time, then what batching saved.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(name)s] [%(levelname)s] %(message)s')
+
+    load_dotenv()
+    CLIENT_ID = os.getenv("CLIENT_ID")
+    CLIENT_SECRET = os.getenv("CLIENT_SECRET")
+
+    if CLIENT_ID is None:
+        logger.error("CLIENT_ID not set in .env file")
+        sys.exit("Error: CLIENT_ID not set in .env file")
+    if CLIENT_SECRET is None:
+        sys.exit("Error: CLIENT_SECRET not set in .env file")
+
+    routes = []
+    for departure_code, destination_code in get_routes_input():
+        try:
+            departure, destination = AirportData.get_airport(departure_code), AirportData.get_airport(destination_code)
+        except ValueError as e:
+            sys.exit(str(e))
+        for airport in (departure, destination):
+            if not AirportCodeValidator.is_valid(airport):
+                sys.exit(f"Invalid airport {airport}. Please enter valid airport codes.")
+        routes.append((departure, destination))
+
+    notam_fetcher = NotamFetcher(CLIENT_ID, CLIENT_SECRET, timeout=300,
+                                 cache=SQLiteNotamCache("notam_cache.sqlite3", ttl=600),
+                                 rate_limiter=RateLimiter.shared("notam_rate_limit.sqlite3"),
+                                 sync_store=SQLiteNotamSyncStore("notam_sync.sqlite3"))
+    briefer = BatchBriefer(notam_fetcher, corridor_width=CORRIDOR_WIDTH_NM, waypoint_gap=ROUTE_WAYPOINT_GAP_MILES)
+
+    try:
+        briefings, report = briefer.brief(routes)
+    except NotamFetcherUnauthenticatedError:
+        logging.error("Invalid client_id or secret.")
+        sys.exit("Invalid client_id or secret.")
+    except NotamFetcherRequestError:
+        logging.error("Failed to retrieve NOTAMs due to a network issue.")
+        sys.exit("Failed to retrieve NOTAMs due to a network issue.")
+    except NotamFetcherRateLimitError:
+        logging.error("Failed to retrieve NOTAMs due to rate limits.")
+        sys.exit("Failed to retrieve NOTAMs due to rate limits.")
+
+    printer = NotamPrinter(max_lines=3)
+    for briefing in briefings:
+        print("=" * 80)
+        print(f"{briefing.departure.icao} -> {briefing.destination.icao}: {len(briefing.notams)} NOTAMs")
+        print("=" * 80)
+        printer.print_notams(NotamSorter([notam.notam for notam in briefing.notams]).iter_ranked())
+        if not briefing.complete:
+            print(f"WARNING: NOTAMs could not be fetched in time for {len(briefing.uncovered)} areas along this route, "
+                  f"centered at: " + ", ".join(f"({query.center[0]:.2f}, {query.center[1]:.2f})" for query in briefing.uncovered))
+
+    print(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+'''
+Per-page cost of parsing an API response.
+
+    python -m benchmarks.bench_parse_response
+
+Compares decoding the body to dicts and validating them against each response model in turn (the previous
+NotamFetcher path) with validating the raw bytes in one pass (_parse_response).
+'''
+import json
+
+from notam_fetcher.notam_fetcher import _parse_response, _validate_response
+from .synthetic import iter_corpus, paginate
+from .timing import time_calls
+
+
+def run(page_size: int = 1000, repeat: int = 20) -> dict[str, float]:
+    '''
+    Returns the median seconds to parse one page with each path.
+    '''
+    content = json.dumps(next(paginate(iter_corpus(page_size), page_size, page_size))).encode()
+    error_content = json.dumps({"error": "Invalid client id or secret"}).encode()
+
+    def parse_error():
+        try:
+            _parse_response(error_content)
+        except Exception:
+            pass
+
+    return {
+        "dict_then_validate": time_calls(lambda: _validate_response(json.loads(content)), repeat)["seconds"],
+        "validate_json": time_calls(lambda: _parse_response(content), repeat)["seconds"],
+        "error_response": time_calls(parse_error, repeat)["seconds"],
+    }
+
+
+def main():
+    page_size = 1000
+    results = run(page_size)
+    for name, seconds in results.items():
+        print(f"{name:>20}: {seconds * 1000:8.2f} ms per page of {page_size} items")
+    print(f"{'speedup':>20}: {results['dict_then_validate'] / results['validate_json']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+'''
+End-to-end benchmark of every stage of a briefing, offline.
+
+    python -m benchmarks.bench_pipeline [--output results.json] [--baseline benchmarks/baseline.json]
+
+Times each stage driver.py runs on synthetic NOTAMs: looking up airports, generating route waypoints on a short and
+a coast-to-coast route, parsing response pages, deduplicating the NOTAMs of overlapping queries, sorting by score
+and printing. NOTAM stages run at 1, 100, 10k and 100k NOTAMs.
+
+Results are written as JSON. Given a baseline (a previous results file), every case slower than its baseline by more
+than --tolerance is reported and the exit status is 1. Baselines are machine specific: regenerate
+benchmarks/baseline.json with --output benchmarks/baseline.json on the machine the suite is compared on.
+'''
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse, io, json, math, platform, sys
+
+from rich.console import Console
+
+from airport_data.airport_data import AirportData
+from flight_path.flight_path import FlightPath
+from notam_fetcher.notam_fetcher import _parse_response, _unique_notams
+from notam_printer.notam_printer import NotamPrinter
+from sorting_algorithm.sorting_algorithm import NotamSorter
+from .synthetic import iter_corpus, paginate
+from .timing import time_calls
+
+SCALES = (1, 100, 10_000, 100_000)
+ROUTES = {"short": ("JFK", "BOS"), "coast_to_coast": ("JFK", "LAX")}
+AIRPORT_CODES = ["JFK", "KLAX", "ORD", "KATL", "DFW", "KDEN", "SEA", "KBOS"]
+# Fraction of the NOTAMs returned twice by overlapping queries
+DUPLICATE_FRACTION = 0.3
+# Total seconds each case is repeated for, at least once and at most MAX_REPEAT times
+TIME_BUDGET = 1.0
+MAX_REPEAT = 50
+# Cases faster than this many seconds in the baseline are too noisy to flag
+MIN_SECONDS = 0.001
+
+Results = Dict[str, Dict[str, float]]
+
+
+def _overlapping_batches(notams: List[Any]) -> List[List[Any]]:
+    '''
+    Splits notams into the responses of 10 overlapping queries, DUPLICATE_FRACTION of them returned twice.
+    '''
+    batch_size = max(1, math.ceil(len(notams) / 10))
+    batches = [notams[start:start + batch_size] for start in range(0, len(notams), batch_size)]
+    overlap = math.ceil(batch_size * DUPLICATE_FRACTION)
+    return [batch + batches[position + 1][:overlap] if position + 1 < len(batches) else batch
+            for position, batch in enumerate(batches)]
+
+
+def run(scales: Sequence[int] = SCALES, routes: Dict[str, Tuple[str, str]] = ROUTES,
+        log: Callable[[str], None] = lambda message: None) -> Results:
+    '''
+    Returns the timings of every case, keyed "stage/case".
+    '''
+    results: Results = {}
+
+    def record(name: str, function: Callable[[], object]):
+        results[name] = time_calls(function, time_budget=TIME_BUDGET, max_repeat=MAX_REPEAT)
+        log(f"{name:>28}: {results[name]['seconds'] * 1000:10.3f} ms (x{results[name]['repeat']:g})")
+
+    record("get_airport/8", lambda: [AirportData.get_airport(code) for code in AIRPORT_CODES])
+    for route, (departure, destination) in routes.items():
+        flight_path = FlightPath(AirportData.get_airport(departure), AirportData.get_airport(destination))
+        record(f"waypoints/{route}", lambda: flight_path.get_waypoints_by_gap(20))
+
+    printer = NotamPrinter(max_lines=3)
+    for count in scales:
+        pages = [json.dumps(page).encode() for page in paginate(iter_corpus(count), count)]
+        record(f"parse/{count}", lambda: [_parse_response(page) for page in pages])
+
+        core_notams = [item.properties.coreNOTAMData for page in pages for item in _parse_response(page).items]
+        batches = _overlapping_batches(core_notams)
+        record(f"dedupe/{count}", lambda: _unique_notams(batches))
+
+        notams = [core.notam for core in core_notams]
+        record(f"sort/{count}", lambda: NotamSorter(notams).sort_by_score())
+        record(f"print/{count}", lambda: printer.print_notams(notams, Console(file=io.StringIO(), width=120)))
+    return results
+
+
+def compare(results: Results, baseline: Results, tolerance: float = 0.5, min_seconds: float = MIN_SECONDS) -> List[str]:
+    '''
+    Returns a description of every case slower than its baseline by more than tolerance, as a fraction.
+
+    Cases missing from either results, and cases under min_seconds in the baseline, are not compared.
+    '''
+    regressions = []
+    for name, timing in results.items():
+        if name not in baseline or baseline[name]["seconds"] < min_seconds:
+            continue
+        ratio = timing["seconds"] / baseline[name]["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {timing['seconds'] * 1000:.3f} ms, "
+                               f"{ratio:.2f}x the baseline {baseline[name]['seconds'] * 1000:.3f} ms")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time every stage of a briefing on synthetic NOTAMs.")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Fail if any case is slower than in this results file")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown as a fraction, ex: 0.5 for 50%%")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="NOTAM counts to run at")
+    args = parser.parse_args(argv)
+
+    results = run(args.scales, log=print)
+    document = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance, MIN_SECONDS)
+        if regressions:
+            print(f"{len(regressions)} cases regressed more than {args.tolerance:.0%} from {args.baseline}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print(f"No case regressed more than {args.tolerance:.0%} from {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+'''
+Cost of full versus projected NOTAM models.
+
+    python -m benchmarks.bench_projection
+
+Parses synthetic pages into full CoreNOTAMData models and into ProjectedNOTAMData (NotamFetcher(projection=True)),
+reporting parse time and the memory the parsed NOTAMs hold on to.
+'''
+from typing import Any, Callable, List
+import gc, json, time, tracemalloc
+
+from notam_fetcher.notam_fetcher import _parse_response
+from .synthetic import iter_corpus, paginate
+
+
+def _measure(parse: Callable[[bytes], List[Any]], pages: List[bytes]) -> tuple[float, int]:
+    '''
+    Returns the seconds to parse pages and the bytes still allocated by the result.
+    '''
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    notams = [notam for page in pages for notam in parse(page)]
+    seconds = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del notams
+    return seconds, retained
+
+
+def run(page_count: int = 5, page_size: int = 1000) -> dict[str, tuple[float, int]]:
+    count = page_count * page_size
+    pages = [json.dumps(page).encode() for page in paginate(iter_corpus(count), count, page_size)]
+    return {
+        "full": _measure(lambda page: [item.properties.coreNOTAMData for item in _parse_response(page).items], pages),
+        "projection": _measure(lambda page: _parse_response(page, True).notams, pages),
+    }
+
+
+def main():
+    page_count, page_size = 5, 1000
+    results = run(page_count, page_size)
+    for name, (seconds, retained) in results.items():
+        print(f"{name:>12}: {seconds * 1000:8.2f} ms, {retained / 2**20:7.2f} MiB retained for {page_count * page_size} NOTAMs")
+
+
+if __name__ == "__main__":
+    main()
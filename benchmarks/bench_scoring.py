@@ -0,0 +1,52 @@
+'''
+Cost of scoring and sorting NOTAMs one at a time versus in a batch.
+
+    python -m benchmarks.bench_scoring
+
+Compares sorted(key=score), the previous NotamSorter.sort_by_score, with BatchScorer at 10k and 100k NOTAMs,
+and the partial rankings NotamSorter.top_k and NotamSorter.iter_ranked with a full sort.
+'''
+from typing import List
+
+from notam_fetcher.api_schema import APIResponseSuccess, Notam
+from sorting_algorithm.batch_scoring import encode_features, score_batch, default_scorer
+from sorting_algorithm.sorting_algorithm import NotamSorter, score
+from .synthetic import iter_corpus, paginate
+from .timing import time_calls
+
+
+def make_notams(count: int) -> List[Notam]:
+    page_size = min(count, 10000)
+    page = APIResponseSuccess.model_validate(next(paginate(iter_corpus(page_size), page_size, page_size)))
+    notams = [item.properties.coreNOTAMData.notam for item in page.items]
+    return (notams * (count // len(notams) + 1))[:count]
+
+
+def run(count: int, repeat: int = 5) -> dict[str, float]:
+    '''
+    Returns the median seconds of each way to score and sort count NOTAMs.
+    '''
+    notams = make_notams(count)
+    features = encode_features(notams)
+    scorer = default_scorer()
+    return {
+        "score_each": time_calls(lambda: [score(notam) for notam in notams], repeat)["seconds"],
+        "score_batch": time_calls(lambda: score_batch(notams), repeat)["seconds"],
+        "score_encoded": time_calls(lambda: scorer.score_features(features), repeat)["seconds"],
+        "sorted_by_score": time_calls(lambda: sorted(notams, key=score, reverse=True), repeat)["seconds"],
+        "sort_by_score": time_calls(lambda: NotamSorter(notams).sort_by_score(), repeat)["seconds"],
+        "top_k_20": time_calls(lambda: NotamSorter(notams).top_k(20), repeat)["seconds"],
+        "first_ranked": time_calls(lambda: next(NotamSorter(notams).iter_ranked()), repeat)["seconds"],
+    }
+
+
+def main():
+    for count in (10_000, 100_000):
+        results = run(count)
+        for name, seconds in results.items():
+            print(f"{name:>16}: {seconds * 1000:8.2f} ms for {count} NOTAMs")
+        print(f"{'sort speedup':>16}: {results['sorted_by_score'] / results['sort_by_score']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+'''
+Synthetic FAA NOTAM API responses for benchmarks.
+
+iter_corpus builds a realistic corpus at any volume for scale testing: NOTAMs cluster around busy airports,
+categories (runways, obstacles, airspace, ...) come with matching series, Q-codes, qualifiers and text, some are
+replacements or cancellations of earlier NOTAMs, some are permanent, and items carry Point or Polygon geometries
+and LOCAL_FORMAT and ICAO translations. Every item validates as an APIItem. The same seed always builds the same
+corpus. Write one to disk with:
+
+    python -m benchmarks.synthetic --count 100000 --seed 0 --json corpus/ --ndjson corpus.ndjson
+
+--json writes API response pages, one file each, which FakeNotamAPIServer (RecordedNotams.from_directory) can
+serve. --ndjson writes one item per line for streaming benchmarks, read back with read_ndjson.
+
+make_api_item, make_page and make_pages are deprecated. They build items with uniformly random text, qualifiers and
+coordinates across the continental United States, and are only kept for tests written against them. Benchmarks and
+new tests use iter_corpus and paginate.
+'''
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse, itertools, json, math, random
+
+_TEXTS = [
+    "RWY 04L/22R CLSD",
+    "TWY B BTN TWY B1 AND TWY B3 CLSD",
+    "OBST TOWER LGT (ASR 1234567) 404018N0734655W (2.1NM SE JFK) 349FT (339FT AGL) OUT OF SERVICE",
+    "AIRSPACE ADS-B, AUTO DEPENDENT SURVEILLANCE\nREBROADCAST (ADS-R), TFC INFO SER BCST (TIS-B) SER MAY NOT BE AVBL\nWI AN AREA DEFINED AS 49NM RADIUS OF 322403N0781209W.",
+    "NAV ILS RWY 31R LOC U/S",
+    "APRON TERMINAL 4 RAMP SPOTS 12-18 CLSD",
+]
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def make_api_item(index: int, rng: random.Random) -> Dict[str, Any]:
+    '''
+    Returns one API item (a NOTAM feature) as decoded JSON.
+
+    Deprecated, use make_corpus_item or iter_corpus.
+    '''
+    issued = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randrange(60 * 24 * 60))
+    lat, long = rng.uniform(25, 49), rng.uniform(-124, -67)
+    number = f"{rng.choice('ABC')}{rng.randrange(1, 9999):04d}/25"
+    text = rng.choice(_TEXTS)
+    return {
+        "type": "Feature",
+        "properties": {
+            "coreNOTAMData": {
+                "notamEvent": {"scenario": "6000"},
+                "notam": {
+                    "id": f"NOTAM_1_{index:08d}",
+                    "series": rng.choice("ACR"),
+                    "number": number,
+                    "type": rng.choice("NNNNRC"),
+                    "issued": _timestamp(issued),
+                    "affectedFIR": "KZNY",
+                    "selectionCode": "QMRLC",
+                    "traffic": rng.choice(["I", "V", "IV"]),
+                    "purpose": rng.choice(["NBO", "BO", "M", "NB"]),
+                    "scope": rng.choice(["A", "AE", "W", "E"]),
+                    "minimumFL": "000",
+                    "maximumFL": "999",
+                    "location": "JFK",
+                    "effectiveStart": _timestamp(issued),
+                    "effectiveEnd": _timestamp(issued + timedelta(days=rng.randrange(1, 90))),
+                    "text": text,
+                    "classification": rng.choice(["INTL", "DOM", "FDC", "MIL"]),
+                    "accountId": "JFK",
+                    "lastUpdated": _timestamp(issued),
+                    "icaoLocation": "KJFK",
+                    "coordinates": f"{int(lat):02d}{int(lat % 1 * 60):02d}N{int(-long):03d}{int(-long % 1 * 60):02d}W",
+                    "radius": f"{rng.randrange(1, 30):03d}",
+                },
+                "notamTranslation": [
+                    {"type": "LOCAL_FORMAT", "simpleText": f"!JFK {number} JFK {text}"},
+                    {"type": "ICAO", "formattedText": f"{number} NOTAMN\nQ) KZNY/QMRLC/IV/NBO/A/000/999/\nA) KJFK\nE) {text}"},
+                ],
+            }
+        },
+        "geometry": {"type": "GeometryCollection"},
+    }
+
+
+def make_page(page_size: int = 1000, seed: int = 0) -> Dict[str, Any]:
+    '''
+    Returns a success response holding page_size items as decoded JSON.
+
+    Deprecated, use paginate(iter_corpus(page_size, seed), page_size, page_size).
+    '''
+    rng = random.Random(seed)
+    items: List[Dict[str, Any]] = [make_api_item(index, rng) for index in range(page_size)]
+    return {"pageSize": page_size, "pageNum": 1, "totalCount": page_size, "totalPages": 1, "items": items}
+
+
+def make_pages(count: int, page_size: int = 1000, seed: int = 0) -> List[Dict[str, Any]]:
+    '''
+    Returns every page of a response matching count items, with page_size items per page, as decoded JSON.
+
+    Deprecated, use paginate(iter_corpus(count, seed), count, page_size).
+    '''
+    rng = random.Random(seed)
+    total_pages = max(1, math.ceil(count / page_size))
+    pages: List[Dict[str, Any]] = []
+    for page_num in range(1, total_pages + 1):
+        start = (page_num - 1) * page_size
+        items = [make_api_item(index, rng) for index in range(start, min(count, start + page_size))]
+        pages.append({"pageSize": page_size, "pageNum": page_num, "totalCount": count, "totalPages": total_pages,
+                      "items": items})
+    return pages
+
+
+# Time the corpus is generated relative to, so a seed always builds the same corpus
+CORPUS_NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+# (ICAO, latitude, longitude, FIR, relative NOTAM volume)
+_AIRPORTS: List[Tuple[str, float, float, str, int]] = [
+    ("KATL", 33.6367, -84.4281, "KZTL", 10), ("KORD", 41.9786, -87.9048, "KZAU", 10),
+    ("KDFW", 32.8968, -97.0380, "KZFW", 9), ("KDEN", 39.8617, -104.6732, "KZDV", 8),
+    ("KLAX", 33.9425, -118.4081, "KZLA", 9), ("KJFK", 40.6398, -73.7789, "KZNY", 9),
+    ("KLAS", 36.0801, -115.1522, "KZLA", 6), ("KCLT", 35.2140, -80.9431, "KZTL", 6),
+    ("KSEA", 47.4490, -122.3093, "KZSE", 6), ("KMCO", 28.4294, -81.3090, "KZJX", 5),
+    ("KSFO", 37.6190, -122.3749, "KZOA", 6), ("KPHX", 33.4343, -112.0116, "KZAB", 5),
+    ("KIAH", 29.9844, -95.3414, "KZHU", 6), ("KMIA", 25.7932, -80.2906, "KZMA", 5),
+    ("KBOS", 42.3643, -71.0052, "KZBW", 5), ("KMSP", 44.8820, -93.2218, "KZMP", 4),
+    ("KDTW", 42.2124, -83.3534, "KZOB", 4), ("KSLC", 40.7884, -111.9778, "KZLC", 3),
+    ("KBNA", 36.1245, -86.6782, "KZME", 2), ("KABQ", 35.0402, -106.6092, "KZAB", 2),
+    ("KLSV", 36.2362, -115.0343, "KZLA", 1), ("KEDW", 34.9054, -117.8837, "KZLA", 1),
+]
+_AIRPORT_WEIGHTS = list(itertools.accumulate(airport[4] for airport in _AIRPORTS))
+
+
+@dataclass(frozen=True)
+class _Category:
+    '''
+    A kind of NOTAM, with the qualifiers and text the FAA issues it with.
+    '''
+    weight: int
+    series: str
+    selection_code: str
+    traffic: str
+    purpose: str
+    scope: str
+    classifications: str # space separated, the first is the most common
+    text: Callable[[random.Random], str]
+    geometry: str # "point", "polygon" or "none"
+    radius: Tuple[int, int] = (1, 5) # nautical miles
+    airspace: bool = False # has flight levels and altitude limits
+
+
+def _runway(rng: random.Random) -> str:
+    number = rng.randrange(1, 19)
+    side = rng.choice(["", "", "L", "R", "C"])
+    opposite = {"L": "R", "R": "L"}.get(side, side)
+    return f"{number:02d}{side}/{number + 18:02d}{opposite}"
+
+
+_CATEGORIES: List[_Category] = [
+    _Category(20, "R", "QMRLC", "IV", "NBO", "A", "INTL DOM", lambda rng: rng.choice([
+        f"RWY {_runway(rng)} CLSD",
+        f"RWY {_runway(rng)} CLSD EXC TAX",
+        f"RWY {_runway(rng)} FICON {rng.randrange(1, 6)}/{rng.randrange(1, 6)}/{rng.randrange(1, 6)} WET",
+    ]), "point"),
+    _Category(15, "B", "QMXLC", "IV", "BO", "A", "DOM INTL", lambda rng: (
+        f"TWY {rng.choice('ABCDEFGHJKLMNP')}{rng.randrange(1, 9)} BTN TWY {rng.choice('ABCDEF')} AND "
+        f"RWY {_runway(rng)} CLSD"
+    ), "point"),
+    _Category(8, "I", "QMNLC", "IV", "BO", "A", "DOM", lambda rng: (
+        f"APRON TERMINAL {rng.randrange(1, 9)} RAMP SPOTS {rng.randrange(1, 20)}-{rng.randrange(20, 40)} CLSD"
+    ), "point"),
+    _Category(14, "J", "QOBCE", "IV", "M", "AE", "DOM INTL", lambda rng: (
+        f"OBST {rng.choice(['CRANE', 'TOWER', 'BLDG', 'STACK'])} ({rng.randrange(1, 9999):04d}) "
+        f"{rng.randrange(100, 2000)}FT ({rng.randrange(50, 1500)}FT AGL) "
+        f"{rng.choice(['FLAGGED AND LGTD', 'LGT OUT OF SERVICE', 'NOT LGTD'])}"
+    ), "point", radius=(1, 3)),
+    _Category(6, "K", "QOLAS", "IV", "M", "E", "DOM", lambda rng: (
+        f"TOWER LGT (ASR {rng.randrange(1000000, 9999999)}) {rng.randrange(200, 1500)}FT AGL OUT OF SERVICE"
+    ), "point", radius=(1, 2)),
+    _Category(10, "N", "QICAS", "I", "NBO", "AE", "INTL DOM", lambda rng: rng.choice([
+        f"NAV ILS RWY {_runway(rng).split('/')[0]} LOC U/S",
+        f"NAV VOR/DME {rng.choice(['ABC', 'LGA', 'ORD', 'BOS'])} UNMONITORED",
+        f"NAV ILS RWY {_runway(rng).split('/')[0]} GP U/S",
+    ]), "point", radius=(5, 25)),
+    _Category(5, "C", "QCAAS", "IV", "BO", "A", "DOM", lambda rng: (
+        f"COM ATIS FREQ {rng.randrange(118, 136)}.{rng.choice(['025', '150', '275', '800'])} U/S"
+    ), "point", radius=(5, 10)),
+    _Category(7, "H", "QRTCA", "IV", "NBO", "W", "FDC", lambda rng: (
+        f"AIRSPACE TEMPORARY FLIGHT RESTRICTIONS WI AN AREA DEFINED AS {rng.randrange(1, 30)}NM RADIUS "
+        f"SFC-{rng.choice(['3000FT', '17999FT', 'FL180'])} {rng.choice(['VIP MOVEMENT', 'SPORTING EVENT', 'FIRE FIGHTING'])}"
+    ), "polygon", radius=(3, 30), airspace=True),
+    _Category(4, "D", "QRRCA", "IV", "BO", "W", "DOM MIL", lambda rng: (
+        f"AIRSPACE R{rng.randrange(2000, 7000)}{rng.choice(['', 'A', 'B'])} ACT SFC-FL{rng.randrange(10, 60) * 10}"
+    ), "polygon", radius=(10, 40), airspace=True),
+    _Category(4, "G", "QARLC", "I", "NBO", "E", "FDC", lambda rng: (
+        f"ROUTE {rng.choice(['V', 'J', 'Q', 'T'])}{rng.randrange(1, 600)} "
+        f"{rng.choice(['ABC', 'DEF', 'GHI'])} VOR/DME - {rng.choice(['JKL', 'MNO', 'PQR'])} VORTAC "
+        f"MEA {rng.randrange(30, 180) * 100}"
+    ), "none", radius=(10, 50), airspace=True),
+    _Category(5, "V", "QPICH", "I", "NBO", "A", "FDC", lambda rng: (
+        f"IAP RNAV (GPS) RWY {_runway(rng).split('/')[0]}, AMDT {rng.randrange(1, 9)}... "
+        f"LPV DA {rng.randrange(200, 800)}/ HAT {rng.randrange(200, 300)} ALL CATS"
+    ), "point", radius=(5, 10)),
+    _Category(3, "Z", "QGAXX", "I", "NBO", "E", "FDC", lambda rng: (
+        f"NAV GPS (AFGPS TEST {rng.randrange(1, 99)}) MAY NOT BE AVBL WI A {rng.randrange(100, 400)}NM RADIUS"
+    ), "polygon", radius=(50, 100), airspace=True),
+    _Category(3, "M", "QWMLW", "IV", "BO", "W", "MIL LMIL", lambda rng: (
+        f"MIL {rng.choice(['AERIAL REFUELING', 'PARACHUTE JUMPING EXER', 'UNMANNED ACFT'])} "
+        f"SFC-FL{rng.randrange(10, 45) * 10}"
+    ), "polygon", radius=(5, 20), airspace=True),
+]
+_CATEGORY_WEIGHTS = list(itertools.accumulate(category.weight for category in _CATEGORIES))
+
+
+def _format_coordinates(lat: float, long: float) -> str:
+    return (f"{int(abs(lat)):02d}{int(abs(lat) % 1 * 60):02d}{'N' if lat >= 0 else 'S'}"
+            f"{int(abs(long)):03d}{int(abs(long) % 1 * 60):02d}{'E' if long >= 0 else 'W'}")
+
+
+def _format_icao_time(value: datetime) -> str:
+    return value.strftime("%y%m%d%H%M")
+
+
+def _circle_polygon(lat: float, long: float, radius: float, vertices: int = 8) -> List[List[float]]:
+    '''
+    Returns a closed GeoJSON ring ([longitude, latitude] pairs) approximating a circle radius nautical miles around (lat, long).
+    '''
+    ring = []
+    for vertex in range(vertices):
+        bearing = 2 * math.pi * vertex / vertices
+        ring.append([round(long + radius / 60 * math.sin(bearing) / math.cos(math.radians(lat)), 6),
+                     round(lat + radius / 60 * math.cos(bearing), 6)])
+    return ring + [ring[0]]
+
+
+def make_corpus_item(index: int, rng: random.Random, now: datetime = CORPUS_NOW) -> Dict[str, Any]:
+    '''
+    Returns one realistic API item (a NOTAM feature) as decoded JSON, see iter_corpus.
+    '''
+    icao, airport_lat, airport_long, fir, _ = rng.choices(_AIRPORTS, cum_weights=_AIRPORT_WEIGHTS)[0]
+    category = rng.choices(_CATEGORIES, cum_weights=_CATEGORY_WEIGHTS)[0]
+    classifications = category.classifications.split()
+    classification = classifications[0] if rng.random() < 0.8 else rng.choice(classifications)
+
+    # Airport NOTAMs sit on the field, the rest spread out over the surrounding airspace
+    spread = 0.05 if category.scope == "A" else 1.5
+    lat = airport_lat + rng.gauss(0, spread)
+    long = airport_long + rng.gauss(0, spread / math.cos(math.radians(airport_lat)))
+    radius = rng.randint(*category.radius)
+
+    location = icao[1:] if classification == "DOM" else icao
+    if classification == "FDC":
+        location = "FDC"
+    # Most NOTAMs were issued in the last 90 days, and last a few hours to a few months unless permanent
+    issued = now - timedelta(minutes=rng.randrange(90 * 24 * 60))
+    effective_start = issued + timedelta(minutes=rng.choice([0, 0, 0, rng.randrange(24 * 60 * 14)]))
+    permanent = rng.random() < 0.08
+    effective_end = None if permanent else effective_start + timedelta(hours=math.exp(rng.uniform(math.log(2), math.log(24 * 180))))
+    last_updated = issued + timedelta(minutes=rng.choice([0, 0, rng.randrange(1, 24 * 60)]))
+
+    # Domestic NOTAMs are numbered month/sequence, the others series sequence/year
+    def notam_number(sequence: int) -> str:
+        if classification == "DOM":
+            return f"{issued.month:02d}/{sequence % 1000:03d}"
+        return f"{category.series}{sequence % 10000:04d}/{issued.year % 100:02d}"
+
+    sequence = index % 9999 + 1
+    number = notam_number(sequence)
+    notam_type = rng.choices("NRC", weights=(85, 10, 5))[0]
+    text = category.text(rng)
+    reference = ""
+    if notam_type != "N":
+        reference = f" NOTAM{notam_type} {notam_number(max(1, sequence - rng.randrange(1, 50)))}"
+        if notam_type == "C":
+            text = f"{text} CANCELLED"
+
+    notam: Dict[str, Any] = {
+        "id": f"NOTAM_1_{10_000_000 + index}",
+        "series": category.series,
+        "number": number,
+        "type": notam_type,
+        "issued": _timestamp(issued),
+        "affectedFIR": fir,
+        "selectionCode": category.selection_code,
+        "traffic": category.traffic,
+        "purpose": category.purpose,
+        "scope": category.scope,
+        "location": location,
+        "effectiveStart": _timestamp(effective_start),
+        "effectiveEnd": _timestamp(effective_end) if effective_end is not None else "PERM",
+        "text": text,
+        "classification": classification,
+        "accountId": location if classification != "FDC" else fir[1:],
+        "lastUpdated": _timestamp(last_updated),
+        "icaoLocation": icao,
+        "coordinates": _format_coordinates(lat, long),
+        "radius": f"{radius:03d}",
+    }
+    if category.airspace:
+        lower, upper = 0, rng.randrange(30, 600)
+        notam.update(minimumFL=f"{lower:03d}", maximumFL=f"{upper:03d}",
+                     lowerLimit="SFC", upperLimit=f"FL{upper:03d}" if upper >= 180 else f"{upper * 100}FT")
+    else:
+        notam.update(minimumFL="000", maximumFL="999")
+    if rng.random() < 0.1:
+        notam["schedule"] = rng.choice(["DLY 0600-1400", "MON-FRI 1300-2100", "SR-SS"])
+
+    end = _format_icao_time(effective_end) if effective_end is not None else "PERM"
+    translations: List[Dict[str, str]] = [{
+        "type": "LOCAL_FORMAT",
+        "simpleText": f"!{location} {number} {location} {text} {_format_icao_time(effective_start)}-{end}",
+    }]
+    if classification != "DOM" or rng.random() < 0.5:
+        q_line = (f"Q) {fir}/{category.selection_code}/{category.traffic}/{category.purpose}/{category.scope}/"
+                  f"{notam['minimumFL']}/{notam['maximumFL']}/{notam['coordinates']}{notam['radius']}")
+        translations.append({
+            "type": "ICAO",
+            "formattedText": f"{number} NOTAM{notam_type}{reference}\n{q_line}\nA) {icao} "
+                             f"B) {_format_icao_time(effective_start)} C) {end}\nE) {text}",
+        })
+
+    geometry: Dict[str, Any] = {"type": "GeometryCollection"}
+    if category.geometry == "point":
+        geometry["geometries"] = [{"type": "Point", "coordinates": [round(long, 6), round(lat, 6)]}]
+    elif category.geometry == "polygon":
+        element: Dict[str, Any] = {"type": "Polygon", "coordinates": [_circle_polygon(lat, long, radius)]}
+        if category.airspace:
+            element["heightInformation"] = {"upperLevel": int(notam["maximumFL"]), "uomUpperLevel": "FL",
+                                            "lowerLevel": 0, "uomLowerLevel": "FT"}
+        geometry["geometries"] = [element]
+
+    return {
+        "type": "Feature",
+        "properties": {
+            "coreNOTAMData": {
+                "notamEvent": {"scenario": rng.choice(["6000", "6000", "6000", "1000", "2000"])},
+                "notam": notam,
+                "notamTranslation": translations,
+            }
+        },
+        "geometry": geometry,
+    }
+
+
+def iter_corpus(count: int, seed: int = 0, now: datetime = CORPUS_NOW) -> Iterator[Dict[str, Any]]:
+    '''
+    Yields count realistic API items as decoded JSON, one at a time so any volume fits in memory.
+
+    Args:
+        count (int): Number of items.
+        seed (int): Seed of the random choices. The same seed and now always yield the same items.
+        now (datetime): The time the corpus is issued around. NOTAMs are issued up to 90 days before it.
+    '''
+    rng = random.Random(seed)
+    for index in range(count):
+        yield make_corpus_item(index, rng, now)
+
+
+def paginate(items: Iterable[Dict[str, Any]], count: int, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    '''
+    Yields the success response pages holding count items, page_size per page, as decoded JSON.
+    '''
+    total_pages = max(1, math.ceil(count / page_size))
+    iterator = iter(items)
+    for page_num in range(1, total_pages + 1):
+        page_items = list(itertools.islice(iterator, page_size))
+        yield {"pageSize": page_size, "pageNum": page_num, "totalCount": count, "totalPages": total_pages,
+               "items": page_items}
+
+
+def write_json(directory: str | Path, count: int, seed: int = 0, page_size: int = 1000) -> List[Path]:
+    '''
+    Writes a corpus as API response pages, one page-NNNNN.json file each. Returns the files written.
+    '''
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for page in paginate(iter_corpus(count, seed), count, page_size):
+        path = directory / f"page-{page['pageNum']:05d}.json"
+        path.write_text(json.dumps(page))
+        paths.append(path)
+    return paths
+
+
+def write_ndjson(path: str | Path, count: int, seed: int = 0):
+    '''
+    Writes a corpus with one item per line.
+    '''
+    with open(path, "w") as file:
+        for item in iter_corpus(count, seed):
+            file.write(json.dumps(item))
+            file.write("\n")
+
+
+def read_ndjson(path: str | Path) -> Iterator[Dict[str, Any]]:
+    '''
+    Yields the items of a file written by write_ndjson, one at a time.
+    '''
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Write a synthetic NOTAM corpus.")
+    parser.add_argument("--count", type=int, required=True, help="Number of NOTAMs")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus")
+    parser.add_argument("--page-size", type=int, default=1000, help="Items per page of --json")
+    parser.add_argument("--json", type=Path, metavar="DIRECTORY", help="Write API response pages to this directory")
+    parser.add_argument("--ndjson", type=Path, metavar="FILE", help="Write one item per line to this file")
+    args = parser.parse_args(argv)
+    if args.json is None and args.ndjson is None:
+        parser.error("at least one of --json and --ndjson is required")
+
+    if args.json is not None:
+        paths = write_json(args.json, args.count, args.seed, args.page_size)
+        print(f"Wrote {args.count} NOTAMs in {len(paths)} pages to {args.json}")
+    if args.ndjson is not None:
+        write_ndjson(args.ndjson, args.count, args.seed)
+        print(f"Wrote {args.count} NOTAMs to {args.ndjson}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+'''
+Timing of repeated calls, shared by the benchmarks.
+'''
+from typing import Callable, Dict, Optional
+import math, statistics, time
+
+
+def time_calls(function: Callable[[], object], repeat: Optional[int] = None,
+               time_budget: float = 1.0, max_repeat: int = 50) -> Dict[str, float]:
+    '''
+    Returns the median and minimum seconds of repeated calls to function.
+
+    Args:
+        function (Callable[[], object]): The call to time.
+        repeat (Optional[int]): Number of calls. If None, calls are repeated within time_budget, judged by the first call.
+        time_budget (float): Total seconds to repeat calls for when repeat is None, at least one call.
+        max_repeat (int): Most calls made when repeat is None.
+
+    Returns:
+        Dict[str, float]: "seconds" the median, "min" the fastest call and "repeat" the number of calls.
+    '''
+    start = time.perf_counter()
+    function()
+    timings = [time.perf_counter() - start]
+    if repeat is None:
+        repeat = min(max_repeat, max(1, math.floor(time_budget / max(timings[0], 1e-9))))
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(timings), "min": min(timings), "repeat": len(timings)}
@@ -0,0 +1,8 @@
+"""
+Settings shared by the briefing drivers and server. Importing this module has no side effects, unlike driver.py.
+"""
+
+# Width (in nautical miles) of the corridor around the route to fetch NOTAMs for, half on each side
+CORRIDOR_WIDTH_NM = 50
+# Distance (in miles) between the route waypoints NOTAM areas are tested against
+ROUTE_WAYPOINT_GAP_MILES = 20
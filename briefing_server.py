@@ -0,0 +1,56 @@
+from dotenv import load_dotenv
+import argparse, logging, os, sys
+
+from briefing_config import CORRIDOR_WIDTH_NM, ROUTE_WAYPOINT_GAP_MILES
+from briefing_service import BriefingHTTPServer, BriefingService
+from notam_fetcher import AsyncNotamFetcher, RateLimiter, SQLiteNotamCache, SQLiteNotamSyncStore
+from notam_prefetcher import GridNotamStore, NotamGrid
+
+logger = logging.getLogger("briefing_server")
+
+
+def main():
+    """
+    Serves route briefings over HTTP until interrupted:
+    - Load environment variables for CLIENT_ID and CLIENT_SECRET
+    - Builds one AsyncNotamFetcher with the same cache, rate limiter and sync store as driver.py
+    - With --local, answers routes from the cells prefetch_driver.py keeps fresh when it can
+    - Serves GET /briefing?departure=JFK&destination=LAX as JSON, see BriefingRequestHandler
+    """
+    parser = argparse.ArgumentParser(description="Serve route briefings as JSON over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--local", action="store_true", help="Answer from the cells kept fresh by prefetch_driver.py")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(name)s] [%(levelname)s] %(message)s')
+
+    load_dotenv()
+    CLIENT_ID = os.getenv("CLIENT_ID")
+    CLIENT_SECRET = os.getenv("CLIENT_SECRET")
+
+    if CLIENT_ID is None:
+        logger.error("CLIENT_ID not set in .env file")
+        sys.exit("Error: CLIENT_ID not set in .env file")
+    if CLIENT_SECRET is None:
+        sys.exit("Error: CLIENT_SECRET not set in .env file")
+
+    sync_store = SQLiteNotamSyncStore("notam_sync.sqlite3")
+    notam_fetcher = AsyncNotamFetcher(CLIENT_ID, CLIENT_SECRET, timeout=300,
+                                      cache=SQLiteNotamCache("notam_cache.sqlite3", ttl=600),
+                                      rate_limiter=RateLimiter.shared("notam_rate_limit.sqlite3"),
+                                      sync_store=sync_store)
+    local_store = GridNotamStore(NotamGrid(), sync_store) if args.local else None
+    with BriefingService(notam_fetcher, CORRIDOR_WIDTH_NM, ROUTE_WAYPOINT_GAP_MILES,
+                         local_store=local_store) as service:
+        server = BriefingHTTPServer(service, args.host, args.port)
+        logger.info(f"Serving briefings on http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from .briefing_service import BriefingService
+from .server import BriefingHTTPServer, BriefingRequestHandler
+
+__all__ = ["BriefingService", "BriefingHTTPServer", "BriefingRequestHandler"]
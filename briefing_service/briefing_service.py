@@ -0,0 +1,152 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+import asyncio, logging, threading, time
+
+from airport_code_validator.airport_code_validator import AirportCodeValidator
+from airport_data.airport_data import AirportData
+from airport_data.types import Airport
+from flight_path.flight_path import FlightPath
+from notam_fetcher import AsyncNotamFetcher
+from notam_prefetcher import GridNotamStore
+from notam_spatial_index import NotamSpatialIndex
+from sorting_algorithm import BatchScorer, NotamSorter, ReloadingScorer
+
+
+def _airport_json(airport: Airport) -> Dict[str, Any]:
+    return {"name": airport.name, "icao": airport.icao, "iata": airport.iata, "coordinates": list(airport.coordinates)}
+
+
+class BriefingService:
+    '''
+    Route briefings from one long lived process.
+
+    Airport indexes, the NOTAM fetcher's response cache, sync store and pooled connections stay warm between
+    briefings. The AsyncNotamFetcher runs on an event loop in a background thread, so briefings may be requested
+    from any number of threads at once (ex: the threads of a ThreadingHTTPServer) while sharing its connection
+    pool and concurrency limit.
+
+    Use as a context manager, or call close() when done.
+    '''
+    logger = logging.getLogger("BriefingService")
+
+    def __init__(self, notam_fetcher: AsyncNotamFetcher, corridor_width: float = 50, waypoint_gap: float = 20,
+                 scorer: BatchScorer | ReloadingScorer | None = None,
+                 airport_validator: Callable[[Airport], bool] = AirportCodeValidator.is_valid,
+                 local_store: GridNotamStore | None = None):
+        '''
+        Args:
+            notam_fetcher (AsyncNotamFetcher): Fetches NOTAMs. It is only used from the service's event loop, and closed with the service.
+            corridor_width (float): Total width in nautical miles of the corridor around each route, half on each side.
+            waypoint_gap (float): Distance in miles between the route waypoints NOTAM areas are tested against.
+            scorer (BatchScorer | ReloadingScorer | None): Ranks the NOTAMs. Defaults to the rules in default_rules.json.
+            airport_validator (Callable[[Airport], bool]): Whether an airport may be briefed.
+            local_store (GridNotamStore | None): Cells kept fresh by a NotamPrefetcher. Routes whose cells are all
+                fresh are briefed from it without calling the API.
+        '''
+        self.notam_fetcher = notam_fetcher
+        self.corridor_width = corridor_width
+        self.waypoint_gap = waypoint_gap
+        self.scorer = scorer
+        self.airport_validator = airport_validator
+        self.local_store = local_store
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="BriefingServiceLoop", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+    def close(self):
+        '''
+        Closes the NOTAM fetcher's connections and stops the event loop.
+        '''
+        if self._closed:
+            return
+        self._closed = True
+        asyncio.run_coroutine_threadsafe(self.notam_fetcher.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def brief(self, departure_code: str, destination_code: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        '''
+        Briefs a route: the NOTAMs within its corridor, highest scoring first.
+
+        The briefing is answered from local_store if every cell along the route is fresh, from the API otherwise.
+
+        Args:
+            departure_code (str): IATA or ICAO code of the departure airport.
+            destination_code (str): IATA or ICAO code of the destination airport.
+            limit (Optional[int]): Return only the limit highest scoring NOTAMs. All if None.
+
+        Returns:
+            Dict[str, Any]: The briefing, JSON serializable.
+
+        Raises:
+            ValueError: If an airport code is unknown or not valid, or limit is negative.
+            RuntimeError: If the service is closed.
+            NotamFetcherUnauthenticatedError: If the NOTAM fetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a request error occurs while fetching from the API.
+            NotamFetcherTimeoutReached: If the NOTAMs could not be fetched before the NOTAM fetcher's timeout.
+        '''
+        if self._closed:
+            raise RuntimeError("BriefingService is closed")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative")
+        start_time = time.perf_counter()
+
+        departure, destination = AirportData.get_airport(departure_code), AirportData.get_airport(destination_code)
+        for airport in (departure, destination):
+            if not self.airport_validator(airport):
+                raise ValueError(f"Invalid airport {airport.icao}")
+
+        flight_path = FlightPath(departure, destination)
+        coverage_plan = flight_path.get_coverage_plan(self.corridor_width)
+        route_waypoints = flight_path.get_waypoints_by_gap(self.waypoint_gap)
+
+        local = None
+        if self.local_store is not None:
+            local = self.local_store.notams_for_corridor(route_waypoints, self.corridor_width)
+            if not local.complete:
+                self.logger.debug(f"{departure.icao} to {destination.icao} is outside the grid or has "
+                                  f"{len(local.missing_cells)} cells that are not fresh, fetching from the API")
+        if local is not None and local.complete:
+            source = "local"
+            queries = 0
+            corridor_notams = local.notams
+            notams = corridor_notams
+        else:
+            source = "api"
+            queries = coverage_plan.request_count
+            notams = asyncio.run_coroutine_threadsafe(
+                self.notam_fetcher.fetch_notams_by_latlong_list(coverage_plan.waypoints, coverage_plan.radius), self._loop
+            ).result()
+            corridor_notams = NotamSpatialIndex(notams).query_corridor(route_waypoints, self.corridor_width)
+
+        sorter = NotamSorter([notam.notam for notam in corridor_notams], self.scorer)
+        ranked = sorter.top_k(limit) if limit is not None else sorter.sort_by_score()
+        scores = sorter.scorer.score(ranked).tolist()
+
+        seconds = time.perf_counter() - start_time
+        self.logger.info(f"Briefed {departure.icao} to {destination.icao}: {len(corridor_notams)} of {len(notams)} "
+                         f"NOTAMs in the corridor, {seconds:.3f} seconds")
+        return {
+            "departure": _airport_json(departure),
+            "destination": _airport_json(destination),
+            "generated": datetime.now(timezone.utc).isoformat(),
+            "source": source,
+            "queries": queries,
+            "query_radius": coverage_plan.radius,
+            "notams_fetched": len(notams),
+            "notams_in_corridor": len(corridor_notams),
+            "notams": [
+                {"score": notam_score, "notam": notam.model_dump(mode="json", by_alias=True, exclude_none=True)}
+                for notam, notam_score in zip(ranked, scores)
+            ],
+            "seconds": seconds,
+        }
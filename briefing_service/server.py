@@ -0,0 +1,98 @@
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlparse
+import json, logging, math
+
+from notam_fetcher.exceptions import (
+    NotamFetcherBaseError,
+    NotamFetcherRateLimitError,
+    NotamFetcherTimeoutReached,
+    NotamFetcherUnauthenticatedError,
+)
+from .briefing_service import BriefingService
+
+
+class BriefingRequestHandler(BaseHTTPRequestHandler):
+    '''
+    Serves a BriefingService as JSON.
+
+        GET /health
+        GET /metrics (the NOTAM fetcher's metrics in the Prometheus text format)
+        GET /briefing?departure=JFK&destination=LAX[&limit=10]
+
+    Errors are returned as {"error": message} with a 4xx or 5xx status. A 503 caused by the NOTAM API's rate limit
+    has a Retry-After header of one rate limiter window.
+    '''
+    logger = logging.getLogger("BriefingRequestHandler")
+    server: "BriefingHTTPServer"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif url.path == "/metrics":
+            self._send(HTTPStatus.OK, "text/plain; version=0.0.4", self.server.service.notam_fetcher.metrics.exposition().encode())
+        elif url.path == "/briefing":
+            self._brief(parse_qs(url.query))
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}"})
+
+    def _brief(self, query: Dict[str, list[str]]):
+        try:
+            departure, destination = query["departure"][0], query["destination"][0]
+            limit = int(query["limit"][0]) if "limit" in query else None
+        except (KeyError, ValueError):
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "departure and destination are required, limit must be an integer"})
+            return
+
+        try:
+            briefing = self.server.service.brief(departure, destination, limit)
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except NotamFetcherUnauthenticatedError:
+            self.logger.error("Invalid client_id or secret.")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "The service could not authenticate with the NOTAM API"})
+        except NotamFetcherRateLimitError:
+            retry_after = math.ceil(self.server.service.notam_fetcher.rate_limiter.period)
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "The NOTAM API rate limit was exceeded, try again later"},
+                            {"Retry-After": str(retry_after)})
+        except NotamFetcherTimeoutReached:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "NOTAMs could not be fetched in time"})
+        except NotamFetcherBaseError as e:
+            self.logger.error(f"Failed to retrieve NOTAMs: {e!r}")
+            self._send_json(HTTPStatus.BAD_GATEWAY, {"error": "Failed to retrieve NOTAMs from the NOTAM API"})
+        else:
+            self._send_json(HTTPStatus.OK, briefing)
+
+    def _send_json(self, status: HTTPStatus, body: Any, headers: Dict[str, str] | None = None):
+        self._send(status, "application/json", json.dumps(body).encode(), headers)
+
+    def _send(self, status: HTTPStatus, content_type: str, content: bytes, headers: Dict[str, str] | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any):
+        self.logger.info(f"{self.address_string()} {format % args}")
+
+
+class BriefingHTTPServer(ThreadingHTTPServer):
+    '''
+    Handles each request on its own thread, all sharing one BriefingService.
+    '''
+    daemon_threads = True
+
+    def __init__(self, service: BriefingService, host: str = "127.0.0.1", port: int = 8080):
+        '''
+        Args:
+            service (BriefingService): Briefs the routes requested.
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+        '''
+        self.service = service
+        super().__init__((host, port), BriefingRequestHandler)
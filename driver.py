@@ -4,12 +4,15 @@ import logging, os, sys, time
 from airport_data.airport_data import AirportData
 from flight_input_parser.flight_input_parser import FlightInputParser
 from airport_code_validator.airport_code_validator import AirportCodeValidator
+from briefing_config import CORRIDOR_WIDTH_NM, ROUTE_WAYPOINT_GAP_MILES
 from flight_path.flight_path import FlightPath
-from notam_fetcher import NotamFetcher
+from notam_fetcher import NotamFetcher, RateLimiter, ResponseRecording, SQLiteNotamCache, SQLiteNotamSyncStore
 from notam_fetcher.api_schema import CoreNOTAMData, Notam
-from notam_fetcher.exceptions import NotamFetcherRateLimitError, NotamFetcherRequestError, NotamFetcherUnauthenticatedError
+from notam_fetcher.exceptions import NotamFetcherRateLimitError, NotamFetcherRequestError, NotamFetcherTimeoutReached, NotamFetcherUnauthenticatedError
 from notam_printer.notam_printer import NotamPrinter
-from sorting_algorithm.sorting_algorithm import NotamSorter
+from notam_spatial_index import NotamSpatialIndex
+from sorting_algorithm.sorting_algorithm import NotamSorter, RunningTopK
+from tracing import JSONLinesSpanExporter, OTLPJSONSpanExporter, SpanExporter, Tracer, set_tracer, span
 
 
 log_format_string = '%(asctime)s [%(name)s] [%(levelname)s] %(message)s'
@@ -27,38 +30,40 @@ logging.getLogger('urllib3.connectionpool').setLevel(logging.INFO)
 
 logger = logging.getLogger("driver")
 
-def main():
+# Number of NOTAMs shown while the rest are still being fetched
+LIVE_TOP_K = 10
+
+def start_tracer() -> Tracer | None:
     """
-    Main execution block:
-    - Load environment variables for CLIENT_ID and CLIENT_SECRET
-    - Calls get_flight_input() to get user input.
-    - Validates the input using AirportCodeValidator.
-    - Prints a confirmation message if valid or an error message if invalid.
-    - Uses FlightPath to determine flight path.
-    - Calls NotamFetcher for each coordinate returned from flight path.
-    - Sorts using NOTAM sorter
-    - Prints using NotamPrinter
+    Starts recording spans of every stage of the briefing if NOTAM_TRACE_FILE (JSON lines) or NOTAM_TRACE_OTLP_FILE
+    (OpenTelemetry JSON) is set. Returns the tracer, or None if tracing is disabled.
+    """
+    exporters: list[SpanExporter] = []
+    if os.getenv("NOTAM_TRACE_FILE") is not None:
+        exporters.append(JSONLinesSpanExporter(os.getenv("NOTAM_TRACE_FILE")))
+    if os.getenv("NOTAM_TRACE_OTLP_FILE") is not None:
+        exporters.append(OTLPJSONSpanExporter(os.getenv("NOTAM_TRACE_OTLP_FILE")))
+    if not exporters:
+        return None
+    tracer = Tracer(exporters)
+    set_tracer(tracer)
+    return tracer
+
+def brief(client_id: str, client_secret: str):
+    """
+    Asks for a route and prints its NOTAMs, see main.
     """
-
-    load_dotenv()
-    CLIENT_ID = os.getenv("CLIENT_ID")
-    CLIENT_SECRET = os.getenv("CLIENT_SECRET")
-
-    if CLIENT_ID is None:
-        logger.error("CLIENT_ID not set in .env file")
-        sys.exit("Error: CLIENT_ID not set in .env file")
-    if CLIENT_SECRET is None:
-        sys.exit("Error: CLIENT_SECRET not set in .env file")
     # Get user input
     departure_airport_code, destination_airport_code = FlightInputParser.get_flight_input()
 
-    try:
-        departure_airport, destination_airport = AirportData.get_airport(departure_airport_code), AirportData.get_airport(destination_airport_code) 
-    except ValueError as e:
-        sys.exit(str(e))
+    with span("airport_lookup", departure=departure_airport_code, destination=destination_airport_code):
+        try:
+            departure_airport, destination_airport = AirportData.get_airport(departure_airport_code), AirportData.get_airport(destination_airport_code) 
+        except ValueError as e:
+            sys.exit(str(e))
 
-    is_valid_dep = AirportCodeValidator.is_valid(departure_airport)
-    is_valid_dest = AirportCodeValidator.is_valid(destination_airport)
+        is_valid_dep = AirportCodeValidator.is_valid(departure_airport)
+        is_valid_dest = AirportCodeValidator.is_valid(destination_airport)
 
     if not is_valid_dep:
         sys.exit(f"Invalid departure airport {departure_airport}. Please enter valid airport codes.")
@@ -69,13 +74,60 @@ def main():
     logger.info(f"Fetching Flights from {departure_airport.icao} to {destination_airport.icao}")
     flight_path = FlightPath(departure_airport, destination_airport)
     
-    waypoints = flight_path.get_waypoints_by_gap(40)
-    notam_fetcher = NotamFetcher(CLIENT_ID, CLIENT_SECRET, timeout=300)
+    with span("coverage_plan") as plan_span:
+        coverage_plan = flight_path.get_coverage_plan(CORRIDOR_WIDTH_NM)
+        plan_span.set_attributes(queries=len(coverage_plan.waypoints), radius=coverage_plan.radius)
+    # Share one request budget with any other briefings running on this machine
+    rate_limiter = RateLimiter.shared("notam_rate_limit.sqlite3")
+    replay_dir, record_dir = os.getenv("NOTAM_REPLAY_DIR"), os.getenv("NOTAM_RECORD_DIR")
+    if replay_dir is not None:
+        # Every run sends the same requests and gets the same responses
+        notam_fetcher = NotamFetcher(client_id, client_secret, timeout=300, rate_limiter=rate_limiter,
+                                     recording=ResponseRecording(replay_dir, "replay"))
+    else:
+        # Reuse responses from recent runs instead of spending rate limited requests on them
+        notam_cache = SQLiteNotamCache("notam_cache.sqlite3", ttl=600)
+        # Once the cache expires, only fetch NOTAMs updated since the last briefing of each region
+        sync_store = SQLiteNotamSyncStore("notam_sync.sqlite3")
+        notam_fetcher = NotamFetcher(client_id, client_secret, timeout=300, cache=notam_cache, rate_limiter=rate_limiter,
+                                     sync_store=sync_store, api_url=os.getenv("NOTAM_API_URL"),
+                                     recording=ResponseRecording(record_dir, "record") if record_dir is not None else None)
     
-    all_notams : list[CoreNOTAMData] = []
+    # Query circles reach past the corridor, NOTAMs whose areas don't touch it are dropped
+    with span("waypoints") as waypoints_span:
+        route_waypoints = flight_path.get_waypoints_by_gap(ROUTE_WAYPOINT_GAP_MILES)
+        waypoints_span.set_attribute("waypoints", len(route_waypoints))
+    printer = NotamPrinter(max_lines=3)
+    top_notams = RunningTopK(LIVE_TOP_K)
+
+    fetched_count = 0
+    first_shown_time: float | None = None
+    corridor_notams : list[CoreNOTAMData] = []
+    uncovered_waypoints: list[tuple[float, float]] = []
     start_time = time.perf_counter()
+
+    def rankings():
+        """
+        Yields the top NOTAMs found so far each time a query returns NOTAMs that change them.
+        """
+        nonlocal fetched_count, first_shown_time
+        for notams in notam_fetcher.iter_notams_by_latlong_list(coverage_plan.waypoints, coverage_plan.radius):
+            fetched_count += len(notams)
+            with span("corridor_filter", notams=len(notams)) as filter_span:
+                new_corridor_notams = NotamSpatialIndex(notams).query_corridor(route_waypoints, CORRIDOR_WIDTH_NM)
+                filter_span.set_attribute("corridor_notams", len(new_corridor_notams))
+            corridor_notams.extend(new_corridor_notams)
+            if top_notams.add(notam.notam for notam in new_corridor_notams):
+                if first_shown_time is None:
+                    first_shown_time = time.perf_counter()
+                    logger.info(f"First NOTAMs shown after {first_shown_time-start_time:.3f} seconds")
+                yield top_notams.top()
+
     try:
-        all_notams = notam_fetcher.fetch_notams_by_latlong_list(waypoints, 30)
+        # Show the most important NOTAMs while the rest are fetched, then the complete sorted list
+        with span("fetch") as fetch_span:
+            printer.print_notams_live(rankings(), transient=True)
+            fetch_span.set_attributes(notams=fetched_count, corridor_notams=len(corridor_notams))
     except NotamFetcherUnauthenticatedError:
         logging.error("Invalid client_id or secret.")
         sys.exit("Invalid client_id or secret.")
@@ -85,16 +137,73 @@ def main():
     except NotamFetcherRateLimitError:
         logging.error("Failed to retrieve NOTAMs due to rate limits.")
         sys.exit("Failed to retrieve NOTAMs due to rate limits.") 
+    except NotamFetcherTimeoutReached as e:
+        # Brief with the NOTAMs fetched in time, and say which parts of the route are missing
+        uncovered_waypoints = e.uncovered_waypoints
+        logger.warning(f"Timed out fetching NOTAMs, {len(uncovered_waypoints)} of {len(coverage_plan.waypoints)} "
+                       f"query areas were not covered: {uncovered_waypoints}")
+    finally:
+        # Shows whether a slow fetch waited on the API, on rate limiting or on many pages
+        for line in notam_fetcher.metrics.summary():
+            logger.info(line)
+        metrics_file = os.getenv("NOTAM_METRICS_FILE")
+        if metrics_file is not None:
+            with open(metrics_file, "w") as file:
+                file.write(notam_fetcher.metrics.exposition())
     end_time = time.perf_counter()
 
-    notams = [notam.notam for notam in all_notams]
-    logger.info(f"Fetched {len(notams)} unique NOTAMs in {end_time-start_time:.3f} seconds")
+    logger.info(f"Fetched {fetched_count} unique NOTAMs in {end_time-start_time:.3f} seconds")
+    logger.info(f"{len(corridor_notams)} of {fetched_count} NOTAMs are within the {CORRIDOR_WIDTH_NM} nm corridor")
+
+    notams = [notam.notam for notam in corridor_notams]
 
     sorter = NotamSorter(notams)
 
-    sorted_notams = sorter.sort_by_score()
-    printer = NotamPrinter(max_lines=3)
-    printer.print_notams(sorted_notams)
+    # Print the highest scoring NOTAMs without waiting for the rest to be ranked
+    with span("render", notams=len(notams)):
+        printer.print_notams(sorter.iter_ranked())
+
+    if uncovered_waypoints:
+        print(f"WARNING: NOTAMs could not be fetched in time for {len(uncovered_waypoints)} of {len(coverage_plan.waypoints)} "
+              f"areas along the route, centered at: "
+              + ", ".join(f"({lat:.2f}, {long:.2f})" for lat, long in uncovered_waypoints))
+
+def main():
+    """
+    Main execution block:
+    - Load environment variables for CLIENT_ID and CLIENT_SECRET
+    - Calls get_flight_input() to get user input.
+    - Validates the input using AirportCodeValidator.
+    - Prints a confirmation message if valid or an error message if invalid.
+    - Uses FlightPath to plan the fewest NOTAM queries covering the route's corridor.
+    - Calls NotamFetcher for each query in the plan, reusing cached responses from recent runs.
+      NOTAM_API_URL points it at another API (ex: fake_api_server.py), NOTAM_RECORD_DIR records the responses
+      and NOTAM_REPLAY_DIR replays recorded responses offline, without the cache or sync store.
+    - Traces each stage to NOTAM_TRACE_FILE and/or NOTAM_TRACE_OTLP_FILE if set (see start_tracer).
+    - Logs a summary of the requests sent, and writes their metrics in the Prometheus text format to NOTAM_METRICS_FILE if set.
+    - Keeps the NOTAMs whose areas intersect the corridor using NotamSpatialIndex.
+    - Shows the highest ranked NOTAMs live as each query returns
+    - Sorts using NOTAM sorter
+    - Prints using NotamPrinter, with a warning listing the parts of the route whose NOTAMs could not be fetched in time
+    """
+
+    load_dotenv()
+    CLIENT_ID = os.getenv("CLIENT_ID")
+    CLIENT_SECRET = os.getenv("CLIENT_SECRET")
+
+    if CLIENT_ID is None:
+        logger.error("CLIENT_ID not set in .env file")
+        sys.exit("Error: CLIENT_ID not set in .env file")
+    if CLIENT_SECRET is None:
+        sys.exit("Error: CLIENT_SECRET not set in .env file")
+    tracer = start_tracer()
+    try:
+        with span("briefing"):
+            brief(CLIENT_ID, CLIENT_SECRET)
+    finally:
+        if tracer is not None:
+            set_tracer(None)
+            tracer.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,46 @@
+import argparse, logging, os
+
+from fake_notam_api import PROFILES, FakeNotamAPIServer, RecordedNotams
+
+logger = logging.getLogger("fake_api_server")
+
+# Responses saved by scripts/schema-generation/collect.py
+COLLECTED_DIR = os.path.join(os.path.dirname(__file__), "scripts", "schema-generation", "collected")
+
+
+def main():
+    """
+    Serves recorded NOTAMs like the FAA NOTAM API until interrupted, for load testing offline:
+    - Loads every success response in --data, or generates a --synthetic corpus of NOTAMs around busy US airports
+    - Delays and rate limits responses according to --profile
+    - Point driver.py at it with NOTAM_API_URL=http://127.0.0.1:8081/notamapi/v1/notams
+    """
+    parser = argparse.ArgumentParser(description="Serve recorded NOTAMs like the FAA NOTAM API.")
+    parser.add_argument("--data", default=COLLECTED_DIR, help="Directory of recorded responses")
+    parser.add_argument("--synthetic", type=int, metavar="COUNT", help="Serve COUNT synthetic NOTAMs instead of --data")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="faa", help="Latency and rate limiting")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8081, help="Port to listen on")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random latency and throttling")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(name)s] [%(levelname)s] %(message)s')
+
+    if args.synthetic is not None:
+        from benchmarks.synthetic import iter_corpus
+        notams = RecordedNotams(iter_corpus(args.synthetic, args.seed))
+    else:
+        notams = RecordedNotams.from_directory(args.data)
+
+    server = FakeNotamAPIServer(notams, PROFILES[args.profile], args.host, args.port, seed=args.seed)
+    logger.info(f"Serving {len(notams)} NOTAMs with the {args.profile} profile on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"{server.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from .fake_notam_api import FakeNotamAPIServer, FakeNotamAPIHandler, RecordedNotams
+from .types import APIProfile, APIStats, PROFILES
+
+__all__ = ["FakeNotamAPIServer", "FakeNotamAPIHandler", "RecordedNotams", "APIProfile", "APIStats", "PROFILES"]
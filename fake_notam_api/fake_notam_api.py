@@ -0,0 +1,221 @@
+from collections import deque
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+import json, logging, math, random, threading, time
+
+import numpy as np
+
+from notam_spatial_index.geometry import haversine, parse_notam_coordinates
+from .types import APIProfile, APIStats, PROFILES
+
+
+def _parse_timestamp(value: str) -> float:
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+class RecordedNotams:
+    '''
+    The NOTAMs a FakeNotamAPIServer answers queries from, as API items.
+
+    Queries are answered like the FAA API: lat/long queries return the NOTAMs whose coordinates are within the radius,
+    airport code queries the NOTAMs whose icaoLocation or location is the code, and lastUpdatedDate keeps only the
+    NOTAMs updated since. Each item is serialized once, so pages are served without encoding JSON per request.
+    '''
+    logger = logging.getLogger("RecordedNotams")
+
+    def __init__(self, items: Iterable[Dict[str, Any]]):
+        '''
+        Args:
+            items (Iterable[Dict[str, Any]]): API items (NOTAM features) as decoded JSON. Later items replace earlier
+                items with the same NOTAM id.
+        '''
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            by_id[item["properties"]["coreNOTAMData"]["notam"]["id"]] = item
+        self.items = list(by_id.values())
+        self._content = [json.dumps(item).encode() for item in self.items]
+
+        notams = [item["properties"]["coreNOTAMData"]["notam"] for item in self.items]
+        positions = [parse_notam_coordinates(notam.get("coordinates") or "") for notam in notams]
+        self._lat = np.array([position[0] if position else np.nan for position in positions], dtype=np.float64)
+        self._long = np.array([position[1] if position else np.nan for position in positions], dtype=np.float64)
+        self._last_updated = np.array([_parse_timestamp(notam["lastUpdated"]) for notam in notams], dtype=np.float64)
+        self._locations: Dict[str, List[int]] = {}
+        for index, notam in enumerate(notams):
+            for code in {notam.get("icaoLocation"), notam.get("location")} - {None}:
+                self._locations.setdefault(code.upper(), []).append(index)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @classmethod
+    def from_directory(cls, directory: str | Path) -> "RecordedNotams":
+        '''
+        Loads the items of every success response saved as a .json file in directory, ex: the responses collect.py
+        saves in collected/ or a ResponseRecording's directory. Other files are skipped.
+        '''
+        items: List[Dict[str, Any]] = []
+        for path in sorted(Path(directory).glob("*.json")):
+            try:
+                response = json.loads(path.read_bytes())
+            except ValueError:
+                cls.logger.warning(f"Skipping {path.name}, not JSON")
+                continue
+            if not isinstance(response, dict) or "items" not in response:
+                cls.logger.warning(f"Skipping {path.name}, not a success response")
+                continue
+            items.extend(response["items"])
+        cls.logger.info(f"Loaded {len(items)} items from {directory}")
+        return cls(items)
+
+    def query(self, params: Dict[str, str]) -> List[int]:
+        '''
+        Returns the positions in items of the NOTAMs matching a request's query params, in item order.
+
+        Raises:
+            ValueError: If the params are missing or invalid.
+        '''
+        if "icaoLocation" in params:
+            matches = np.array(self._locations.get(params["icaoLocation"].strip().upper(), []), dtype=np.int64)
+        else:
+            lat, long = float(params["locationLatitude"]), float(params["locationLongitude"])
+            radius = float(params["locationRadius"])
+            if not 0 < radius <= 100:
+                raise ValueError("locationRadius must be greater than 0 and at most 100")
+            with np.errstate(invalid="ignore"):
+                matches = np.flatnonzero(haversine(self._lat, self._long, lat, long) <= radius)
+
+        if "lastUpdatedDate" in params:
+            since = _parse_timestamp(params["lastUpdatedDate"])
+            matches = matches[self._last_updated[matches] >= since]
+        return matches.tolist()
+
+    def page(self, params: Dict[str, str]) -> bytes:
+        '''
+        Returns the success response body for a request's query params.
+
+        Raises:
+            ValueError: If the params are missing or invalid.
+        '''
+        page_num, page_size = int(params.get("pageNum", 1)), int(params.get("pageSize", 50))
+        if page_num < 1 or not 0 < page_size <= 1000:
+            raise ValueError("pageNum must be at least 1 and pageSize between 1 and 1000")
+        matches = self.query(params)
+        page_items = matches[(page_num - 1) * page_size:page_num * page_size]
+        header = json.dumps({
+            "pageSize": page_size,
+            "pageNum": page_num,
+            "totalCount": len(matches),
+            "totalPages": math.ceil(len(matches) / page_size),
+        })
+        return b"".join([header[:-1].encode(), b', "items": [', b", ".join(self._content[i] for i in page_items), b"]}"])
+
+
+class FakeNotamAPIHandler(BaseHTTPRequestHandler):
+    '''
+    Answers GET requests on any path like the FAA NOTAM API, see FakeNotamAPIServer.
+    '''
+    logger = logging.getLogger("FakeNotamAPIHandler")
+    server: "FakeNotamAPIServer"
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        status, content = self.server.respond(params, self.headers.get("client_id"), self.headers.get("client_secret"))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any):
+        self.logger.debug(f"{self.address_string()} {format % args}")
+
+
+class FakeNotamAPIServer(ThreadingHTTPServer):
+    '''
+    A local stand-in for the FAA NOTAM API, for load testing without credentials or network.
+
+    Serves RecordedNotams with the API's pagination and error bodies, delayed and rate limited by an APIProfile.
+    Point a NotamFetcher or AsyncNotamFetcher at it with api_url=server.url. Call serve_forever() (ex: on a
+    background thread) to start answering.
+    '''
+    daemon_threads = True
+    logger = logging.getLogger("FakeNotamAPIServer")
+
+    def __init__(self, notams: RecordedNotams, profile: APIProfile = PROFILES["instant"], host: str = "127.0.0.1",
+                 port: int = 0, client_id: Optional[str] = None, client_secret: Optional[str] = None, seed: int = 0):
+        '''
+        Args:
+            notams (RecordedNotams): The NOTAMs to serve.
+            profile (APIProfile): Latency and rate limiting of the responses.
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+            client_id (Optional[str]): The only client id accepted. Any is accepted if None.
+            client_secret (Optional[str]): The only client secret accepted. Any is accepted if None.
+            seed (int): Seed of the random latency and throttling, so runs are repeatable.
+        '''
+        self.notams = notams
+        self.profile = profile
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.stats = APIStats()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._request_times: Deque[float] = deque()
+        super().__init__((host, port), FakeNotamAPIHandler)
+
+    @property
+    def url(self) -> str:
+        '''
+        The NOTAM API endpoint of the server.
+        '''
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/notamapi/v1/notams"
+
+    def respond(self, params: Dict[str, str], client_id: Optional[str], client_secret: Optional[str]) -> tuple[int, bytes]:
+        '''
+        Returns the status and body answering a request, after the profile's latency.
+        '''
+        with self._lock:
+            self.stats.requests += 1
+            delay = self.profile.latency + self._random.uniform(0, self.profile.jitter)
+            throttled = self._throttle(time.monotonic())
+            if throttled:
+                self.stats.throttled += 1
+        time.sleep(delay)
+
+        if throttled:
+            return HTTPStatus.TOO_MANY_REQUESTS, json.dumps({"message": "Too Many Requests"}).encode()
+        if ((self.client_id is not None and client_id != self.client_id)
+                or (self.client_secret is not None and client_secret != self.client_secret)):
+            with self._lock:
+                self.stats.unauthenticated += 1
+            return HTTPStatus.UNAUTHORIZED, json.dumps({"error": "Invalid client id or secret"}).encode()
+        try:
+            content = self.notams.page(params)
+        except (KeyError, ValueError) as e:
+            return HTTPStatus.BAD_REQUEST, json.dumps({"error": f"Invalid request: {e}"}).encode()
+        with self._lock:
+            self.stats.bytes_served += len(content)
+        return HTTPStatus.OK, content
+
+    def _throttle(self, now: float) -> bool:
+        '''
+        Returns whether a request at now is answered 429, counting it in the rolling window if not.
+        '''
+        if self._random.random() < self.profile.throttle_rate:
+            return True
+        if self.profile.max_requests is not None:
+            while self._request_times and now - self._request_times[0] >= self.profile.period:
+                self._request_times.popleft()
+            if len(self._request_times) >= self.profile.max_requests:
+                return True
+        self._request_times.append(now)
+        return False
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class APIProfile:
+    '''
+    How a FakeNotamAPIServer delays and throttles responses.
+    '''
+    latency: float = 0.0 # seconds before each response
+    jitter: float = 0.0 # up to this many seconds are added to latency at random
+    max_requests: Optional[int] = None # requests allowed per period before 429s, unlimited if None
+    period: float = 60.0 # seconds of the rolling rate limit window
+    throttle_rate: float = 0.0 # fraction of requests answered 429 at random, even under max_requests
+
+
+# Named profiles for load tests, see fake_api_server.py
+PROFILES: Dict[str, APIProfile] = {
+    "instant": APIProfile(),
+    "lan": APIProfile(latency=0.01, jitter=0.005),
+    "faa": APIProfile(latency=0.4, jitter=0.3, max_requests=30, period=60),
+    "throttled": APIProfile(latency=0.8, jitter=0.6, max_requests=10, period=60, throttle_rate=0.05),
+}
+
+
+@dataclass
+class APIStats:
+    '''
+    Requests a FakeNotamAPIServer has answered.
+    '''
+    requests: int = 0
+    throttled: int = 0 # answered 429
+    unauthenticated: int = 0
+    bytes_served: int = 0 # bodies of success responses
@@ -0,0 +1,166 @@
+# type: ignore
+'''
+Vectorized positions along WGS84 geodesics.
+
+GeographicLib solves for a point along a geodesic (GeodesicLine.Position) one point at a time. This module
+evaluates the same series for many points, on many geodesics, in a few NumPy operations. The geodesic
+coefficients still come from GeographicLib, so results agree with GeodesicLine.Position to within floating point
+rounding (well under a millimeter).
+
+The coefficients are private GeodesicLine attributes, so they are only read from the GeographicLib version pinned
+in requirements.txt. With any other version, positions falls back to calling GeodesicLine.Position for each point.
+'''
+from typing import List, Sequence, Tuple
+import logging
+
+import geographiclib
+import numpy as np
+from geographiclib.geodesic import Geodesic
+from geographiclib.geodesicline import GeodesicLine
+
+logger = logging.getLogger("batch_geodesic")
+
+# GeodesicLine attributes used to evaluate positions, gathered per point
+_SCALAR_PARAMS = ["_b", "_A1m1", "_stau1", "_ctau1", "_B11", "_ssig1", "_csig1", "_salp0", "_calp0",
+                  "_somg1", "_comg1", "_A3c", "_B31", "lon1"]
+_SERIES_PARAMS = ["_C1pa", "_C3a"]
+
+# The GeographicLib version whose GeodesicLine attributes match _SCALAR_PARAMS and _SERIES_PARAMS
+SUPPORTED_GEOGRAPHICLIB_VERSION = "2.0"
+_BATCHED = geographiclib.__version__ == SUPPORTED_GEOGRAPHICLIB_VERSION
+if not _BATCHED:
+    logger.warning(f"GeographicLib {geographiclib.__version__} is installed, batched geodesic positions need "
+                   f"{SUPPORTED_GEOGRAPHICLIB_VERSION}. Computing positions one point at a time.")
+
+
+def geodesic_lines(coordinate_pairs: Sequence[Tuple[Tuple[float, float], Tuple[float, float]]]) -> List[GeodesicLine]:
+    '''
+    Returns the WGS84 geodesic between each (start, end) pair of (latitude, longitude) coordinates.
+    '''
+    return [Geodesic.WGS84.InverseLine(start[0], start[1], end[0], end[1]) for start, end in coordinate_pairs]
+
+
+def _sin_cos_series(sinx: np.ndarray, cosx: np.ndarray, c: np.ndarray) -> np.ndarray:
+    '''
+    Vectorized Geodesic._SinCosSeries for sine series: sum(c[i] * sin(2*i*x), i, 1, n) using Clenshaw summation.
+
+    c has one row of coefficients per point, c[:, 0] is unused.
+    '''
+    k = c.shape[1]
+    n = k - 1
+    ar = 2 * (cosx - sinx) * (cosx + sinx) # 2 * cos(2 * x)
+    y1 = np.zeros_like(sinx)
+    if n & 1:
+        k -= 1; y0 = c[:, k].copy()
+    else:
+        y0 = np.zeros_like(sinx)
+    n //= 2
+    while n:
+        n -= 1
+        k -= 1; y1 = ar * y0 - y1 + c[:, k]
+        k -= 1; y0 = ar * y1 - y0 + c[:, k]
+    return 2 * sinx * cosx * y0
+
+
+def _ang_normalize(x: np.ndarray) -> np.ndarray:
+    ''' Vectorized Math.AngNormalize, reduces angles to [-180, 180]. '''
+    y = x - 360 * np.round(x / 360)
+    return np.where(np.abs(y) == 180, np.copysign(180.0, x), y)
+
+
+def positions(lines: Sequence[GeodesicLine], line_indices: np.ndarray, distances: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Computes points along geodesics.
+
+    Args:
+        lines (Sequence[GeodesicLine]): The geodesics, e.g. from geodesic_lines.
+        line_indices (np.ndarray): For each point, the index of its geodesic in lines.
+        distances (np.ndarray): For each point, its distance in meters from the start of its geodesic.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The latitude and longitude of each point in degrees.
+
+    Raises:
+        ValueError: If a geodesic is on an ellipsoid with |f| > 0.01 and positions are batched.
+    '''
+    line_indices = np.asarray(line_indices, dtype=np.intp)
+    distances = np.asarray(distances, dtype=float)
+    if not _BATCHED:
+        return _positions_one_by_one(lines, line_indices, distances)
+    if any(abs(line.f) > 0.01 for line in lines):
+        raise ValueError("Batched positions are only accurate for ellipsoids with |f| <= 0.01, such as WGS84")
+
+    p = {name: np.array([getattr(line, name) for line in lines], dtype=float)[line_indices] for name in _SCALAR_PARAMS}
+    c = {name: np.array([getattr(line, name) for line in lines], dtype=float)[line_indices] for name in _SERIES_PARAMS}
+    f1 = np.array([line._f1 for line in lines], dtype=float)[line_indices]
+
+    # Follows GeodesicLine._GenPosition for a distance, computing latitude and longitude only
+    tau12 = distances / (p["_b"] * (1 + p["_A1m1"]))
+    s = np.sin(tau12); co = np.cos(tau12)
+    B12 = -_sin_cos_series(p["_stau1"] * co + p["_ctau1"] * s, p["_ctau1"] * co - p["_stau1"] * s, c["_C1pa"])
+    sig12 = tau12 - (B12 - p["_B11"])
+    ssig12 = np.sin(sig12); csig12 = np.cos(sig12)
+
+    ssig2 = p["_ssig1"] * csig12 + p["_csig1"] * ssig12
+    csig2 = p["_csig1"] * csig12 - p["_ssig1"] * ssig12
+    sbet2 = p["_calp0"] * ssig2
+    cbet2 = np.hypot(p["_salp0"], p["_calp0"] * csig2)
+    degenerate = cbet2 == 0
+    cbet2 = np.where(degenerate, Geodesic.tiny_, cbet2)
+    csig2 = np.where(degenerate, Geodesic.tiny_, csig2)
+
+    somg2 = p["_salp0"] * ssig2; comg2 = csig2
+    omg12 = np.arctan2(somg2 * p["_comg1"] - comg2 * p["_somg1"], comg2 * p["_comg1"] + somg2 * p["_somg1"])
+    lam12 = omg12 + p["_A3c"] * (sig12 + (_sin_cos_series(ssig2, csig2, c["_C3a"]) - p["_B31"]))
+    lon2 = _ang_normalize(_ang_normalize(p["lon1"]) + _ang_normalize(np.degrees(lam12)))
+    lat2 = np.degrees(np.arctan2(sbet2, f1 * cbet2))
+    return lat2, lon2
+
+
+def _positions_one_by_one(lines: Sequence[GeodesicLine], line_indices: np.ndarray, distances: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Computes points along geodesics with GeodesicLine.Position, for GeographicLib versions positions can not batch.
+    '''
+    results = [lines[index].Position(distance, Geodesic.LATITUDE | Geodesic.LONGITUDE)
+               for index, distance in zip(line_indices.tolist(), distances.tolist())]
+    return (np.array([result["lat2"] for result in results], dtype=float),
+            np.array([result["lon2"] for result in results], dtype=float))
+
+
+def waypoints_along(coordinate_pairs: Sequence[Tuple[Tuple[float, float], Tuple[float, float]]],
+                    counts: Sequence[int]) -> List[List[Tuple[float, float]]]:
+    '''
+    Computes equally spaced waypoints along the geodesic between each (start, end) pair.
+
+    Every point of every route is computed in one batched call to positions.
+
+    Args:
+        coordinate_pairs (Sequence[Tuple[Tuple[float, float], Tuple[float, float]]]): (latitude, longitude) of the start and end of each route.
+        counts (Sequence[int]): The number of waypoints between the start and end of each route.
+
+    Returns:
+        List[List[Tuple[float, float]]]: For each route, the start, its waypoints and the end.
+            A route that starts and ends at the same coordinates is just its start.
+    '''
+    lines = geodesic_lines(coordinate_pairs)
+    counts = np.array([count if tuple(start) != tuple(end) else 0 for (start, end), count in zip(coordinate_pairs, counts)], dtype=np.intp)
+
+    # Flatten the waypoints of every route into one array, recording the route each belongs to
+    line_indices = np.repeat(np.arange(len(lines)), counts)
+    offsets = np.cumsum(counts) - counts
+    steps = np.arange(counts.sum()) - np.repeat(offsets, counts) + 1
+    route_lengths = np.array([line.s13 for line in lines], dtype=float)
+    distances = route_lengths[line_indices] * steps / (counts[line_indices] + 1)
+    lats, lons = positions(lines, line_indices, distances) if len(lines) else (np.empty(0), np.empty(0))
+    lats = lats.tolist(); lons = lons.tolist()
+
+    routes = []
+    for (start, end), offset, count in zip(coordinate_pairs, offsets.tolist(), counts.tolist()):
+        route = [(float(start[0]), float(start[1]))]
+        if tuple(start) == tuple(end):
+            routes.append(route)
+            continue
+        route.extend(zip(lats[offset:offset + count], lons[offset:offset + count]))
+        route.append((float(end[0]), float(end[1])))
+        routes.append(route)
+    return routes
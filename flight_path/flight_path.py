@@ -1,10 +1,10 @@
 # type: ignore
-import logging
-from typing import Tuple, List
-from geopy import Point
+import logging, math
+from typing import Sequence, Tuple, List
 from geopy.distance import geodesic
-from geographiclib.geodesic import Geodesic
+from .batch_geodesic import geodesic_lines, waypoints_along
 from .exceptions import GapIsNotValid
+from .types import CoveragePlan
 from airport_data.airport_data import AirportData
 from airport_data.types import Airport
 # to visualize
@@ -19,10 +19,16 @@ class FlightPath:
     Features:
         - Retrieves coordinates for given airport codes. (Private)
         - Computes equally spaced waypoints along a great-circle path. (We can choose how may points along the path we want)
+        - Computes waypoints for many routes at once with vectorized geodesic math.
         - Uses GeographicLib for precise bearing calculations. (precise just means not in a straight line. Instead, this library takes into consideration the curvature of the earth!)
+        - Plans the fewest NOTAM radius queries that cover a corridor around the path.
 
     '''
     logger = logging.getLogger("FlightPath")
+    # Radii are shrunk by this fraction when planning coverage, to absorb the difference between
+    # the flat-plane coverage bound and distances on the WGS84 ellipsoid.
+    COVERAGE_SAFETY_MARGIN = 0.01
+    METERS_PER_MILE = 1609.344
 
     def __init__(self, departure: Airport, destination: Airport):
         self.departure_coords = departure.coordinates
@@ -47,34 +53,9 @@ class FlightPath:
         Returns:
             list: A list of tuples containing the latitude and longitude of each waypoint, including the departure and destination airport
         """
-        # turn the coords into points using geopy library
-        depart = Point(self.departure_coords[0], self.departure_coords[1])
-        dest = Point(self.destination_coords[0], self.destination_coords[1])
-        result = [(depart.latitude, depart.longitude)]
-        
-        # when dest == depart, we return the coordinates of the departure airport
-        if (depart == dest):
-            return result
-        
-        # find n points on the way
-        total_dist = geodesic(depart, dest).miles # this is real world distance on earth, great-circle distance.
-        step_size = total_dist/ (n+1)
-        # get the direction of the two points, bearing (angle of the line)
-        bearing = Geodesic.WGS84.Inverse(self.departure_coords[0], self.departure_coords[1], self.destination_coords[0], self.destination_coords[1])
-
-        self.logger.debug(f"Computing {n} waypoints along route of length "
-                f"{total_dist:.3f} nm with step size of {step_size:.3f} nm")
-
-        for i in range(1, n+1):
-            current_distance = step_size * i
-            next_point = geodesic(miles = current_distance).destination(depart, bearing["azi1"]) # --> az1 here is the initial bearing (the angle of the line from the departure to the destination airport)
-            result.append((next_point.latitude, next_point.longitude))
-            self.logger.debug(f"Computed point {i}: ({next_point.latitude}, "
-                    f"{next_point.longitude}), {current_distance:.3f} nm along route "
-                    f"({(current_distance/total_dist)*100:.3f}%)" )
-        
-        result.append((dest.latitude, dest.longitude))
-        
+        result = self.get_waypoints_by_num_bulk([(self.departure_coords, self.destination_coords)], n)[0]
+        self.logger.debug(f"Computed {len(result) - 2} waypoints along route from "
+                f"{self.departure_coords} to {self.destination_coords}")
         return result
     
     def get_waypoints_by_gap(self, gap: float) -> List[Tuple[float, float]]:
@@ -90,19 +71,115 @@ class FlightPath:
         Returns:
             list: A list of tuples containing the latitude and longitude of each waypoint.
         """
-        depart = Point(self.departure_coords[0], self.departure_coords[1])
-        dest = Point(self.destination_coords[0], self.destination_coords[1])
+        return self.get_waypoints_by_gap_bulk([(self.departure_coords, self.destination_coords)], gap)[0]
 
-        # Calculate total great-circle distance between departure and destination
-        total_dist = geodesic(depart, dest).miles  
+    @staticmethod
+    def get_waypoints_by_num_bulk(routes: Sequence[Tuple[Tuple[float, float], Tuple[float, float]]],
+                                  n: int) -> List[List[Tuple[float, float]]]:
+        """
+        Generates `n` waypoints along each of many routes at once.
+
+        All waypoints of all routes are computed in one vectorized call, which is much faster than a FlightPath per route
+        when precomputing many routes. Results match get_waypoints_by_num.
+
+        Args:
+            routes (Sequence[((float, float), (float, float))]): (latitude, longitude) of the departure and destination of each route.
+            n (int): Number of waypoints to generate on each route.
+
+        Returns:
+            list: For each route, a list of tuples containing the latitude and longitude of each waypoint, including the departure and destination
+        """
+        waypoints = waypoints_along(routes, [n] * len(routes))
+        FlightPath.logger.debug(f"Computed {n} waypoints along each of {len(routes)} routes")
+        return waypoints
+
+    @staticmethod
+    def get_waypoints_by_gap_bulk(routes: Sequence[Tuple[Tuple[float, float], Tuple[float, float]]],
+                                  gap: float) -> List[List[Tuple[float, float]]]:
+        """
+        Generates waypoints approximately 'gap' miles apart along each of many routes at once.
+
+        Args:
+            routes (Sequence[((float, float), (float, float))]): (latitude, longitude) of the departure and destination of each route.
+            gap (float): The distance (in miles) between each waypoint.
 
-        # Determine the number of waypoints based on the gap
+        Returns:
+            list: For each route, a list of tuples containing the latitude and longitude of each waypoint.
+
+        Raises:
+            GapIsNotValid: If gap is not positive.
+        """
         if gap <= 0:
             raise GapIsNotValid("Gap is not a valid number.")
-        
-        num_waypoints = int(total_dist // gap)  # Number of waypoints along the route
 
-        return self.get_waypoints_by_num(num_waypoints)
+        lines = geodesic_lines(routes)
+        # Number of waypoints along each route, from its great-circle distance in miles
+        counts = [int((line.s13 / FlightPath.METERS_PER_MILE) // gap) for line in lines]
+        waypoints = waypoints_along(routes, counts)
+        FlightPath.logger.debug(f"Computed {sum(counts)} waypoints {gap} miles apart along {len(routes)} routes")
+        return waypoints
+
+    def get_coverage_plan(self, corridor_width: float, max_radius: float = 100.0) -> CoveragePlan:
+        """
+        Computes the fewest NOTAM radius queries that fully cover a corridor around the flight path.
+
+        Query circles are centered on the great-circle track. Two circles of radius r whose centers are s apart
+        cover the corridor between them to w either side of the track when (s/2)^2 + w^2 <= r^2, so the
+        centers are spread as far apart as max_radius allows. Once the number of circles is known the radius is
+        reduced to the smallest that still covers the corridor, which returns fewer NOTAMs from outside it.
+
+        Args:
+            corridor_width (float): Total width of the corridor in nautical miles, half on each side of the track.
+            max_radius (float): The largest query radius in nautical miles. (The NOTAM API allows at most 100)
+
+        Returns:
+            CoveragePlan: The query circle centers, their radius and the corridor width they are guaranteed to cover.
+
+        Raises:
+            ValueError: If corridor_width is not positive or is too wide for max_radius to cover.
+        """
+        if corridor_width <= 0:
+            raise ValueError("corridor_width must be greater than 0")
+
+        half_width = corridor_width / 2
+        usable_radius = max_radius * (1 - self.COVERAGE_SAFETY_MARGIN)
+        if half_width >= usable_radius:
+            raise ValueError(f"A corridor {corridor_width} nm wide cannot be covered by circles of radius {max_radius} nm")
+
+        route_length = geodesic(self.departure_coords, self.destination_coords).nautical
+
+        if route_length / 2 + half_width <= usable_radius:
+            # One circle centered on the midpoint covers the whole route, including past each end
+            waypoints = [self.get_waypoints_by_num(1)[1]] if route_length > 0 else [self.departure_coords]
+            spacing = 0.0
+            radius = route_length / 2 + half_width
+        else:
+            # Circles on both ends cover past each end of the route, since every radius is at least half_width
+            max_spacing = 2 * math.sqrt(usable_radius**2 - half_width**2)
+            segments = math.ceil(route_length / max_spacing)
+            spacing = route_length / segments
+            waypoints = self.get_waypoints_by_num(segments - 1)
+            radius = math.sqrt((spacing / 2)**2 + half_width**2)
+
+        # The API takes the radius as a decimal, round up to a tenth of a nautical mile
+        radius = min(math.ceil(radius / (1 - self.COVERAGE_SAFETY_MARGIN) * 10) / 10, max_radius)
+        effective_radius = radius * (1 - self.COVERAGE_SAFETY_MARGIN)
+        if len(waypoints) == 1:
+            guaranteed_half_width = effective_radius - route_length / 2
+        else:
+            guaranteed_half_width = math.sqrt(effective_radius**2 - (spacing / 2)**2)
+
+        self.logger.info(f"Planned {len(waypoints)} queries of radius {radius:.1f} nm covering a "
+                f"{corridor_width:.1f} nm wide corridor along a {route_length:.1f} nm route")
+
+        return CoveragePlan(
+            waypoints=waypoints,
+            radius=radius,
+            spacing=spacing,
+            corridor_width=corridor_width,
+            guaranteed_corridor_width=2 * guaranteed_half_width,
+            route_length=route_length,
+        )
 
 
 # for testing purposes only!
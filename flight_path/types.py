@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+
+@dataclass(frozen=True)
+class CoveragePlan:
+    '''
+    A set of NOTAM radius queries covering a flight corridor.
+
+    Every point within guaranteed_corridor_width / 2 nautical miles of the great-circle track
+    (including beyond each end) lies inside at least one query circle.
+    '''
+    waypoints: List[Tuple[float, float]] # query circle centers along the track
+    radius: float # nautical miles
+    spacing: float # nautical miles between consecutive centers
+    corridor_width: float # requested width in nautical miles
+    guaranteed_corridor_width: float # width in nautical miles covered by the plan, at least corridor_width
+    route_length: float # nautical miles
+
+    @property
+    def request_count(self) -> int:
+        return len(self.waypoints)
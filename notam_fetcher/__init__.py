@@ -1,5 +1,12 @@
-from .notam_fetcher import NotamFetcher
-from .exceptions import NotamFetcherTimeoutReached, NotamFetcherRequestError, NotamFetcherUnauthenticatedError, NotamFetcherUnexpectedError, NotamFetcherBaseError, NotamFetcherValidationError
+from .notam_fetcher import NotamFetcher, NotamFetchResult
+from .async_notam_fetcher import AsyncNotamFetcher
+from .cache import NotamCache, MemoryNotamCache, SQLiteNotamCache
+from .rate_limiter import RateLimiter, RateLimiterStats
+from .recording import ResponseRecording
+from .metrics import FetcherMetrics
+from .projection import NotamSummary, ProjectedNOTAMData
+from .sync_store import NotamSyncStore, MemoryNotamSyncStore, SQLiteNotamSyncStore
+from .exceptions import NotamFetcherTimeoutReached, NotamFetcherRequestError, NotamFetcherUnauthenticatedError, NotamFetcherUnexpectedError, NotamFetcherBaseError, NotamFetcherValidationError, NotamFetcherPageError
 
 
-__all__ = ["NotamFetcher", "NotamFetcherTimeoutReached", "NotamFetcherRequestError", "NotamFetcherUnauthenticatedError", "NotamFetcherUnexpectedError", "NotamFetcherBaseError", "NotamFetcherValidationError"]
+__all__ = ["NotamFetcher", "NotamFetchResult", "AsyncNotamFetcher", "NotamCache", "MemoryNotamCache", "SQLiteNotamCache", "RateLimiter", "RateLimiterStats", "ResponseRecording", "FetcherMetrics", "NotamSyncStore", "MemoryNotamSyncStore", "SQLiteNotamSyncStore", "NotamSummary", "ProjectedNOTAMData", "NotamFetcherTimeoutReached", "NotamFetcherRequestError", "NotamFetcherUnauthenticatedError", "NotamFetcherUnexpectedError", "NotamFetcherBaseError", "NotamFetcherValidationError", "NotamFetcherPageError"]
@@ -20,7 +20,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, List, Literal, NamedTuple, Optional, Set
 
-from pydantic import BaseModel, ConfigDict, field_validator, alias_generators
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator, alias_generators
 
 
 class AdditionalGeometryData(BaseModel):
@@ -340,3 +340,7 @@ class APIResponseMessage(BaseModel):
     API returns a message response provided invalid parameters
     """
     message: str
+
+
+# Validates and serializes lists of NOTAMs as JSON, ex: cache and sync store entries
+NOTAM_LIST_ADAPTER = TypeAdapter(List[CoreNOTAMData])
@@ -0,0 +1,355 @@
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+import asyncio, copy, logging, time
+
+import httpx
+
+from tracing import span
+
+from .exceptions import (
+    NotamFetcherRequestError,
+    NotamFetcherUnauthenticatedError,
+    NotamFetcherRateLimitError,
+    NotamFetcherPageError,
+    NotamFetcherTimeoutReached
+)
+
+from .api_schema import CoreNOTAMData, APIResponseSuccess
+from .cache import NotamCache
+from .metrics import FetcherMetrics
+from .rate_limiter import RateLimiter
+from .sync_store import NotamSyncStore, apply_delta
+from .notam_fetcher import NotamFetcher, NotamAirportCodeRequest, NotamLatLongRequest, _parse_response, _unique_notams
+
+class AsyncNotamFetcher:
+    """
+    asyncio counterpart of NotamFetcher.
+
+    All requests go through a single httpx.AsyncClient, so connections to the FAA API are kept alive and reused.
+    At most `max_concurrency` requests are in flight at once, across every coroutine using the client.
+
+    Use as an async context manager, or call aclose() when done, to release pooled connections.
+    """
+    logger = logging.getLogger("AsyncNotamFetcher")
+    FAA_API_URL = NotamFetcher.FAA_API_URL
+    _page_size : int
+    timeout: int # max time to wait before an exception is thrown
+    MAX_BACKOFF_TIME: int = NotamFetcher.MAX_BACKOFF_TIME # maximum time to wait between throttled requests
+
+    def __init__(self, client_id: str, client_secret: str, page_size: int = 1000, timeout: int=60,
+                 max_concurrency: int = 10, cache: NotamCache | None = None, client: httpx.AsyncClient | None = None,
+                 rate_limiter: RateLimiter | None = None, sync_store: NotamSyncStore | None = None,
+                 api_url: str | None = None, metrics: FetcherMetrics | None = None):
+        """
+        Initializes an AsyncNotamFetcher client.
+
+        Args:
+            client_id (str): The client ID for authentication.
+            client_secret (str): The client secret for authentication.
+            page_size (int): The default page_size to use for API requests.
+            timeout (int): The max time to wait (in seconds) for fetch_notams_by_latlong_list to return before raising NotamFetcherTimeoutReached.
+            max_concurrency (int): The max number of requests in flight at once.
+            cache (NotamCache | None): Cache consulted before requesting NOTAMs from the API. Disabled if None.
+            client (httpx.AsyncClient | None): The HTTP client to send requests with. A pooled client is created if None.
+            rate_limiter (RateLimiter | None): Paces requests to the API. Uses the process wide RateLimiter.shared() if None.
+            sync_store (NotamSyncStore | None): Local store of previously fetched NOTAMs. If given, regions fetched before
+                only request NOTAMs updated since their last sync. Disabled if None.
+            api_url (str | None): The NOTAM API endpoint, ex: a FakeNotamAPIServer's url. Defaults to FAA_API_URL.
+            metrics (FetcherMetrics | None): Counts the requests sent, their latency, size and retries. A new
+                FetcherMetrics if None.
+
+        Raises:
+            ValueError: If max_concurrency is less than 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.page_size = page_size
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter.shared()
+        self.sync_store = sync_store
+        self.api_url = api_url or self.FAA_API_URL
+        self.metrics = metrics or FetcherMetrics()
+        self._client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def page_size(self):
+        return self._page_size
+
+    @page_size.setter
+    def page_size(self, value: int):
+        if value > 1000:
+            self.logger.error("page_size cannot be more than 1000")
+            raise ValueError("page_size should not exceed 1000")
+        if value <= 0:
+            self.logger.error("page_size cannot be less than zero")
+            raise ValueError("page_size must be greater than 0")
+        self._page_size = value
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info: Any):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Closes the pooled HTTP connections.
+        """
+        await self._client.aclose()
+
+    async def fetch_notams_by_airport_code(self, airport_code: str) -> list[CoreNOTAMData]:
+        """
+        Fetches ALL notams for a particular airport code.
+
+        Args:
+            airport_code (str): A valid ICAO airport code.
+
+        Returns:
+            List[CoreNOTAMData]: A complete list of NOTAMs for the airport code. An invalid airport code returns an empty list.
+
+        Raises:
+            NotamFetcherUnauthenticatedError: If AsyncNotamFetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a request error occurs while fetching from the API.
+        """
+        request = NotamAirportCodeRequest(airport_code)
+        request.page_size = self.page_size
+
+        return await self._fetch_all_notams(request)
+
+    async def fetch_notams_by_latlong(self, lat: float, long: float, radius: float = 100.0) -> list[CoreNOTAMData]:
+        """
+        Fetches ALL notams for a particular latitude and longitude.
+
+        Args:
+            lat (float): The latitude to fetch NOTAMs from.
+            long (float): The longitude to fetch NOTAMs from.
+            radius (float): The location radius criteria in nautical miles. (max:100)
+
+        Returns:
+            List[CoreNOTAMData]: A complete list of NOTAMs for the location.
+
+        Raises:
+            NotamFetcherUnauthenticatedError: If AsyncNotamFetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a request error occurs while fetching from the API.
+            ValueError: If the radius is less than or equal to 0 or greater than 100.
+        """
+        if radius > 100:
+            raise ValueError(f"Radius must be less than 100")
+        if radius <= 0:
+            raise ValueError(f"Radius must be greater than 0")
+
+        request = NotamLatLongRequest(lat, long, radius)
+        request.page_size = self.page_size
+
+        return await self._fetch_all_notams(request)
+
+    async def fetch_notams_by_latlong_list(self, waypoints: list[tuple[float, float]], radius: float = 100.0) -> list[CoreNOTAMData]:
+        """
+        Fetches ALL distinct notams for each (latitude, longitude) waypoint concurrently.
+
+        Waypoints are fetched concurrently, bounded by max_concurrency. Rate limited requests are retried with backoff
+        until the client's timeout.
+
+        Args:
+            waypoints (list[(float, float)]): The waypoints list to fetch NOTAMs from.
+            radius (float): The location radius criteria in nautical miles. (max:100)
+
+        Returns:
+            List[CoreNOTAMData]: A complete list of NOTAMs for the locations, in waypoint order.
+
+        Raises:
+            NotamFetcherUnauthenticatedError: If AsyncNotamFetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a request error occurs while fetching from the API.
+            ValueError: If the radius is less than or equal to 0 or greater than 100.
+            NotamFetcherTimeoutReached: If the request could not be completed before the Client's timeout.
+        """
+        time_start = time.monotonic()
+
+        async def _fetch_notams_with_retry(lat: float, long: float) -> list[CoreNOTAMData]:
+            attempts = 0
+            while True:
+                try:
+                    return await self.fetch_notams_by_latlong(lat, long, radius)
+                except (NotamFetcherRateLimitError, NotamFetcherPageError) as e:
+                    # Callers handle these the same whichever page failed, the partial NOTAMs are dropped
+                    if isinstance(e, NotamFetcherPageError) and isinstance(e.__cause__, (NotamFetcherRequestError, NotamFetcherUnauthenticatedError)):
+                        raise e.__cause__
+                    if isinstance(e, NotamFetcherPageError) and not isinstance(e.__cause__, NotamFetcherRateLimitError):
+                        raise
+                    attempts += 1
+                    self.logger.warning(f"Rate limited while fetching Notams at ({lat}, {long})."
+                                        f" {attempts} attempts made."
+                                        f" {time.monotonic() - time_start:0.2f} seconds since start.")
+                    self.metrics.retries.inc()
+                    self.metrics.backoff_seconds.inc(min(attempts**2, self.MAX_BACKOFF_TIME))
+                    await asyncio.sleep(min(attempts**2, self.MAX_BACKOFF_TIME))
+
+        tasks = [asyncio.ensure_future(_fetch_notams_with_retry(lat, long)) for lat, long in waypoints]
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*tasks), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise NotamFetcherTimeoutReached
+        finally:
+            # Once one waypoint fails the others are abandoned, stop them using the client and concurrency slots
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return _unique_notams(results)
+
+    async def _fetch_all_notams(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> list[CoreNOTAMData]:
+        """
+        Fetches NOTAMs across all pages from the the API.
+
+        If the client has a cache, a servable cached response is returned instead and new responses are stored in it.
+        If the client has a sync store and the request was synced before, only NOTAMs updated since then are requested
+        and applied to the stored NOTAMs (see apply_delta).
+
+        Args:
+            request (NotamAirportCodeRequest | NotamLatLongRequest): The airport or Lat/Long to pull all NOTAMs from. Page is ignored.
+
+        Returns:
+            list[CoreNOTAMData] if all requests returned a Success response.
+
+        Raises:
+            NotamFetcherPageError: If a page after the first failed. Holds the NOTAMs of the pages before it.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(request.cache_key())
+            if cached is not None:
+                self.metrics.queries.inc(source="cache")
+                return cached
+
+        synced_at = datetime.now(timezone.utc)
+        sync_state = self.sync_store.get(request.cache_key(), synced_at) if self.sync_store is not None else None
+        if sync_state is not None:
+            request = copy.copy(request)
+            request.last_updated_since = sync_state.since
+
+        notamItems: list[CoreNOTAMData] = []
+        pages = 0
+
+        try:
+            async for page in self._iter_pages(request):
+                pages += 1
+                notamItems.extend([item.properties.coreNOTAMData for item in page.items])
+        except NotamFetcherPageError as e:
+            e.notams = apply_delta(sync_state.notams, notamItems, synced_at) if sync_state is not None else notamItems
+            raise
+        self.metrics.queries.inc(source="api")
+        self.metrics.pages_per_query.observe(pages)
+
+        if sync_state is not None:
+            self.logger.debug(f"Applying {len(notamItems)} updated NOTAMs to {len(sync_state.notams)} stored for {request.cache_key()}")
+            notamItems = apply_delta(sync_state.notams, notamItems, synced_at)
+        if self.sync_store is not None:
+            self.sync_store.put(request.cache_key(), notamItems, synced_at, full=sync_state is None)
+
+        if self.cache is not None:
+            self.cache.put(request.cache_key(), notamItems)
+
+        return notamItems
+
+    async def _iter_pages(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> AsyncIterator[APIResponseSuccess]:
+        """
+        Yields every page of the response to request, in page order.
+
+        The first page is fetched to learn total_pages. The remaining pages are then fetched concurrently on copies of request,
+        and each is yielded once it and every page before it have arrived.
+
+        Raises:
+            NotamFetcherPageError: If a page after the first failed. Every page before it has been yielded
+                and the pages after it are cancelled.
+        """
+        first_request = copy.copy(request)
+        first_request.page_num = 1
+        first_page = await self._fetch_notams(first_request)
+        yield first_page
+
+        page_requests: list[NotamAirportCodeRequest | NotamLatLongRequest] = []
+        for page_num in range(2, first_page.total_pages + 1):
+            page_request = copy.copy(request)
+            page_request.page_num = page_num
+            page_requests.append(page_request)
+
+        tasks = [asyncio.ensure_future(self._fetch_notams(page_request)) for page_request in page_requests]
+        try:
+            for page_request, task in zip(page_requests, tasks):
+                try:
+                    page = await task
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch page {page_request.page_num}/{first_page.total_pages} of {request.cache_key()}")
+                    raise NotamFetcherPageError(page_request.page_num) from e
+                yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+                # Retrieve the exceptions of abandoned pages so they aren't reported as unhandled
+                task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def _fetch_notams(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> APIResponseSuccess:
+        """
+        Fetches and validates a response from the API.
+
+        Raises:
+            NotamFetcherRequestError: If a request error occurs while fetching from the API.
+            NotamFetcherUnexpectedError: If the response an unexpected error.
+            NotamFetcherUnauthenticatedError: If AsyncNotamFetcher has invalid client id or secret.
+            NotamFetcherValidationError: If the response was not an Success, Error, or Message response.
+        """
+        with span("notam_fetcher.page", page_num=request.page_num) as page_span:
+            content = await self._fetch_notams_raw_bytes(request)
+            with span("notam_fetcher.validate", bytes=len(content)):
+                page = _parse_response(content)
+            page_span.set_attributes(total_pages=page.total_pages, items=len(page.items))
+            self.metrics.items_per_page.observe(len(page.items))
+            return page
+
+    async def _fetch_notams_raw_bytes(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> bytes:
+        """
+        Returns the undecoded response body from the NOTAMs API.
+
+        Raises:
+            NotamFetcherRequestError if a request error occured.
+            NotamFetcherRateLimitError if the response returned 429.
+        """
+        query_string = request.query_params()
+
+        try:
+            async with self._semaphore:
+                with span("rate_limiter.acquire"):
+                    wait_start = time.perf_counter()
+                    await self.rate_limiter.acquire_async()
+                    self.metrics.rate_limiter_wait_seconds.inc(time.perf_counter() - wait_start)
+                with span("http.request", **{"http.method": "GET", "url.full": self.api_url}) as request_span:
+                    request_start = time.perf_counter()
+                    response = await self._client.get(
+                        self.api_url,
+                        headers={
+                            "client_id": self.client_id,
+                            "client_secret": self.client_secret,
+                        },
+                        params=query_string,
+                    )
+                    self.metrics.request_seconds.observe(time.perf_counter() - request_start)
+                    self.metrics.requests.inc(status=str(response.status_code))
+                    self.metrics.response_bytes.observe(len(response.content))
+                    request_span.set_attributes(**{"http.response.status_code": response.status_code,
+                                                   "http.response.body.size": len(response.content)})
+        except httpx.HTTPError as e:
+            self.metrics.requests.inc(status="error")
+            raise NotamFetcherRequestError from e
+
+        if response.status_code == 429:
+            self.logger.warning( "HTTP 429 from FAA API, we may be rate-limited" )
+            self.metrics.rate_limited.inc()
+            raise NotamFetcherRateLimitError()
+        return response.content
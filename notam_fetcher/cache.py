@@ -0,0 +1,274 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+import logging, sqlite3, threading, time
+
+from .api_schema import CoreNOTAMData, NOTAM_LIST_ADAPTER
+
+
+def _expires_at(notams: list[CoreNOTAMData], stored_at: float, ttl: float) -> float:
+    """
+    Returns the time (seconds since epoch) an entry stops being servable.
+
+    An entry expires when its TTL runs out, or earlier if one of its NOTAMs reaches its effective end,
+    since the API would no longer return that NOTAM.
+    """
+    expires_at = stored_at + ttl
+    for core in notams:
+        effective_end = core.notam.effective_end
+        if isinstance(effective_end, datetime):
+            if effective_end.tzinfo is None:
+                effective_end = effective_end.replace(tzinfo=timezone.utc)
+            expires_at = min(expires_at, effective_end.timestamp())
+    return expires_at
+
+
+def _notam_versions(notams: list[CoreNOTAMData]) -> dict[str, float]:
+    """
+    Returns a mapping of NOTAM id to the timestamp of its last update.
+    """
+    return {core.notam.id: core.notam.last_updated.timestamp() for core in notams}
+
+
+class NotamCache(ABC):
+    """
+    Base class for NotamFetcher response caches.
+
+    Entries are keyed by the normalized request key (see NotamRequest.cache_key) and hold every NOTAM
+    returned across all pages of that request.
+
+    An entry is not served once:
+        - it is older than `ttl` seconds,
+        - one of its NOTAMs has passed its effective end, or
+        - a newer version of one of its NOTAMs (by Notam.last_updated) was stored under another key.
+
+    When more than `max_entries` entries are stored the least recently used entry is evicted.
+    """
+    logger = logging.getLogger("NotamCache")
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1024):
+        """
+        Args:
+            ttl (float): Seconds an entry may be served after it was stored.
+            max_entries (int): Maximum number of entries kept before evicting the least recently used.
+
+        Raises:
+            ValueError: If ttl or max_entries is not positive.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list[CoreNOTAMData] | None:
+        """
+        Returns the cached NOTAMs for key, or None if there is no servable entry.
+        """
+        with self._lock:
+            notams = self._get(key, time.time())
+        if notams is None:
+            self.logger.debug(f"Cache miss for {key}")
+        else:
+            self.logger.debug(f"Cache hit for {key} ({len(notams)} NOTAMs)")
+        return notams
+
+    def put(self, key: str, notams: list[CoreNOTAMData]):
+        """
+        Stores the NOTAMs for key, replacing any existing entry.
+
+        Entries under other keys that hold an older version of any of these NOTAMs are invalidated.
+        """
+        stored_at = time.time()
+        with self._lock:
+            self._put(key, notams, stored_at, _expires_at(notams, stored_at, self.ttl))
+
+    def invalidate(self, key: str):
+        """
+        Removes the entry for key if present.
+        """
+        with self._lock:
+            self._delete(key)
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._clear()
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> list[CoreNOTAMData] | None: ...
+
+    @abstractmethod
+    def _put(self, key: str, notams: list[CoreNOTAMData], stored_at: float, expires_at: float): ...
+
+    @abstractmethod
+    def _delete(self, key: str): ...
+
+    @abstractmethod
+    def _clear(self): ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class MemoryNotamCache(NotamCache):
+    """
+    An in-process NotamCache. Entries are lost when the process exits.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1024):
+        super().__init__(ttl, max_entries)
+        # key -> (expires_at, notams), ordered from least to most recently used
+        self._entries: OrderedDict[str, tuple[float, list[CoreNOTAMData]]] = OrderedDict()
+        # notam id -> {key: last_updated}
+        self._versions: dict[str, dict[str, float]] = {}
+
+    def _get(self, key: str, now: float) -> list[CoreNOTAMData] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, notams = entry
+        if expires_at <= now:
+            self._delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return list(notams)
+
+    def _put(self, key: str, notams: list[CoreNOTAMData], stored_at: float, expires_at: float):
+        self._delete(key)
+        versions = _notam_versions(notams)
+        stale_keys = {
+            other_key
+            for notam_id, last_updated in versions.items()
+            for other_key, other_last_updated in self._versions.get(notam_id, {}).items()
+            if other_last_updated < last_updated
+        }
+        for stale_key in stale_keys:
+            self.logger.debug(f"Invalidating {stale_key}, it holds NOTAMs updated since it was cached")
+            self._delete(stale_key)
+
+        self._entries[key] = (expires_at, list(notams))
+        for notam_id, last_updated in versions.items():
+            self._versions.setdefault(notam_id, {})[key] = last_updated
+
+        while len(self._entries) > self.max_entries:
+            self._delete(next(iter(self._entries)))
+
+    def _delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for core in entry[1]:
+            keys = self._versions.get(core.notam.id)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self._versions[core.notam.id]
+
+    def _clear(self):
+        self._entries.clear()
+        self._versions.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteNotamCache(NotamCache):
+    """
+    A NotamCache persisted to a SQLite database so entries survive between runs.
+    """
+
+    def __init__(self, path: str, ttl: float = 300, max_entries: int = 1024):
+        """
+        Args:
+            path (str): Path of the SQLite database file. Created if it does not exist.
+            ttl (float): Seconds an entry may be served after it was stored.
+            max_entries (int): Maximum number of entries kept before evicting the least recently used.
+        """
+        super().__init__(ttl, max_entries)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " expires_at REAL NOT NULL,"
+                " last_accessed REAL NOT NULL,"
+                " notams BLOB NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS notam_versions ("
+                " notam_id TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " last_updated REAL NOT NULL,"
+                " PRIMARY KEY (notam_id, key))"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS notam_versions_key ON notam_versions (key)")
+
+    def _get(self, key: str, now: float) -> list[CoreNOTAMData] | None:
+        row = self._connection.execute("SELECT expires_at, notams FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        expires_at, payload = row
+        if expires_at <= now:
+            self._delete(key)
+            return None
+        with self._connection:
+            self._connection.execute("UPDATE entries SET last_accessed = ? WHERE key = ?", (now, key))
+        return NOTAM_LIST_ADAPTER.validate_json(payload)
+
+    def _put(self, key: str, notams: list[CoreNOTAMData], stored_at: float, expires_at: float):
+        versions = _notam_versions(notams)
+        with self._connection:
+            self._delete_rows(key)
+            stale_keys: set[str] = set()
+            for notam_id, last_updated in versions.items():
+                stale_keys.update(row[0] for row in self._connection.execute(
+                    "SELECT key FROM notam_versions WHERE notam_id = ? AND last_updated < ?",
+                    (notam_id, last_updated),
+                ))
+            for stale_key in stale_keys:
+                self.logger.debug(f"Invalidating {stale_key}, it holds NOTAMs updated since it was cached")
+                self._delete_rows(stale_key)
+
+            self._connection.execute(
+                "INSERT INTO entries (key, expires_at, last_accessed, notams) VALUES (?, ?, ?, ?)",
+                (key, expires_at, stored_at, NOTAM_LIST_ADAPTER.dump_json(notams, by_alias=True)),
+            )
+            self._connection.executemany(
+                "INSERT INTO notam_versions (notam_id, key, last_updated) VALUES (?, ?, ?)",
+                [(notam_id, key, last_updated) for notam_id, last_updated in versions.items()],
+            )
+
+            overflow = len(self) - self.max_entries
+            if overflow > 0:
+                for (evicted_key,) in self._connection.execute(
+                    "SELECT key FROM entries ORDER BY last_accessed LIMIT ?", (overflow,)
+                ).fetchall():
+                    self._delete_rows(evicted_key)
+
+    def _delete(self, key: str):
+        with self._connection:
+            self._delete_rows(key)
+
+    def _delete_rows(self, key: str):
+        self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._connection.execute("DELETE FROM notam_versions WHERE key = ?", (key,))
+
+    def _clear(self):
+        with self._connection:
+            self._connection.execute("DELETE FROM entries")
+            self._connection.execute("DELETE FROM notam_versions")
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        """
+        Closes the underlying database connection.
+        """
+        self._connection.close()
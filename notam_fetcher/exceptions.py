@@ -26,5 +26,25 @@ class NotamFetcherRateLimitError(NotamFetcherBaseError):
     def __init__(self):
         message = "Rate limit exceeded. Try again later."
 
+class NotamFetcherPageError(NotamFetcherBaseError):
+    """Raised when a page after the first could not be fetched.
+
+    notams holds the NOTAMs of every page before failed_page, in page order. The error that failed the page is the __cause__."""
+    failed_page : int
+    notams : list[Any]
+    def __init__(self, failed_page: int, notams: list[Any] | None = None):
+        super().__init__(f"Failed to fetch page {failed_page}")
+        self.failed_page = failed_page
+        self.notams = notams or []
+
 class NotamFetcherTimeoutReached(NotamFetcherBaseError):
-    """Raised when NotamFetcher is terminated early because it exceeded the timeout."""
\ No newline at end of file
+    """Raised when NotamFetcher is terminated early because it exceeded the timeout.
+
+    When raised for a list of waypoints, notams holds the NOTAMs fetched before the timeout and uncovered_waypoints
+    the waypoints whose NOTAMs were not fetched."""
+    notams : list[Any]
+    uncovered_waypoints : list[tuple[float, float]]
+    def __init__(self, notams: list[Any] | None = None, uncovered_waypoints: list[tuple[float, float]] | None = None):
+        super().__init__("Timed out fetching NOTAMs")
+        self.notams = notams or []
+        self.uncovered_waypoints = uncovered_waypoints or []
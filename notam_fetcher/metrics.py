@@ -0,0 +1,173 @@
+from typing import Iterable, Sequence
+import bisect, math, threading
+
+# Upper bounds of the histogram buckets, the last bucket (+Inf) is implied
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000)
+PAGES_BUCKETS = (1, 2, 3, 5, 10, 20, 50)
+ITEMS_BUCKETS = (0, 1, 10, 50, 100, 250, 500, 1000)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class Counter:
+    """
+    A total that only goes up, ex: requests sent. Optionally split by labels, ex: the response status.
+    """
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        """
+        Raises:
+            ValueError: If amount is negative or the labels are not the counter's labels.
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        if labels.keys() != set(self.labels):
+            raise ValueError(f"{self.name} has labels {self.labels}")
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """
+        Returns the total for labels, or across all labels if none are given.
+        """
+        with self._lock:
+            if not labels:
+                return sum(self._values.values())
+            return self._values.get(tuple(str(labels[name]) for name in self.labels), 0)
+
+    def exposition(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values) or ({} if self.labels else {(): 0})
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    The distribution of observed values, ex: request latencies, counted in cumulative buckets like Prometheus.
+    """
+    def __init__(self, name: str, help: str, buckets: Iterable[float]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts = [0] * len(self.buckets) # per bucket, not cumulative
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    @property
+    def average(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns an estimate of the q quantile (0 to 1), interpolated within its bucket like Prometheus'
+        histogram_quantile. Values in the last bucket are estimated as the largest value observed.
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = q * self.count
+            cumulative = 0
+            for position, count in enumerate(self._counts):
+                if count and cumulative + count >= rank:
+                    upper = self.buckets[position]
+                    if upper == math.inf:
+                        return self.max
+                    lower = self.buckets[position - 1] if position > 0 else 0.0
+                    return min(lower + (upper - lower) * (rank - cumulative) / count, self.max)
+                cumulative += count
+            return self.max
+
+    def exposition(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            cumulative = 0
+            for upper, count in zip(self.buckets, self._counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{le="{_format_value(upper)}"}} {cumulative}')
+            lines.append(f"{self.name}_sum {_format_value(self.sum)}")
+            lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+class FetcherMetrics:
+    """
+    Counters and histograms of the requests a NotamFetcher (or AsyncNotamFetcher) sends, to tell whether a slow
+    briefing waited on the API, on rate limiting, or on many pages.
+
+    One FetcherMetrics can be shared by several fetchers. Export with exposition() (Prometheus text format) or
+    summary() (for people).
+    """
+    def __init__(self, prefix: str = "notam_fetcher"):
+        self.requests = Counter(f"{prefix}_requests_total", "HTTP requests sent to the NOTAM API, by response status.",
+                                labels=("status",))
+        self.request_seconds = Histogram(f"{prefix}_request_seconds", "Seconds from sending a request to receiving its response.",
+                                         LATENCY_BUCKETS)
+        self.rate_limited = Counter(f"{prefix}_rate_limited_total", "Responses with status 429 Too Many Requests.")
+        self.rate_limiter_wait_seconds = Counter(f"{prefix}_rate_limiter_wait_seconds_total",
+                                                 "Seconds requests waited in the local rate limiter before being sent.")
+        self.retries = Counter(f"{prefix}_retries_total", "Queries retried after being rate limited.")
+        self.backoff_seconds = Counter(f"{prefix}_backoff_seconds_total", "Seconds slept backing off before retries.")
+        self.response_bytes = Histogram(f"{prefix}_response_bytes", "Size of the response bodies received.", BYTES_BUCKETS)
+        self.queries = Counter(f"{prefix}_queries_total", "Queries answered, by where they were answered from.",
+                               labels=("source",))
+        self.pages_per_query = Histogram(f"{prefix}_pages_per_query", "Pages fetched to answer one query.", PAGES_BUCKETS)
+        self.items_per_page = Histogram(f"{prefix}_items_per_page", "NOTAMs in each page received.", ITEMS_BUCKETS)
+
+    def metrics(self) -> list[Counter | Histogram]:
+        return [self.requests, self.request_seconds, self.rate_limited, self.rate_limiter_wait_seconds, self.retries,
+                self.backoff_seconds, self.response_bytes, self.queries, self.pages_per_query, self.items_per_page]
+
+    def exposition(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        return "\n".join(line for metric in self.metrics() for line in metric.exposition()) + "\n"
+
+    def summary(self) -> list[str]:
+        """
+        Returns a few lines describing the requests sent so far.
+        """
+        failed = self.requests.value() - self.requests.value(status="200") - self.rate_limited.value()
+        return [
+            f"{self.requests.value():g} requests ({self.rate_limited.value():g} rate limited, {failed:g} failed), "
+            f"latency p50 {self.request_seconds.quantile(0.5):.2f} s, p95 {self.request_seconds.quantile(0.95):.2f} s, "
+            f"max {self.request_seconds.max:.2f} s",
+            f"{self.rate_limiter_wait_seconds.value():.2f} s queued in the rate limiter, {self.retries.value():g} retries "
+            f"backing off {self.backoff_seconds.value():.2f} s",
+            f"{self.queries.value(source='api'):g} queries from the API and {self.queries.value(source='cache'):g} from the cache, "
+            f"{self.pages_per_query.average:.1f} pages per query (max {self.pages_per_query.max:g}), "
+            f"{self.items_per_page.average:.0f} NOTAMs per page, {self.response_bytes.sum / 1e6:.2f} MB received",
+        ]
@@ -1,24 +1,68 @@
-from concurrent.futures import Future, ThreadPoolExecutor
-from dataclasses import dataclass
-from typing import Any
-import logging, requests, time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator
+import copy, json, logging, requests, time
 
 from pydantic import ValidationError
 
+from tracing import in_current_context, span
+
 from .exceptions import (
     NotamFetcherRequestError,
     NotamFetcherUnauthenticatedError,
     NotamFetcherUnexpectedError,
     NotamFetcherValidationError,
     NotamFetcherRateLimitError,
+    NotamFetcherPageError,
     NotamFetcherTimeoutReached
 )
 
 from .api_schema import CoreNOTAMData, APIResponseSuccess, APIResponseError, APIResponseMessage 
-
-class NotamRequest:
+from .cache import NotamCache
+from .metrics import FetcherMetrics
+from .projection import ProjectedAPIResponse
+from .rate_limiter import RateLimiter
+from .recording import ResponseRecording
+from .sync_store import NotamSyncStore, apply_delta
+
+class NotamRequest(ABC):
     page_num: int = 1
     page_size: int = 1000
+    last_updated_since: datetime | None = None # only request NOTAMs updated after this time
+    deadline: float | None = None # time.monotonic() every page must be received by, copied to each page's request
+
+    @abstractmethod
+    def cache_key(self) -> str:
+        """
+        Returns a key identifying the NOTAMs this request covers across all pages.
+        """
+        pass
+
+    def query_params(self) -> dict[str, str]:
+        """
+        Returns the query string parameters for this request.
+
+        Raises:
+            ValueError: If the page_num is less than 1 or page_size exceeds 1000.
+        """
+        if self.page_num < 1:
+            raise ValueError("page_num must be greater than 0")
+        if self.page_size > 1000:
+            raise ValueError("page_size should not exceed 1000")
+
+        params = {
+            "pageNum": str(self.page_num),
+            "pageSize": str(self.page_size),
+        }
+        if self.last_updated_since is not None:
+            last_updated_since = self.last_updated_since
+            if last_updated_since.tzinfo is not None:
+                last_updated_since = last_updated_since.astimezone(timezone.utc)
+            params["lastUpdatedDate"] = last_updated_since.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return params
 
 @dataclass
 class NotamLatLongRequest(NotamRequest):
@@ -26,18 +70,158 @@ class NotamLatLongRequest(NotamRequest):
     long: float
     radius: float
 
+    def cache_key(self) -> str:
+        # 4 decimal places is ~11m, well below the precision of a NOTAM radius query
+        return f"latlong:{self.lat:.4f}:{self.long:.4f}:{self.radius:g}"
+
+    def query_params(self) -> dict[str, str]:
+        if self.radius > 100:
+            raise ValueError("radius must be less than 100")
+        if self.radius <= 0:
+            raise ValueError("radius must be greater than 0")
+
+        return {
+            "locationLongitude": str(self.long),
+            "locationLatitude": str(self.lat),
+            "locationRadius": str(self.radius),
+            **super().query_params(),
+        }
+
 @dataclass
 class NotamAirportCodeRequest(NotamRequest):
     airport_code: str
 
+    def cache_key(self) -> str:
+        return f"airport:{self.airport_code.strip().upper()}"
+
+    def query_params(self) -> dict[str, str]:
+        return {
+            "icaoLocation": str(self.airport_code),
+            **super().query_params(),
+        }
+
+def _validate_response(data: Any) -> APIResponseSuccess:
+    """
+    Validates a decoded response from the API.
+
+    Args:
+        data (Any): The decoded JSON response.
+
+    Returns:
+        APIResponseSuccess: if the response is a Success response.
+
+    Raises:
+        NotamFetcherUnexpectedError: If the response an unexpected error or message.
+        NotamFetcherUnauthenticatedError: If the response reports an invalid client id or secret.
+        NotamFetcherValidationError: If the response was not an Success, Error, or Message response.
+    """
+
+    # the response dict can be an unvalidated APIResponseSuccess, APIResponseError, or APIResponseMessage
+    # We try to validate the response as each type.
+    # If it cannot be validated, a NotamFetcherValidationError is thrown.
+
+    # APIResponseSuccess case
+    try:
+        return APIResponseSuccess.model_validate(data)
+    except ValidationError:
+        pass
+
+    # APIResponseError case
+    try:
+        error_response = APIResponseError.model_validate(data)
+        if error_response.error == "Invalid client id or secret":
+            raise NotamFetcherUnauthenticatedError("Invalid client id or secret")
+
+        raise NotamFetcherUnexpectedError(f"Unexpected Error: {error_response.error}")
+
+    except ValidationError:
+        pass
+
+    # APIResponseMessage case
+    try:
+        message_response = APIResponseMessage.model_validate(data)
+        raise NotamFetcherUnexpectedError(f"Unexpected Message: {message_response.message}")
+    except ValidationError:
+        raise NotamFetcherValidationError(f"Could not validate response from API.", data)
+
+def _parse_response(content: bytes, projection: bool = False) -> APIResponseSuccess | ProjectedAPIResponse:
+    """
+    Parses and validates a raw response body from the API.
+
+    Success responses are validated straight from the bytes in a single pass. Every success response has an
+    "items" key, so bodies without one (error and message responses) skip that attempt and are decoded to a dict
+    and checked with _validate_response.
+
+    Args:
+        content (bytes): The response body.
+        projection (bool): Validate only the NotamSummary of each item (see ProjectedAPIResponse).
+
+    Returns:
+        APIResponseSuccess: if the response is a Success response, or ProjectedAPIResponse if projection is True.
+
+    Raises:
+        NotamFetcherUnexpectedError: If the response was not JSON, or was an unexpected error or message.
+        NotamFetcherUnauthenticatedError: If the response reports an invalid client id or secret.
+        NotamFetcherValidationError: If the response was not an Success, Error, or Message response.
+    """
+    if b'"items"' in content:
+        try:
+            if projection:
+                return ProjectedAPIResponse.from_content(content)
+            return APIResponseSuccess.model_validate_json(content)
+        except ValidationError:
+            pass
+
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise NotamFetcherUnexpectedError(f"Response from API unexpectedly not JSON. Received text: {content.decode(errors='replace')}") from e
+    return _validate_response(data)
+
+def _unique_notams(batches: Iterable[list[CoreNOTAMData]]) -> list[CoreNOTAMData]:
+    """
+    Concatenates batches of NOTAMs, ex: the responses of overlapping queries, keeping the first NOTAM with each id.
+    """
+    unique_notams: list[CoreNOTAMData] = []
+    seen_notams: set[str] = set()
+    for batch in batches:
+        for notam in batch:
+            if notam.notam.id not in seen_notams:
+                seen_notams.add(notam.notam.id)
+                unique_notams.append(notam)
+    return unique_notams
+
+@dataclass
+class NotamFetchResult:
+    """
+    The NOTAMs of a list of waypoints, fetched until the fetcher's timeout.
+
+    The NOTAMs are only complete if every waypoint was covered. Otherwise they hold the NOTAMs of the waypoints
+    fetched before the timeout, and uncovered_waypoints the rest.
+    """
+    notams: list[CoreNOTAMData] = field(default_factory=list)
+    uncovered_waypoints: list[tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.uncovered_waypoints
+
+# The deadline of the batch the current thread fetches for, set by NotamFetcher._fetch_notams_with_retry
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
 class NotamFetcher:
     logger = logging.getLogger("NotamFetcher")
     FAA_API_URL = "https://external-api.faa.gov/notamapi/v1/notams"
     _page_size : int
     timeout: int # max time to wait before an exception is thrown
     MAX_BACKOFF_TIME: int = 30 # maximum time to wait between throttled requests
+    MAX_PAGE_WORKERS: int = 5 # maximum number of pages of one query fetched at once
+    CONNECT_TIMEOUT: float = 10 # maximum seconds to wait for a connection to the API, less when the deadline is nearer
+    READ_TIMEOUT: float = 60 # maximum seconds to wait for each read of a response, less when the deadline is nearer
 
-    def __init__(self, client_id: str, client_secret: str, page_size: int = 1000, timeout: int=60):
+    def __init__(self, client_id: str, client_secret: str, page_size: int = 1000, timeout: int=60, cache: NotamCache | None = None,
+                 rate_limiter: RateLimiter | None = None, sync_store: NotamSyncStore | None = None, projection: bool = False,
+                 api_url: str | None = None, recording: ResponseRecording | None = None, metrics: FetcherMetrics | None = None):
         """
         Initializes a NotamFetcher client.
         
@@ -46,11 +230,35 @@ class NotamFetcher:
             client_secret (str): The client secret for authentication.
             page_size (int): The default page_size to use for API requests.
             timeout (int): The max time to wait (in seconds) for fetch_notams_by_latlong_list to return before raising NotamFetcherTimeoutReached.
+            cache (NotamCache | None): Cache consulted before requesting NOTAMs from the API. Disabled if None.
+            rate_limiter (RateLimiter | None): Paces requests to the API. Uses the process wide RateLimiter.shared() if None.
+            sync_store (NotamSyncStore | None): Local store of previously fetched NOTAMs. If given, regions fetched before
+                only request NOTAMs updated since their last sync. Disabled if None.
+            projection (bool): Return ProjectedNOTAMData in place of CoreNOTAMData. Only the fields used to score, deduplicate
+                and display NOTAMs are validated, full models are built on demand with ProjectedNOTAMData.full().
+            api_url (str | None): The NOTAM API endpoint, ex: a FakeNotamAPIServer's url. Defaults to FAA_API_URL.
+            recording (ResponseRecording | None): Records the responses received, or replays recorded responses
+                without contacting the API. Disabled if None.
+            metrics (FetcherMetrics | None): Counts the requests sent, their latency, size and retries. A new
+                FetcherMetrics if None.
+
+        Raises:
+            ValueError: If projection is combined with a cache or sync_store, which hold full models.
         """
+        if projection and (cache is not None or sync_store is not None):
+            raise ValueError("projection can not be used with a cache or sync_store")
+
         self.client_id = client_id
         self.client_secret = client_secret
         self.page_size = page_size
         self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter.shared()
+        self.sync_store = sync_store
+        self.projection = projection
+        self.api_url = api_url or self.FAA_API_URL
+        self.recording = recording
+        self.metrics = metrics or FetcherMetrics()
 
     @property
     def page_size(self):
@@ -82,6 +290,7 @@ class NotamFetcher:
         """
         request = NotamAirportCodeRequest(airport_code)
         request.page_size = self.page_size
+        request.deadline = _deadline.get()
 
         return self._fetch_all_notams(request)
 
@@ -100,59 +309,252 @@ class NotamFetcher:
             NotamFetcherUnauthenticatedError: If NotamFetcher has invalid client id or secret.
             NotamFetcherRequestError: If a requests error occurs while fetching from the API.
             ValueError: If the radius is less than or equal to 0 or greater than 100.
-            NotamFetcherTimeoutReached: If the request could not be completed before the Client's timeout.
+            NotamFetcherTimeoutReached: If the request could not be completed before the Client's timeout. Holds
+                the NOTAMs fetched before the timeout and the waypoints not covered.
         """
-        requests_completed = 0
-        def on_complete(lat: float, long: float):
-            """
-            returns _on_complete with request context (lat, long).
-            """
-            def _on_complete(_: Future[list[CoreNOTAMData]]):
-                nonlocal requests_completed
-                requests_completed += 1
-                
-                self.logger.info(f"Fetched NOTAMs at ({lat}, {long}), request "
-                        f"{requests_completed}/{len(waypoints)} "
-                        f"({100*requests_completed/len(waypoints):.2f}% complete)")
-            return _on_complete
+        result = self.fetch_notams_by_latlong_list_partial(waypoints, radius)
+        if not result.complete:
+            raise NotamFetcherTimeoutReached(result.notams, result.uncovered_waypoints)
+        return result.notams
+
+    def fetch_notams_by_latlong_list_partial(self, waypoints: list[tuple[float, float]], radius: float = 100.0) -> NotamFetchResult:
+        """
+        Fetches ALL distinct notams for each (latitude, longitude) waypoint, until the Client's timeout.
+
+        Returns as soon as the timeout passes instead of waiting for requests still in flight: waypoints that
+        have not started are cancelled, and requests in flight time out on their own (see _request_timeout).
+
+        Args:
+            waypoints (list[(float, float)]): The waypoints list to fetch NOTAMs from.
+            radius (float): The location radius criteria in nautical miles. (max:100)
 
-        futures : list[Future[list[CoreNOTAMData]]] = []
+        Returns:
+            NotamFetchResult: The NOTAMs of the waypoints fetched in time, in waypoint order, and the waypoints that
+                were not.
 
+        Raises:
+            NotamFetcherUnauthenticatedError: If NotamFetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a requests error occurs while fetching from the API.
+            ValueError: If the radius is less than or equal to 0 or greater than 100.
+        """
         time_start = time.monotonic()
+        queue_wait_start = self.rate_limiter.stats.total_wait
+        results: dict[Future[list[CoreNOTAMData]], list[CoreNOTAMData]] = {}
+
+        with span("notam_fetcher.fetch_latlong_list", waypoints=len(waypoints), radius=radius) as list_span:
+            executor = ThreadPoolExecutor(max_workers=30)
+            try:
+                fetch = in_current_context(self._fetch_notams_with_retry)
+                futures: dict[Future[list[CoreNOTAMData]], tuple[float, float]] = {}
+                for lat, long in waypoints:
+                    self.logger.info(f"Fetching NOTAMs at ({lat}, {long})")
+                    futures[executor.submit(fetch, lat, long, radius, time_start)] = (lat, long)
 
-        def _fetch_notams_with_timeout(lat: float, long: float, radius: float):
-            nonlocal time_start
-            attempts = 0
-            while(time.monotonic() - time_start < self.timeout):
                 try:
-                    return self.fetch_notams_by_latlong(lat, long, radius)
-                except NotamFetcherRateLimitError:
-                    attempts += 1
-                    time_to_sleep = min(attempts**2, self.MAX_BACKOFF_TIME) # sleep at most MAX_BACKOFF_TIME
-                    time_until_timeout = self.timeout - (time.monotonic() - time_start)
-                    
-                    self.logger.warning(f"Rate limited while fetching Notams at ({lat}, {long})."
-                                        f" {attempts} attempts made."
-                                        f" {time.monotonic() - time_start:0.2f} seconds since start.")
-                    time.sleep(min(time_to_sleep, time_until_timeout)) # Don't sleep past the timeout
-            raise NotamFetcherTimeoutReached
-        
-        with ThreadPoolExecutor(max_workers=30) as executor:
-            for lat, long in waypoints:
-                self.logger.info(f"Fetching NOTAMs at ({lat}, {long})")
-                future = executor.submit(_fetch_notams_with_timeout, lat, long, radius)
-                future.add_done_callback(on_complete(lat, long))
-                futures.append(future)
-
-        all_notams: list[CoreNOTAMData] = []
-        seen_notams: set[str] = set()
-        for future in futures:
-            new_notams = [notam for notam in future.result() if notam.notam.id not in seen_notams]
-            all_notams.extend(new_notams)
-            for notam in new_notams:
-                seen_notams.add(notam.notam.id)
+                    for future in as_completed(futures, timeout=max(0, time_start + self.timeout - time.monotonic())):
+                        lat, long = futures[future]
+                        try:
+                            results[future] = future.result()
+                        except NotamFetcherTimeoutReached:
+                            continue
+                        self.logger.info(f"Fetched NOTAMs at ({lat}, {long}), request "
+                                f"{len(results)}/{len(waypoints)} "
+                                f"({100*len(results)/len(waypoints):.2f}% complete)")
+                except FuturesTimeoutError:
+                    pass
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+            with span("notam_fetcher.dedupe") as dedupe_span:
+                result = NotamFetchResult(
+                    _unique_notams(results[future] for future in futures if future in results),
+                    [waypoint for future, waypoint in futures.items() if future not in results],
+                )
+                dedupe_span.set_attribute("notams", len(result.notams))
+            list_span.set_attributes(notams=len(result.notams), uncovered_waypoints=len(result.uncovered_waypoints))
+
+        if not result.complete:
+            self.logger.warning(f"Timed out after {self.timeout} seconds, {len(result.uncovered_waypoints)} of "
+                                f"{len(waypoints)} waypoints were not covered")
+        self.logger.info(f"Requests spent {self.rate_limiter.stats.total_wait - queue_wait_start:.2f} seconds "
+                         f"queued in the rate limiter over {time.monotonic() - time_start:.2f} seconds")
                 
-        return all_notams
+        return result
+
+    def iter_notams_by_latlong_list(self, waypoints: list[tuple[float, float]], radius: float = 100.0) -> Iterator[list[CoreNOTAMData]]:
+        """
+        Fetches ALL distinct notams for each (latitude, longitude) waypoint, yielding them as each waypoint completes.
+
+        Unlike fetch_notams_by_latlong_list, NOTAMs are available as soon as the first waypoint returns instead of
+        after the slowest one. Each yielded batch only holds NOTAMs not yielded before. Closing the iterator early
+        cancels the waypoints that have not started.
+
+        Args:
+            waypoints (list[(float, float)]): The waypoints list to fetch NOTAMs from.
+            radius (float): The location radius criteria in nautical miles. (max:100)
+
+        Yields:
+            list[CoreNOTAMData]: The new NOTAMs of a completed waypoint, in the order waypoints complete.
+
+        Raises:
+            NotamFetcherUnauthenticatedError: If NotamFetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a requests error occurs while fetching from the API.
+            ValueError: If the radius is less than or equal to 0 or greater than 100.
+            NotamFetcherTimeoutReached: If the request could not be completed before the Client's timeout, once
+                every waypoint fetched in time was yielded. Holds the waypoints not covered.
+        """
+        time_start = time.monotonic()
+        seen_notams: set[str] = set()
+        completed: set[Future[list[CoreNOTAMData]]] = set()
+
+        executor = ThreadPoolExecutor(max_workers=30)
+        try:
+            fetch = in_current_context(self._fetch_notams_with_retry)
+            futures = {
+                executor.submit(fetch, lat, long, radius, time_start): (lat, long)
+                for lat, long in waypoints
+            }
+            try:
+                for future in as_completed(futures, timeout=max(0, time_start + self.timeout - time.monotonic())):
+                    lat, long = futures[future]
+                    try:
+                        notams = future.result()
+                    except NotamFetcherTimeoutReached:
+                        continue
+                    completed.add(future)
+                    new_notams = [notam for notam in notams if notam.notam.id not in seen_notams]
+                    seen_notams.update(notam.notam.id for notam in new_notams)
+                    self.logger.info(f"Fetched {len(new_notams)} new NOTAMs at ({lat}, {long}), request "
+                            f"{len(completed)}/{len(waypoints)} "
+                            f"({time.monotonic() - time_start:.2f} seconds since start)")
+                    yield new_notams
+            except FuturesTimeoutError:
+                pass
+            if len(completed) < len(futures):
+                raise NotamFetcherTimeoutReached(uncovered_waypoints=[waypoint for future, waypoint in futures.items() if future not in completed])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_notams_by_circles(self, circles: list[tuple[float, float, float]]) -> list[list[CoreNOTAMData]]:
+        """
+        Fetches ALL notams for each (latitude, longitude, radius) query circle, concurrently.
+
+        Unlike fetch_notams_by_latlong_list, each circle has its own radius and its NOTAMs are returned separately,
+        so callers can tell which circle returned which NOTAMs.
+
+        Args:
+            circles (list[(float, float, float)]): The query circles, radius in nautical miles. (max:100)
+
+        Returns:
+            list[list[CoreNOTAMData]]: The NOTAMs of each circle, in the order of circles.
+
+        Raises:
+            NotamFetcherUnauthenticatedError: If NotamFetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a requests error occurs while fetching from the API.
+            ValueError: If a radius is less than or equal to 0 or greater than 100.
+            NotamFetcherTimeoutReached: If the request could not be completed before the Client's timeout. Holds
+                the NOTAMs of the circles fetched in time and the centers of the circles not covered.
+        """
+        results = self.fetch_notams_by_circles_partial(circles)
+        if any(notams is None for notams in results):
+            raise NotamFetcherTimeoutReached(
+                _unique_notams(notams for notams in results if notams is not None),
+                [(lat, long) for (lat, long, _), notams in zip(circles, results) if notams is None],
+            )
+        return [notams for notams in results if notams is not None]
+
+    def fetch_notams_by_circles_partial(self, circles: list[tuple[float, float, float]]) -> list[list[CoreNOTAMData] | None]:
+        """
+        Fetches ALL notams for each (latitude, longitude, radius) query circle, concurrently, until the Client's timeout.
+
+        Returns as soon as the timeout passes, like fetch_notams_by_latlong_list_partial.
+
+        Args:
+            circles (list[(float, float, float)]): The query circles, radius in nautical miles. (max:100)
+
+        Returns:
+            list[list[CoreNOTAMData] | None]: The NOTAMs of each circle, in the order of circles. None for the
+                circles not fetched in time.
+
+        Raises:
+            NotamFetcherUnauthenticatedError: If NotamFetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a requests error occurs while fetching from the API.
+            ValueError: If a radius is less than or equal to 0 or greater than 100.
+        """
+        time_start = time.monotonic()
+        queue_wait_start = self.rate_limiter.stats.total_wait
+        results: list[list[CoreNOTAMData] | None] = [None] * len(circles)
+
+        with span("notam_fetcher.fetch_circles", circles=len(circles)) as circles_span:
+            executor = ThreadPoolExecutor(max_workers=30)
+            try:
+                fetch = in_current_context(self._fetch_notams_with_retry)
+                futures = {
+                    executor.submit(fetch, lat, long, radius, time_start): position
+                    for position, (lat, long, radius) in enumerate(circles)
+                }
+                try:
+                    for future in as_completed(futures, timeout=max(0, time_start + self.timeout - time.monotonic())):
+                        try:
+                            results[futures[future]] = future.result()
+                        except NotamFetcherTimeoutReached:
+                            continue
+                except FuturesTimeoutError:
+                    pass
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            uncovered = sum(notams is None for notams in results)
+            circles_span.set_attribute("uncovered_circles", uncovered)
+
+        if uncovered:
+            self.logger.warning(f"Timed out after {self.timeout} seconds, {uncovered} of {len(circles)} "
+                                f"query circles were not covered")
+        self.logger.info(f"Fetched {len(circles) - uncovered} query circles, requests spent "
+                         f"{self.rate_limiter.stats.total_wait - queue_wait_start:.2f} seconds "
+                         f"queued in the rate limiter over {time.monotonic() - time_start:.2f} seconds")
+        return results
+
+    def _fetch_notams_with_retry(self, lat: float, long: float, radius: float, time_start: float) -> list[CoreNOTAMData]:
+        """
+        Fetches ALL notams for a latitude and longitude, retrying with backoff while rate limited.
+
+        Args:
+            time_start (float): time.monotonic() when the batch of requests this belongs to started. Retries stop `timeout` seconds after it,
+                and every request is given only the time left until then.
+
+        Raises:
+            NotamFetcherTimeoutReached: If the request could not be completed before the Client's timeout.
+        """
+        attempts = 0
+        deadline = time_start + self.timeout
+        deadline_token = _deadline.set(deadline)
+        try:
+            with span("notam_fetcher.query", lat=lat, long=long, radius=radius) as query_span:
+                while(time.monotonic() < deadline):
+                    try:
+                        return self.fetch_notams_by_latlong(lat, long, radius)
+                    except (NotamFetcherRateLimitError, NotamFetcherPageError) as e:
+                        # Callers handle these the same whichever page failed, the partial NOTAMs are dropped
+                        if isinstance(e, NotamFetcherPageError) and isinstance(e.__cause__, (NotamFetcherTimeoutReached,
+                                NotamFetcherRequestError, NotamFetcherUnauthenticatedError)):
+                            raise e.__cause__
+                        if isinstance(e, NotamFetcherPageError) and not isinstance(e.__cause__, NotamFetcherRateLimitError):
+                            raise
+                        attempts += 1
+                        query_span.set_attribute("retries", attempts)
+                        time_to_sleep = min(attempts**2, self.MAX_BACKOFF_TIME) # sleep at most MAX_BACKOFF_TIME
+                        time_until_timeout = max(0, deadline - time.monotonic())
+                        self.metrics.retries.inc()
+                        self.metrics.backoff_seconds.inc(min(time_to_sleep, time_until_timeout))
+
+                        self.logger.warning(f"Rate limited while fetching Notams at ({lat}, {long})."
+                                            f" {attempts} attempts made."
+                                            f" {time.monotonic() - time_start:0.2f} seconds since start.")
+                        with span("notam_fetcher.backoff", attempt=attempts):
+                            time.sleep(min(time_to_sleep, time_until_timeout)) # Don't sleep past the timeout
+                raise NotamFetcherTimeoutReached
+        finally:
+            _deadline.reset(deadline_token)
 
     def fetch_notams_by_latlong(self, lat: float, long: float, radius: float = 100.0):
         """
@@ -178,12 +580,17 @@ class NotamFetcher:
 
         request = NotamLatLongRequest(lat, long, radius)
         request.page_size = self.page_size
+        request.deadline = _deadline.get()
 
         return self._fetch_all_notams(request)
 
     def _fetch_all_notams(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> list[CoreNOTAMData]:
         """
         Fetches NOTAMs across all pages from the the API.
+
+        If the client has a cache, a servable cached response is returned instead and new responses are stored in it.
+        If the client has a sync store and the request was synced before, only NOTAMs updated since then are requested
+        and applied to the stored NOTAMs (see apply_delta).
         
         Args:
             request (NotamAirportCodeRequest | NotamLatLongRequest): The airport or Lat/Long to pull all NOTAMs from. Page is ignored.
@@ -193,23 +600,96 @@ class NotamFetcher:
         Raises:
             NotamFetcherUnauthenticatedError: If NotamFetcher has invalid client id or secret.
             NotamFetcherRequestError: If a requests error occurs while fetching from the API.
+            NotamFetcherPageError: If a page after the first failed. Holds the NOTAMs of the pages before it.
         """
 
-        notamItems: list[CoreNOTAMData] = []
+        with span("notam_fetcher.fetch_all", key=request.cache_key()) as query_span:
+            if self.cache is not None:
+                cached = self.cache.get(request.cache_key())
+                if cached is not None:
+                    query_span.set_attributes(cache="hit", notams=len(cached))
+                    self.metrics.queries.inc(source="cache")
+                    return cached
+
+            synced_at = datetime.now(timezone.utc)
+            sync_state = self.sync_store.get(request.cache_key(), synced_at) if self.sync_store is not None else None
+            if sync_state is not None:
+                request = copy.copy(request)
+                request.last_updated_since = sync_state.since
+                query_span.set_attribute("delta", True)
+
+            notamItems: list[CoreNOTAMData] = []
+            pages = 0
+
+            try:
+                for page in self._iter_pages(request):
+                    pages += 1
+                    if isinstance(page, ProjectedAPIResponse):
+                        notamItems.extend(page.notams)
+                    else:
+                        notamItems.extend([item.properties.coreNOTAMData for item in page.items])
+            except NotamFetcherPageError as e:
+                e.notams = apply_delta(sync_state.notams, notamItems, synced_at) if sync_state is not None else notamItems
+                raise
+            self.metrics.queries.inc(source="api")
+            self.metrics.pages_per_query.observe(pages)
+
+            if sync_state is not None:
+                self.logger.debug(f"Applying {len(notamItems)} updated NOTAMs to {len(sync_state.notams)} stored for {request.cache_key()}")
+                notamItems = apply_delta(sync_state.notams, notamItems, synced_at)
+            if self.sync_store is not None:
+                self.sync_store.put(request.cache_key(), notamItems, synced_at, full=sync_state is None)
+
+            if self.cache is not None:
+                self.cache.put(request.cache_key(), notamItems)
+
+            query_span.set_attribute("notams", len(notamItems))
+            return notamItems
+
+    def _iter_pages(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> Iterator[APIResponseSuccess | ProjectedAPIResponse]:
+        """
+        Yields every page of the response to request, in page order.
 
-        first_page = self._fetch_notams(request)
+        The first page is fetched to learn total_pages. The remaining pages are then fetched concurrently
+        (at most MAX_PAGE_WORKERS at once, each through the rate limiter) on copies of request, and each is
+        yielded once it and every page before it have arrived.
 
-        notamItems.extend([item.properties.coreNOTAMData for item in first_page.items])
+        Args:
+            request (NotamAirportCodeRequest | NotamLatLongRequest): The airport or Lat/Long to pull all NOTAMs from. Page is ignored.
 
-        for i in range(2, first_page.total_pages + 1):
-            request.page_num = i
-            nextPage = self._fetch_notams(request)
+        Raises:
+            NotamFetcherPageError: If a page after the first failed. Every page before it has been yielded
+                and the pages after it are cancelled.
+        """
+        first_request = copy.copy(request)
+        first_request.page_num = 1
+        first_page = self._fetch_notams(first_request)
+        yield first_page
 
-            notamItems.extend([item.properties.coreNOTAMData for item in nextPage.items])
+        page_requests: list[NotamAirportCodeRequest | NotamLatLongRequest] = []
+        for page_num in range(2, first_page.total_pages + 1):
+            page_request = copy.copy(request)
+            page_request.page_num = page_num
+            page_requests.append(page_request)
 
-        return notamItems
+        if not page_requests:
+            return
 
-    def _fetch_notams(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> APIResponseSuccess:
+        executor = ThreadPoolExecutor(max_workers=min(self.MAX_PAGE_WORKERS, len(page_requests)))
+        try:
+            fetch = in_current_context(self._fetch_notams)
+            futures = [executor.submit(fetch, page_request) for page_request in page_requests]
+            for page_request, future in zip(page_requests, futures):
+                try:
+                    page = future.result()
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch page {page_request.page_num}/{first_page.total_pages} of {request.cache_key()}")
+                    raise NotamFetcherPageError(page_request.page_num) from e
+                yield page
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_notams(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> APIResponseSuccess | ProjectedAPIResponse:
         """
         Fetches and validates a response from the API.
 
@@ -217,7 +697,7 @@ class NotamFetcher:
             reqeust: NotamAirportCodeRequest | NotamLatLongRequest
 
         Returns:
-            APIResponseSuccess: if the request returned a Success response.
+            APIResponseSuccess: if the request returned a Success response, or ProjectedAPIResponse in projection mode.
 
         Raises:
             NotamFetcherRequestError: If a request error occurs while fetching from the API.
@@ -227,35 +707,16 @@ class NotamFetcher:
             ValueError: If the request request page_num is less than 1.
         """
 
-        data = self._fetch_notams_raw(request)
-
-        # the response dict can be an unvalidated APIResponseSuccess, APIResponseError, or APIResponseMessage
-        # We try to validate the response as each type.
-        # If it cannot be validated, a NotamFetcherValidationError is thrown.
-
-        # APIResponseSuccess case
-        try:
-            return APIResponseSuccess.model_validate(data)
-        except ValidationError:
-            pass
-
-        # APIResponseError case
-        try:
-            error_response = APIResponseError.model_validate(data)
-            if error_response.error == "Invalid client id or secret":
-                raise NotamFetcherUnauthenticatedError("Invalid client id or secret")
-
-            raise NotamFetcherUnexpectedError(f"Unexpected Error: {error_response.error}")
-
-        except ValidationError:
-            pass
-
-        # APIResponseMessage case
-        try:
-            message_response = APIResponseMessage.model_validate(data)
-            raise NotamFetcherUnexpectedError(f"Unexpected Message: {message_response.message}")
-        except ValidationError:
-            raise NotamFetcherValidationError(f"Could not validate response from API.", data)
+        with span("notam_fetcher.page", page_num=request.page_num) as page_span:
+            content = self._fetch_notams_raw_bytes(request)
+            with span("notam_fetcher.validate", bytes=len(content)):
+                page = _parse_response(content, self.projection)
+            if self.recording is not None and self.recording.mode == "record":
+                self.recording.save(request.query_params(), content)
+            items = page.notams if isinstance(page, ProjectedAPIResponse) else page.items
+            page_span.set_attributes(total_pages=page.total_pages, items=len(items))
+            self.metrics.items_per_page.observe(len(items))
+            return page
 
     def _fetch_notams_raw(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> dict[str, Any]:
         """
@@ -272,53 +733,82 @@ class NotamFetcher:
             NotamFetcherUnexpectedError if the response was invalid JSON.
             NotamFetcherRateLimitError if the response returned 429.
         """
-        query_string = {}
-
-        if request.page_num < 1:
-            raise ValueError("page_num must be greater than 0")
-        if request.page_size > 1000:
-            raise ValueError("page_size should not exceed 1000")
+        content = self._fetch_notams_raw_bytes(request)
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise NotamFetcherUnexpectedError(f"Response from API unexpectedly not JSON. Received text: {content.decode(errors='replace')}") from e
 
-        if isinstance(request, NotamLatLongRequest):
-            if request.radius > 100:
-                raise ValueError("radius must be less than 100")
-            if request.radius <= 0:
-                raise ValueError("radius must be greater than 0")
-
-            query_string = {
-                "locationLongitude": str(request.long),
-                "locationLatitude": str(request.lat),
-                "locationRadius": str(request.radius),
-                "pageNum": str(request.page_num),
-                "pageSize": str(request.page_size),
-            }
+    def _request_timeout(self, deadline: float | None) -> tuple[float, float]:
+        """
+        Returns the (connect, read) timeout of a request that must be answered by deadline (time.monotonic()).
 
-        if isinstance(request, NotamAirportCodeRequest):
-            query_string = {
-                "icaoLocation": str(request.airport_code),
-                "pageNum": str(request.page_num),
-                "pageSize": str(request.page_size),
-            }
+        Raises:
+            NotamFetcherTimeoutReached: If the deadline has passed.
+        """
+        if deadline is None:
+            return self.CONNECT_TIMEOUT, self.READ_TIMEOUT
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise NotamFetcherTimeoutReached
+        return min(self.CONNECT_TIMEOUT, remaining), min(self.READ_TIMEOUT, remaining)
 
-        try:
-            response = requests.get(
-                self.FAA_API_URL,
-                headers={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                },
-                params=query_string,
-            )
+    def _fetch_notams_raw_bytes(self, request: NotamAirportCodeRequest | NotamLatLongRequest) -> bytes:
+        """
+        Returns the undecoded response body from the NOTAMs API, or from the recording when replaying.
+        
+        Args:
+            request (NotamAirportCodeRequest | NotamLatLongRequest): The airport or Lat/Long to pull all NOTAMs from.
 
-        except requests.exceptions.RequestException as e:
-            raise NotamFetcherRequestError from e
+        Returns:
+            bytes: If the requests was successful.
+        
+        Raises:
+            NotamFetcherRequestError if a requests error occured, or the response was not recorded when replaying.
+            NotamFetcherRateLimitError if the response returned 429.
+            NotamFetcherTimeoutReached if the request's deadline passed before the response was received.
+        """
+        query_string = request.query_params()
+
+        if self.recording is not None and self.recording.mode == "replay":
+            return self.recording.load(query_string)
+
+        with span("rate_limiter.acquire"):
+            delay = self.rate_limiter.reserve()
+            if request.deadline is not None and time.monotonic() + delay >= request.deadline:
+                # The request could not be sent before the deadline, the slot reserved goes unused
+                raise NotamFetcherTimeoutReached
+            if delay > 0:
+                time.sleep(delay)
+            self.metrics.rate_limiter_wait_seconds.inc(delay)
+        with span("http.request", **{"http.method": "GET", "url.full": self.api_url}) as request_span:
+            request_start = time.perf_counter()
+            try:
+                response = requests.get(
+                    self.api_url,
+                    headers={
+                        "client_id": self.client_id,
+                        "client_secret": self.client_secret,
+                    },
+                    params=query_string,
+                    timeout=self._request_timeout(request.deadline),
+                )
+
+            except requests.exceptions.RequestException as e:
+                self.metrics.requests.inc(status="error")
+                if isinstance(e, requests.exceptions.Timeout) and request.deadline is not None and time.monotonic() >= request.deadline:
+                    raise NotamFetcherTimeoutReached from e
+                raise NotamFetcherRequestError from e
+            self.metrics.request_seconds.observe(time.perf_counter() - request_start)
+            self.metrics.requests.inc(status=str(response.status_code))
+            self.metrics.response_bytes.observe(len(response.content))
+            request_span.set_attributes(**{"http.response.status_code": response.status_code,
+                                           "http.response.body.size": len(response.content)})
 
         # Check for a rate limit response
         if response.status_code == 429:
             self.logger.warning( "HTTP 429 from FAA API, we may be rate-limited" )
+            self.metrics.rate_limited.inc()
             # Assuming you have imported NotamFetcherRateLimitError from your exceptions module
             raise NotamFetcherRateLimitError()        
-        try:
-            return response.json()
-        except requests.exceptions.JSONDecodeError as e:
-            raise NotamFetcherUnexpectedError(f"Response from API unexpectedly not JSON. Received text: {response.text}") from e
+        return response.content
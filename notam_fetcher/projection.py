@@ -0,0 +1,165 @@
+"""
+Lightweight projections of API responses.
+
+Scoring, deduplication and display only read a few fields of each NOTAM, while fully validating an item builds
+every nested model, translation and geometry. The models here validate just those fields and ignore the rest.
+The full CoreNOTAMData of an item is built on demand from the response body it came from.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Literal, Optional, Set
+import threading
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, alias_generators, field_validator
+from typing_extensions import TypedDict
+
+from .api_schema import (
+    APIResponseSuccess,
+    Classification,
+    CoreNOTAMData,
+    Notam,
+    NotamType,
+    PurposeType,
+    ScopeType,
+    Series,
+    TrafficType,
+)
+from .exceptions import NotamFetcherValidationError
+
+
+class NotamSummary(BaseModel):
+    """
+    The fields of a Notam used to score, deduplicate, locate and display it.
+    """
+    model_config = ConfigDict(
+        extra = 'ignore',
+        alias_generator=alias_generators.to_camel,
+        populate_by_name=True,
+    )
+
+    @field_validator('traffic', 'purpose', 'scope', mode='before')
+    @classmethod
+    def set_from_str(cls, value: Any):
+        """
+        Converts str to to a set of characters, see Notam.set_from_str.
+        """
+        return Notam.set_from_str(value)
+
+    id: str
+    number: str
+    type: NotamType
+    issued: datetime
+    selection_code: Optional[str] = None
+    traffic: Optional[Set[TrafficType]] = None
+    purpose: Optional[Set[PurposeType]] = None
+    scope: Optional[Set[ScopeType]] = None
+    location: str
+    effective_start: datetime
+    effective_end: datetime | Literal["PERM"]
+    text: str
+    classification: Classification
+    account_id: str
+    last_updated: datetime
+    icao_location: Optional[str] = None
+    series: Optional[Series] = None
+    coordinates: Optional[str] = None
+    radius: Optional[str] = None
+
+
+class _ResponseBody:
+    """
+    A success response body shared by the NOTAMs projected from it. Fully validated at most once, on first demand.
+    """
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self._items: list[CoreNOTAMData] | None = None
+        self._lock = threading.Lock()
+
+    def core(self, index: int) -> CoreNOTAMData:
+        with self._lock:
+            if self._items is None:
+                try:
+                    response = APIResponseSuccess.model_validate_json(self.content)
+                except ValidationError as e:
+                    raise NotamFetcherValidationError("Could not fully validate response from API.", self.content) from e
+                self._items = [item.properties.coreNOTAMData for item in response.items]
+            return self._items[index]
+
+
+class ProjectedNOTAMData:
+    """
+    Stands in for CoreNOTAMData when only the NotamSummary is needed. Use full() for the complete model.
+    """
+    __slots__ = ("notam", "_body", "_index")
+
+    def __init__(self, notam: NotamSummary, body: _ResponseBody, index: int):
+        self.notam = notam
+        self._body = body
+        self._index = index
+
+    def full(self) -> CoreNOTAMData:
+        """
+        Returns the fully validated CoreNOTAMData of this NOTAM.
+
+        The first call for any NOTAM of a response validates every item of that response.
+
+        Raises:
+            NotamFetcherValidationError: If the response the NOTAM came from does not fully validate.
+        """
+        return self._body.core(self._index)
+
+
+# The nesting around each NotamSummary is validated into plain dicts, which is much cheaper than a model per level
+class _ProjectedCore(TypedDict):
+    notam: NotamSummary
+
+class _ProjectedProperties(TypedDict):
+    coreNOTAMData: _ProjectedCore
+
+class _ProjectedItem(TypedDict):
+    properties: _ProjectedProperties
+
+class _ProjectedPage(TypedDict):
+    pageSize: int
+    pageNum: int
+    totalCount: int
+    totalPages: int
+    items: List[_ProjectedItem]
+
+_projected_page_adapter = TypeAdapter(_ProjectedPage)
+
+
+@dataclass
+class ProjectedAPIResponse:
+    """
+    APIResponseSuccess with each item projected to a ProjectedNOTAMData.
+    """
+    page_size: int
+    page_num: int
+    total_count: int
+    total_pages: int
+    notams: List[ProjectedNOTAMData]
+
+    @classmethod
+    def from_content(cls, content: bytes) -> "ProjectedAPIResponse":
+        """
+        Validates a success response body, keeping it so each NOTAM's full model can be built on demand.
+
+        Raises:
+            ValidationError: If content is not a success response.
+        """
+        page = _projected_page_adapter.validate_json(content)
+        body = _ResponseBody(content)
+        return cls(
+            page_size=page["pageSize"],
+            page_num=page["pageNum"],
+            total_count=page["totalCount"],
+            total_pages=page["totalPages"],
+            notams=[
+                ProjectedNOTAMData(item["properties"]["coreNOTAMData"]["notam"], body, index)
+                for index, item in enumerate(page["items"])
+            ],
+        )
@@ -0,0 +1,151 @@
+from collections import deque
+from dataclasses import dataclass
+import asyncio, logging, sqlite3, threading, time
+
+
+@dataclass(frozen=True)
+class RateLimiterStats:
+    requests: int
+    total_wait: float # seconds spent queued across all requests
+    max_wait: float # longest single wait in seconds
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class RateLimiter:
+    """
+    Rolling window rate limiter for the FAA NOTAM API.
+
+    The FAA API allows 30 requests per minute on a rolling basis (see NotamFetcherRateLimitError).
+    Each request reserves the earliest send time that keeps at most `max_requests` sends inside any `period`
+    second window, then waits until that time. Requests are therefore paced just under the limit up front
+    instead of being rejected with 429 and backed off afterwards.
+
+    If `path` is given the reservations are kept in a SQLite database so every process using the same file shares one budget.
+    """
+    logger = logging.getLogger("RateLimiter")
+    DEFAULT_MAX_REQUESTS: int = 28 # stay just under the API's 30 requests per minute
+    DEFAULT_PERIOD: float = 60.0
+
+    _shared: dict[str | None, "RateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_requests: int = DEFAULT_MAX_REQUESTS, period: float = DEFAULT_PERIOD, path: str | None = None):
+        """
+        Args:
+            max_requests (int): Max number of requests sent in any rolling window.
+            period (float): Length of the rolling window in seconds.
+            path (str | None): SQLite database file shared between processes. Reservations are kept in memory if None.
+
+        Raises:
+            ValueError: If max_requests or period is not positive.
+        """
+        if max_requests <= 0:
+            raise ValueError("max_requests must be greater than 0")
+        if period <= 0:
+            raise ValueError("period must be greater than 0")
+        self.max_requests = max_requests
+        self.period = period
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._reservations: deque[float] = deque()
+        self._requests = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS reservations (send_time REAL NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS reservations_send_time ON reservations (send_time)")
+
+    @classmethod
+    def shared(cls, path: str | None = None) -> "RateLimiter":
+        """
+        Returns the process wide RateLimiter for path, creating it with the default limits on first use.
+
+        Args:
+            path (str | None): SQLite database file shared between processes, or None for a limiter local to this process.
+        """
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path=path)
+            return cls._shared[path]
+
+    def reserve(self) -> float:
+        """
+        Reserves a send slot.
+
+        Returns:
+            float: The number of seconds to wait before sending the request.
+        """
+        with self._lock:
+            if self.path is None:
+                delay = self._reserve_local(time.monotonic())
+            else:
+                delay = self._reserve_shared(time.time())
+            self._requests += 1
+            self._total_wait += delay
+            self._max_wait = max(self._max_wait, delay)
+        if delay > 0:
+            self.logger.debug(f"Request queued for {delay:.2f} seconds to stay under {self.max_requests} requests per {self.period:g} seconds")
+        return delay
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request may be sent.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Waits, without blocking the event loop, until a request may be sent.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """
+        Queue wait statistics for requests reserved through this limiter in this process.
+        """
+        with self._lock:
+            return RateLimiterStats(self._requests, self._total_wait, self._max_wait)
+
+    def _reserve_local(self, now: float) -> float:
+        while self._reservations and self._reservations[0] <= now - self.period:
+            self._reservations.popleft()
+
+        send_time = now
+        if len(self._reservations) >= self.max_requests:
+            send_time = max(now, self._reservations[-self.max_requests] + self.period)
+        self._reservations.append(send_time)
+        return send_time - now
+
+    def _reserve_shared(self, now: float) -> float:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.execute("DELETE FROM reservations WHERE send_time <= ?", (now - self.period,))
+            row = self._connection.execute(
+                "SELECT send_time FROM reservations ORDER BY send_time DESC LIMIT 1 OFFSET ?", (self.max_requests - 1,)
+            ).fetchone()
+            send_time = now if row is None else max(now, row[0] + self.period)
+            self._connection.execute("INSERT INTO reservations (send_time) VALUES (?)", (send_time,))
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        return send_time - now
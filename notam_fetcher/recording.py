@@ -0,0 +1,76 @@
+from pathlib import Path
+from typing import Literal
+import logging, os, re, tempfile
+
+from .exceptions import NotamFetcherRequestError
+
+
+class ResponseRecording:
+    """
+    API response bodies recorded in a directory, one JSON file per page requested.
+
+    In "record" mode NotamFetcher saves the body of every success response it receives. In "replay" mode it answers
+    each page from its file instead, without contacting the API or waiting in the rate limiter, so fetches can be
+    repeated offline with the exact same responses.
+
+    Delta requests (see NotamSyncStore) are saved under their own file. When replaying one that was not recorded,
+    the full response for the same query is used instead, which holds every NOTAM the delta could.
+    """
+    logger = logging.getLogger("ResponseRecording")
+
+    def __init__(self, directory: str | Path, mode: Literal["record", "replay"]):
+        """
+        Args:
+            directory (str | Path): Directory holding the recorded responses. Created when recording.
+            mode ("record" | "replay"): Whether NotamFetcher saves responses to or answers requests from the directory.
+
+        Raises:
+            ValueError: If mode is not "record" or "replay".
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError('mode must be "record" or "replay"')
+        self.directory = Path(directory)
+        self.mode = mode
+        if mode == "record":
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def file_name(params: dict[str, str], include_since: bool = True) -> str:
+        """
+        Returns the name of the file the response to a request with query params is recorded in.
+        """
+        if "icaoLocation" in params:
+            query = f"airport-{params['icaoLocation'].strip().upper()}"
+        else:
+            query = (f"latlong-{float(params['locationLatitude']):.4f}-{float(params['locationLongitude']):.4f}"
+                     f"-{float(params['locationRadius']):g}")
+        name = f"response-{query}-page{params['pageNum']}-size{params['pageSize']}"
+        if include_since and "lastUpdatedDate" in params:
+            name += f"-since{params['lastUpdatedDate']}"
+        return re.sub(r"[^A-Za-z0-9.\-]", "_", name) + ".json"
+
+    def save(self, params: dict[str, str], content: bytes):
+        """
+        Records the response body to a request with query params, replacing any earlier recording.
+        """
+        path = self.directory / self.file_name(params)
+        # Written to a temporary file first so a concurrent replay never reads a partial response
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(content)
+        os.replace(temporary_path, path)
+        self.logger.debug(f"Recorded {path.name}")
+
+    def load(self, params: dict[str, str]) -> bytes:
+        """
+        Returns the recorded response body to a request with query params.
+
+        Raises:
+            NotamFetcherRequestError: If no response to the request was recorded.
+        """
+        for name in (self.file_name(params), self.file_name(params, include_since=False)):
+            try:
+                return (self.directory / name).read_bytes()
+            except FileNotFoundError:
+                continue
+        raise NotamFetcherRequestError(f"No recorded response for {self.file_name(params)} in {self.directory}")
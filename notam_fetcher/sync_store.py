@@ -0,0 +1,256 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import logging, re, sqlite3, threading
+
+from .api_schema import CoreNOTAMData, ICAOTranslation, NotamType, NOTAM_LIST_ADAPTER
+
+# Matches the NOTAM a replacement or cancellation refers to, ex: "A1234/24 NOTAMR A1200/24" => "A1200/24"
+_REFERENCED_NOTAM = re.compile(r"NOTAM[RC]\s+([A-Z]?\d+/\d+)")
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _is_expired(core: CoreNOTAMData, now: datetime) -> bool:
+    effective_end = core.notam.effective_end
+    return isinstance(effective_end, datetime) and _as_utc(effective_end) <= now
+
+
+def referenced_notam_number(core: CoreNOTAMData) -> str | None:
+    """
+    Returns the number of the NOTAM that a replacement (NotamType.R) or cancellation (NotamType.C) refers to.
+
+    The reference is read from the NOTAM text or its ICAO translation. Returns None for new NOTAMs
+    or if no reference is found.
+    """
+    if core.notam.type == NotamType.N:
+        return None
+    texts = [core.notam.text] + [translation.formatted_text for translation in core.notam_translation
+                                 if isinstance(translation, ICAOTranslation)]
+    for text in texts:
+        match = _REFERENCED_NOTAM.search(text)
+        if match is not None:
+            return match.group(1)
+    return None
+
+
+def apply_delta(notams: list[CoreNOTAMData], delta: list[CoreNOTAMData], now: datetime) -> list[CoreNOTAMData]:
+    """
+    Applies NOTAMs issued or updated since the last sync to the NOTAMs from that sync.
+
+        - A NOTAM already held is replaced if the delta holds a newer version of it (by Notam.last_updated).
+        - A replacement or cancellation removes the NOTAM it refers to, matched by number and location.
+          The replacement or cancellation itself is kept, as the API keeps returning it while it is in effect.
+        - NOTAMs past their effective end are dropped.
+
+    Args:
+        notams (list[CoreNOTAMData]): The NOTAMs held from the last sync.
+        delta (list[CoreNOTAMData]): The NOTAMs returned by the API since the last sync.
+        now (datetime): The time of this sync.
+
+    Returns:
+        list[CoreNOTAMData]: The NOTAMs in effect, held NOTAMs first in their previous order.
+    """
+    merged: dict[str, CoreNOTAMData] = {core.notam.id: core for core in notams}
+
+    for core in sorted(delta, key=lambda core: _as_utc(core.notam.last_updated)):
+        held = merged.get(core.notam.id)
+        if held is not None and _as_utc(held.notam.last_updated) >= _as_utc(core.notam.last_updated):
+            continue
+
+        referenced_number = referenced_notam_number(core)
+        if referenced_number is not None:
+            for notam_id, other in list(merged.items()):
+                if other.notam.number == referenced_number and other.notam.location == core.notam.location:
+                    del merged[notam_id]
+
+        merged[core.notam.id] = core
+
+    return [core for core in merged.values() if not _is_expired(core, now)]
+
+
+@dataclass(frozen=True)
+class NotamSyncState:
+    notams: list[CoreNOTAMData] # NOTAMs in effect as of last_synced
+    last_synced: datetime # when the NOTAMs were last requested from the API
+    since: datetime # lower bound to request updated NOTAMs from, slightly before last_synced
+
+
+class NotamSyncStore(ABC):
+    """
+    Base class for the local NOTAM stores used by NotamFetcher's delta sync.
+
+    Regions are keyed by the normalized request key (see NotamRequest.cache_key). After the first full fetch of
+    a region, later fetches only request NOTAMs updated since the last sync and apply them with apply_delta.
+
+    A region is refetched in full once its last full fetch is older than `max_age` seconds, so that anything the
+    deltas could not express (ex: a NOTAM removed without a cancellation) does not linger.
+    """
+    logger = logging.getLogger("NotamSyncStore")
+    # Deltas are requested from slightly before the last sync to absorb clock differences with the API
+    SYNC_OVERLAP = timedelta(minutes=5)
+
+    def __init__(self, max_age: float = 86400):
+        """
+        Args:
+            max_age (float): Seconds after a full fetch of a region before the region is fetched in full again.
+
+        Raises:
+            ValueError: If max_age is not positive.
+        """
+        if max_age <= 0:
+            raise ValueError("max_age must be greater than 0")
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: datetime | None = None) -> NotamSyncState | None:
+        """
+        Returns the stored NOTAMs for key, or None if key must be fetched in full.
+        """
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            row = self._load(key)
+        if row is None:
+            self.logger.debug(f"No sync state for {key}")
+            return None
+        notams, last_synced, last_full_sync = row
+        if (now - last_full_sync).total_seconds() >= self.max_age:
+            self.logger.debug(f"Sync state for {key} is older than {self.max_age:g} seconds")
+            return None
+        return NotamSyncState(notams, last_synced, last_synced - self.SYNC_OVERLAP)
+
+    def put(self, key: str, notams: list[CoreNOTAMData], synced_at: datetime, full: bool):
+        """
+        Stores the NOTAMs in effect for key as of synced_at.
+
+        Args:
+            key (str): The region's request key.
+            notams (list[CoreNOTAMData]): Every NOTAM in effect in the region.
+            synced_at (datetime): When the NOTAMs were requested from the API.
+            full (bool): True if the NOTAMs came from a full fetch rather than a delta.
+        """
+        with self._lock:
+            row = None if full else self._load(key)
+            last_full_sync = synced_at if row is None else row[2]
+            self._save(key, notams, synced_at, last_full_sync)
+
+    def invalidate(self, key: str):
+        """
+        Removes the stored NOTAMs for key, so it is fetched in full next time.
+        """
+        with self._lock:
+            self._delete(key)
+
+    def clear(self):
+        """
+        Removes every region.
+        """
+        with self._lock:
+            self._clear()
+
+    @abstractmethod
+    def _load(self, key: str) -> tuple[list[CoreNOTAMData], datetime, datetime] | None: ...
+
+    @abstractmethod
+    def _save(self, key: str, notams: list[CoreNOTAMData], last_synced: datetime, last_full_sync: datetime): ...
+
+    @abstractmethod
+    def _delete(self, key: str): ...
+
+    @abstractmethod
+    def _clear(self): ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class MemoryNotamSyncStore(NotamSyncStore):
+    """
+    An in-process NotamSyncStore. Regions are lost when the process exits.
+    """
+
+    def __init__(self, max_age: float = 86400):
+        super().__init__(max_age)
+        self._regions: dict[str, tuple[list[CoreNOTAMData], datetime, datetime]] = {}
+
+    def _load(self, key: str) -> tuple[list[CoreNOTAMData], datetime, datetime] | None:
+        row = self._regions.get(key)
+        if row is None:
+            return None
+        return list(row[0]), row[1], row[2]
+
+    def _save(self, key: str, notams: list[CoreNOTAMData], last_synced: datetime, last_full_sync: datetime):
+        self._regions[key] = (list(notams), last_synced, last_full_sync)
+
+    def _delete(self, key: str):
+        self._regions.pop(key, None)
+
+    def _clear(self):
+        self._regions.clear()
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+
+class SQLiteNotamSyncStore(NotamSyncStore):
+    """
+    A NotamSyncStore persisted to a SQLite database so repeat briefings in later runs only fetch deltas.
+    """
+
+    def __init__(self, path: str, max_age: float = 86400):
+        """
+        Args:
+            path (str): Path of the SQLite database file. Created if it does not exist.
+            max_age (float): Seconds after a full fetch of a region before the region is fetched in full again.
+        """
+        super().__init__(max_age)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS regions ("
+                " key TEXT PRIMARY KEY,"
+                " last_synced REAL NOT NULL,"
+                " last_full_sync REAL NOT NULL,"
+                " notams BLOB NOT NULL)"
+            )
+
+    def _load(self, key: str) -> tuple[list[CoreNOTAMData], datetime, datetime] | None:
+        row = self._connection.execute(
+            "SELECT notams, last_synced, last_full_sync FROM regions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        payload, last_synced, last_full_sync = row
+        return (
+            NOTAM_LIST_ADAPTER.validate_json(payload),
+            datetime.fromtimestamp(last_synced, timezone.utc),
+            datetime.fromtimestamp(last_full_sync, timezone.utc),
+        )
+
+    def _save(self, key: str, notams: list[CoreNOTAMData], last_synced: datetime, last_full_sync: datetime):
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO regions (key, last_synced, last_full_sync, notams) VALUES (?, ?, ?, ?)",
+                (key, last_synced.timestamp(), last_full_sync.timestamp(),
+                 NOTAM_LIST_ADAPTER.dump_json(notams, by_alias=True)),
+            )
+
+    def _delete(self, key: str):
+        with self._connection:
+            self._connection.execute("DELETE FROM regions WHERE key = ?", (key,))
+
+    def _clear(self):
+        with self._connection:
+            self._connection.execute("DELETE FROM regions")
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM regions").fetchone()[0]
+
+    def close(self):
+        """
+        Closes the underlying database connection.
+        """
+        self._connection.close()
@@ -0,0 +1,5 @@
+from .notam_prefetcher import NotamPrefetcher
+from .grid import CONUS_BOUNDS, GridNotamStore, NotamGrid
+from .types import GridCell, LocalNotams
+
+__all__ = ["NotamPrefetcher", "CONUS_BOUNDS", "GridNotamStore", "NotamGrid", "GridCell", "LocalNotams"]
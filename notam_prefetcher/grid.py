@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+
+from flight_path.flight_path import FlightPath
+from notam_fetcher.api_schema import CoreNOTAMData
+from notam_fetcher.sync_store import NotamSyncStore
+from notam_spatial_index import NotamSpatialIndex
+from notam_spatial_index.geometry import corridor_bounding_boxes
+from .types import GridCell, LocalNotams
+
+NM_PER_DEGREE = 60.0
+
+# (min_lat, min_long, max_lat, max_long) of the continental United States
+CONUS_BOUNDS = (24.5, -125.0, 49.5, -66.5)
+
+
+class NotamGrid:
+    '''
+    Square cells about cell_size nautical miles on a side tiling a latitude/longitude box.
+
+    Rows are cell_size nautical miles tall. Each row is split into as few equal columns as keep every cell at most
+    cell_size nautical miles wide, so cells stay close to square from south to north. Each cell is fetched with one
+    query centered on it, whose radius reaches its corners.
+    '''
+
+    def __init__(self, cell_size: float = 100.0, bounds: Tuple[float, float, float, float] = CONUS_BOUNDS,
+                 safety_margin: float = FlightPath.COVERAGE_SAFETY_MARGIN):
+        '''
+        Args:
+            cell_size (float): Height and largest width of a cell in nautical miles.
+            bounds ((float, float, float, float)): (min_lat, min_long, max_lat, max_long) of the area to tile.
+            safety_margin (float): Fraction query radii are enlarged by, to absorb the difference between
+                the flat-plane cell and distances on the WGS84 ellipsoid.
+
+        Raises:
+            ValueError: If cell_size is not positive, bounds are empty, or a cell can not be covered by a 100 nm query.
+        '''
+        min_lat, min_long, max_lat, max_long = bounds
+        if cell_size <= 0:
+            raise ValueError("cell_size must be greater than 0")
+        if min_lat >= max_lat or min_long >= max_long:
+            raise ValueError("bounds must not be empty")
+
+        self.cell_size = cell_size
+        self.bounds = bounds
+        self.cells: List[GridCell] = []
+        self._rows: List[Tuple[float, float, List[GridCell]]] = [] # (min_lat, long step, cells)
+
+        row_count = math.ceil((max_lat - min_lat) * NM_PER_DEGREE / cell_size)
+        lat_step = (max_lat - min_lat) / row_count
+        for row in range(row_count):
+            row_min_lat = min_lat + row * lat_step
+            row_max_lat = row_min_lat + lat_step
+            # The edge nearest the equator is the widest
+            widest_scale = math.cos(math.radians(min(abs(row_min_lat), abs(row_max_lat)) if row_min_lat * row_max_lat > 0 else 0))
+            column_count = math.ceil((max_long - min_long) * NM_PER_DEGREE * widest_scale / cell_size)
+            long_step = (max_long - min_long) / column_count
+            width = long_step * NM_PER_DEGREE * widest_scale
+            height = lat_step * NM_PER_DEGREE
+            radius = math.ceil(math.hypot(width, height) / 2 / (1 - safety_margin) * 10) / 10
+            if radius > 100:
+                raise ValueError(f"Cells {cell_size} nm wide can not be covered by a 100 nm query")
+
+            cells = []
+            for column in range(column_count):
+                cell_min_long = min_long + column * long_step
+                cells.append(GridCell(
+                    row=row,
+                    column=column,
+                    min_lat=row_min_lat,
+                    min_long=cell_min_long,
+                    max_lat=row_max_lat,
+                    max_long=cell_min_long + long_step,
+                    center=(row_min_lat + lat_step / 2, cell_min_long + long_step / 2),
+                    radius=radius,
+                ))
+            self._rows.append((row_min_lat, long_step, cells))
+            self.cells.extend(cells)
+        self._lat_step = lat_step
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def cell_at(self, lat: float, long: float) -> Optional[GridCell]:
+        '''
+        Returns the cell containing (lat, long), or None if it is outside the grid.
+        '''
+        min_lat, min_long, max_lat, max_long = self.bounds
+        if not (min_lat <= lat <= max_lat and min_long <= long <= max_long):
+            return None
+        row_min_lat, long_step, cells = self._rows[min(int((lat - min_lat) / self._lat_step), len(self._rows) - 1)]
+        return cells[min(int((long - min_long) / long_step), len(cells) - 1)]
+
+    def contains_corridor(self, waypoints: Sequence[Tuple[float, float]], corridor_width: float) -> bool:
+        '''
+        Returns whether the corridor corridor_width nautical miles wide around the route through waypoints is inside the grid.
+        '''
+        min_lat, min_long, max_lat, max_long = self.bounds
+        return all(
+            box.min_lat >= min_lat and box.max_lat <= max_lat and box.min_long >= min_long and box.max_long <= max_long
+            for box in corridor_bounding_boxes(waypoints, corridor_width / 2)
+        )
+
+    def cells_for_corridor(self, waypoints: Sequence[Tuple[float, float]], corridor_width: float) -> List[GridCell]:
+        '''
+        Returns the cells overlapping the corridor corridor_width nautical miles wide around the route through waypoints.
+
+        Raises:
+            ValueError: If waypoints is empty.
+        '''
+        if not waypoints:
+            raise ValueError("waypoints must not be empty")
+        min_lat, min_long, max_lat, max_long = self.bounds
+        found: set[Tuple[int, int]] = set()
+        for box in corridor_bounding_boxes(waypoints, corridor_width / 2):
+            if box.max_lat < min_lat or box.min_lat > max_lat or box.max_long < min_long or box.min_long > max_long:
+                continue
+            first_row = max(int((box.min_lat - min_lat) / self._lat_step), 0)
+            last_row = min(int((box.max_lat - min_lat) / self._lat_step), len(self._rows) - 1)
+            for row in range(first_row, last_row + 1):
+                _, long_step, cells = self._rows[row]
+                first_column = max(int((box.min_long - min_long) / long_step), 0)
+                last_column = min(int((box.max_long - min_long) / long_step), len(cells) - 1)
+                found.update((row, column) for column in range(first_column, last_column + 1))
+        return [self._rows[row][2][column] for row, column in sorted(found)]
+
+
+class GridNotamStore:
+    '''
+    Answers NOTAM queries from the grid cells a NotamPrefetcher keeps in a NotamSyncStore.
+    '''
+
+    def __init__(self, grid: NotamGrid, sync_store: NotamSyncStore, max_staleness: float = 3600):
+        '''
+        Args:
+            grid (NotamGrid): The grid the prefetcher refreshes.
+            sync_store (NotamSyncStore): The store the prefetcher's NotamFetcher syncs into.
+            max_staleness (float): Seconds after its last sync a cell is no longer used.
+        '''
+        self.grid = grid
+        self.sync_store = sync_store
+        self.max_staleness = max_staleness
+
+    def cell_notams(self, cell: GridCell, now: datetime | None = None) -> Optional[List[CoreNOTAMData]]:
+        '''
+        Returns the stored NOTAMs of cell, or None if it was never fetched or is not fresh enough.
+        '''
+        now = now or datetime.now(timezone.utc)
+        state = self.sync_store.get(cell.key, now)
+        if state is None or now - state.last_synced > timedelta(seconds=self.max_staleness):
+            return None
+        return state.notams
+
+    def notams_for_corridor(self, waypoints: Sequence[Tuple[float, float]], corridor_width: float,
+                            now: datetime | None = None) -> LocalNotams:
+        '''
+        Returns the stored NOTAMs whose areas intersect the corridor around the route through waypoints.
+
+        Args:
+            waypoints (Sequence[(float, float)]): (latitude, longitude) points along the route, a few tens of miles apart at most.
+            corridor_width (float): Total width of the corridor in nautical miles, half on each side of the route.
+            now (datetime | None): The time freshness is judged at. Defaults to the current time.
+
+        Returns:
+            LocalNotams: The NOTAMs, the cells that could not be answered locally, and whether the corridor leaves the grid.
+        '''
+        result = LocalNotams(outside_grid=not self.grid.contains_corridor(waypoints, corridor_width))
+        notams: Dict[str, CoreNOTAMData] = {}
+        for cell in self.grid.cells_for_corridor(waypoints, corridor_width):
+            cell_notams = self.cell_notams(cell, now)
+            if cell_notams is None:
+                result.missing_cells.append(cell)
+                continue
+            for notam in cell_notams:
+                notams.setdefault(notam.notam.id, notam)
+        result.notams = NotamSpatialIndex(notams.values()).query_corridor(waypoints, corridor_width)
+        return result
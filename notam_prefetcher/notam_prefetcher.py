@@ -0,0 +1,185 @@
+from typing import Dict, List, Optional, Sequence
+import heapq, itertools, logging, threading, time
+
+from airport_data.types import Airport
+from notam_fetcher import NotamFetcher, RateLimiter
+from notam_fetcher.api_schema import CoreNOTAMData
+from notam_fetcher.exceptions import NotamFetcherBaseError, NotamFetcherRateLimitError, NotamFetcherUnauthenticatedError
+from .grid import NotamGrid
+from .types import GridCell
+
+
+class NotamPrefetcher:
+    '''
+    Keeps the NOTAMs of every cell of a NotamGrid fresh in a NotamSyncStore, in the background.
+
+    Each cell is refreshed through a NotamFetcher with a sync store, so after the first full fetch of a cell only
+    NOTAMs updated since its last refresh are requested. Cells are refreshed in order of when they are due. A cell is
+    due again base_interval seconds after its refresh, divided by its weight:
+
+        1 + AIRPORT_WEIGHT * (busy airports in the cell) + CHURN_WEIGHT * (recent NOTAM changes per refresh)
+
+    so cells around busy airports and cells whose NOTAMs keep changing are refreshed more often, never more often
+    than min_interval. Every cell is due at start, busiest first.
+
+    Requests are paced by the fetcher's rate limiter and, if given, by budget. A budget smaller than the API limit
+    (ex: RateLimiter(10, 60)) leaves the rest of the requests to live briefings.
+
+    Read the cells back with GridNotamStore.
+    '''
+    logger = logging.getLogger("NotamPrefetcher")
+    AIRPORT_WEIGHT: float = 4.0
+    CHURN_WEIGHT: float = 0.5
+    CHURN_SMOOTHING: float = 0.5 # weight of the latest refresh in the running average of changes
+
+    def __init__(self, notam_fetcher: NotamFetcher, grid: NotamGrid | None = None, busy_airports: Sequence[Airport] = (),
+                 base_interval: float = 3600, min_interval: float = 300, budget: RateLimiter | None = None):
+        '''
+        Args:
+            notam_fetcher (NotamFetcher): Fetches the cells. Must have a sync_store, which the cells are kept in, and no cache.
+            grid (NotamGrid | None): The cells to keep fresh. Defaults to 100 nm cells over the continental United States.
+            busy_airports (Sequence[Airport]): Airports whose cells are refreshed more often.
+            base_interval (float): Seconds between refreshes of a cell of weight 1.
+            min_interval (float): Fewest seconds between refreshes of any cell.
+            budget (RateLimiter | None): Paces the prefetcher's requests in addition to the fetcher's rate limiter.
+
+        Raises:
+            ValueError: If notam_fetcher has no sync_store or has a cache, or an interval is not positive.
+        '''
+        if notam_fetcher.sync_store is None:
+            raise ValueError("notam_fetcher must have a sync_store to keep the cells in")
+        if notam_fetcher.cache is not None:
+            raise ValueError("notam_fetcher must not have a cache, cached responses would not refresh the cells")
+        if base_interval <= 0 or min_interval <= 0:
+            raise ValueError("base_interval and min_interval must be greater than 0")
+
+        self.notam_fetcher = notam_fetcher
+        self.grid = grid or NotamGrid()
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.budget = budget
+
+        self._airports: Dict[GridCell, int] = {}
+        for airport in busy_airports:
+            cell = self.grid.cell_at(*airport.coordinates)
+            if cell is not None:
+                self._airports[cell] = self._airports.get(cell, 0) + 1
+        self._churn: Dict[GridCell, float] = {}
+        self._refreshes = 0
+
+        # (due time.monotonic(), -weight, tie breaker, cell)
+        self._queue: List[tuple[float, float, int, GridCell]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        now = time.monotonic()
+        for cell in self.grid.cells:
+            self._schedule(cell, now)
+
+    def weight(self, cell: GridCell) -> float:
+        '''
+        Returns how many times more often than base_interval cell is refreshed, before min_interval applies.
+        '''
+        return 1 + self.AIRPORT_WEIGHT * self._airports.get(cell, 0) + self.CHURN_WEIGHT * self._churn.get(cell, 0.0)
+
+    def interval(self, cell: GridCell) -> float:
+        '''
+        Returns the seconds between refreshes of cell.
+        '''
+        return max(self.min_interval, self.base_interval / self.weight(cell))
+
+    def next_due(self) -> float:
+        '''
+        Returns the seconds until the next cell is due, 0 if one is overdue.
+        '''
+        with self._lock:
+            return max(0.0, self._queue[0][0] - time.monotonic())
+
+    def refresh_next(self) -> GridCell:
+        '''
+        Refreshes the cell due soonest now, whether or not it is due yet, and schedules its next refresh.
+
+        Errors fetching the cell are logged and the cell is retried later.
+
+        Returns:
+            GridCell: The refreshed cell.
+
+        Raises:
+            NotamFetcherUnauthenticatedError: If the NotamFetcher has invalid client id or secret.
+        '''
+        with self._lock:
+            _, _, _, cell = heapq.heappop(self._queue)
+
+        if self.budget is not None:
+            self.budget.acquire()
+
+        sync_store = self.notam_fetcher.sync_store
+        assert sync_store is not None
+        previous = sync_store.get(cell.key)
+        retry_in: float | None = None
+        try:
+            notams = self.notam_fetcher.fetch_notams_by_latlong(cell.center[0], cell.center[1], cell.radius)
+        except NotamFetcherRateLimitError:
+            self.logger.warning(f"Rate limited refreshing cell ({cell.row}, {cell.column})")
+            retry_in = self.min_interval / 5
+        except NotamFetcherUnauthenticatedError:
+            with self._lock:
+                self._schedule(cell, time.monotonic())
+            raise
+        except NotamFetcherBaseError as e:
+            self.logger.error(f"Failed to refresh cell ({cell.row}, {cell.column}): {e!r}")
+            retry_in = self.min_interval
+        else:
+            changes = _count_changes(previous.notams if previous is not None else None, notams)
+            self._churn[cell] = (self.CHURN_SMOOTHING * changes
+                                 + (1 - self.CHURN_SMOOTHING) * self._churn.get(cell, 0.0))
+            self._refreshes += 1
+            self.logger.debug(f"Refreshed cell ({cell.row}, {cell.column}): {len(notams)} NOTAMs, {changes} changes")
+
+        with self._lock:
+            now = time.monotonic()
+            self._schedule(cell, now + retry_in if retry_in is not None else now + self.interval(cell))
+        return cell
+
+    def run(self):
+        '''
+        Refreshes cells as they come due until stop() is called.
+        '''
+        self.logger.info(f"Prefetching {len(self.grid)} cells")
+        while not self._stop.is_set():
+            if self._stop.wait(self.next_due()):
+                break
+            self.refresh_next()
+
+    def start(self):
+        '''
+        Runs the prefetcher on a background thread.
+        '''
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="NotamPrefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        '''
+        Stops the background thread, after the refresh in progress if any.
+        '''
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _schedule(self, cell: GridCell, due: float):
+        heapq.heappush(self._queue, (due, -self.weight(cell), next(self._sequence), cell))
+
+
+def _count_changes(previous: Optional[List[CoreNOTAMData]], current: List[CoreNOTAMData]) -> int:
+    '''
+    Returns the number of NOTAMs added, removed or updated between two versions of a cell, 0 for the first version.
+    '''
+    if previous is None:
+        return 0
+    previous_versions = {(core.notam.id, core.notam.last_updated) for core in previous}
+    current_versions = {(core.notam.id, core.notam.last_updated) for core in current}
+    return len(previous_versions ^ current_versions)
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from notam_fetcher.api_schema import CoreNOTAMData
+from notam_fetcher.notam_fetcher import NotamLatLongRequest
+
+
+@dataclass(frozen=True)
+class GridCell:
+    '''
+    A cell of a NotamGrid, fetched with one radius query that covers all of it.
+    '''
+    row: int
+    column: int
+    min_lat: float
+    min_long: float
+    max_lat: float
+    max_long: float
+    center: Tuple[float, float] # (latitude, longitude) of the query
+    radius: float # nautical miles
+
+    @property
+    def key(self) -> str:
+        '''
+        The request key the cell's NOTAMs are stored under, the same NotamFetcher uses for its query.
+        '''
+        return NotamLatLongRequest(self.center[0], self.center[1], self.radius).cache_key()
+
+
+@dataclass
+class LocalNotams:
+    '''
+    NOTAMs answered from local data.
+
+    The NOTAMs are only complete if no cell is missing and the corridor is inside the grid, otherwise the route
+    must be fetched from the API.
+    '''
+    notams: List[CoreNOTAMData] = field(default_factory=list)
+    missing_cells: List[GridCell] = field(default_factory=list) # cells never fetched or not fresh enough
+    outside_grid: bool = False # part of the corridor is not covered by any cell
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing_cells and not self.outside_grid
@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import List, Optional
-from rich.console import Console
+from typing import Iterable, List, Optional
+from rich.console import Console, Group
+from rich.live import Live
+from rich.text import Text
 
 # Define NotAM class
 class Notam:
@@ -113,17 +115,38 @@ class NotamPrinter:
             f"Text: {notam.text}"
         )
 
-    def print_notams(self, notams: List[Notam]):
+    def print_notams(self, notams: Iterable[Notam], console: Optional[Console] = None):
 
         """
         Takes a list of Notams and prints them in a legible format
 
         Args:
-            notams (List[Notam]): A list of NOTAMs to be printed
+            notams (Iterable[Notam]): The NOTAMs to be printed, each printed as soon as it is produced
+            console (Optional[Console]): The console to print to. Defaults to standard output.
         """
 
-        console = Console()
+        console = console or Console()
         for notam in notams:
             console.print(self.print_notam(notam))
             console.print(self.print_separator())
 
+    def print_notams_live(self, rankings: Iterable[List[Notam]], transient: bool = False, console: Optional[Console] = None):
+        """
+        Renders NOTAMs progressively while they are still being fetched.
+
+        Each ranking replaces the previous one on screen, so the most important NOTAMs found so far are shown
+        as soon as the first response arrives.
+
+        Args:
+            rankings (Iterable[List[Notam]]): Successive lists of NOTAMs to show, ex: RunningTopK.top() after each fetched batch.
+            transient (bool): Clear the display once rankings is exhausted, ex: to print the complete list afterwards.
+            console (Optional[Console]): The console to render to. Defaults to standard output.
+        """
+        console = console or Console()
+        with Live(Group(), console=console, transient=transient, vertical_overflow="visible", auto_refresh=False) as live:
+            for ranking in rankings:
+                renderables: List[Text] = []
+                for notam in ranking:
+                    renderables.append(Text(self.print_notam(notam)))
+                    renderables.append(Text(self.print_separator()))
+                live.update(Group(*renderables), refresh=True)
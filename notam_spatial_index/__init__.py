@@ -0,0 +1,5 @@
+from .notam_spatial_index import NotamSpatialIndex
+from .geometry import notam_shapes, parse_notam_coordinates
+from .types import BoundingBox, Circle
+
+__all__ = ["NotamSpatialIndex", "notam_shapes", "parse_notam_coordinates", "BoundingBox", "Circle"]
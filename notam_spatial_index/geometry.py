@@ -0,0 +1,158 @@
+'''
+Shapes of NOTAM areas and distance tests between them.
+
+Distances are measured in a local tangent plane (equirectangular projection, in nautical miles) around each
+segment or point being compared. Over the tens of miles between route waypoints and across a NOTAM area the
+error is a small fraction of a nautical mile, well below the precision NOTAM areas are published with.
+'''
+from typing import List, Sequence, Tuple
+import math, re
+
+import numpy as np
+
+from notam_fetcher.api_schema import Notam
+from .types import BoundingBox, Circle
+
+NM_PER_DEGREE = 60.0
+EARTH_RADIUS_NM = 3440.065
+
+# ICAO Q-line style coordinates with optional seconds, ex: 4038N07346W or 403823N0734644W
+_COORDINATES = re.compile(r"(\d{2})(\d{2})(\d{2}(?:\.\d+)?)?([NS])\s*(\d{3})(\d{2})(\d{2}(?:\.\d+)?)?([EW])")
+
+
+def parse_notam_coordinates(coordinates: str) -> Tuple[float, float] | None:
+    '''
+    Parses Notam.coordinates into (latitude, longitude) in degrees, or None if they cannot be parsed.
+    '''
+    match = _COORDINATES.search(coordinates)
+    if match is None:
+        return None
+    lat_deg, lat_min, lat_sec, lat_hemi, long_deg, long_min, long_sec, long_hemi = match.groups()
+    lat = int(lat_deg) + int(lat_min) / 60 + float(lat_sec or 0) / 3600
+    long = int(long_deg) + int(long_min) / 60 + float(long_sec or 0) / 3600
+    if lat > 90 or long > 180:
+        return None
+    return (-lat if lat_hemi == "S" else lat, -long if long_hemi == "W" else long)
+
+
+def notam_shapes(notam: Notam) -> List[Circle]:
+    '''
+    Returns the areas a NOTAM applies to, from Notam.coordinates and Notam.radius.
+
+    A NOTAM whose radius is missing or cannot be parsed may cover any area around its coordinates,
+    so it is treated as having no location rather than as a point.
+
+    Args:
+        notam (Notam): The NOTAM.
+
+    Returns:
+        List[Circle]: The NOTAM's areas, empty if it has no location.
+    '''
+    if not notam.coordinates or not notam.radius:
+        return []
+    try:
+        radius = float(notam.radius)
+    except ValueError:
+        return []
+    center = parse_notam_coordinates(notam.coordinates)
+    if center is None or not math.isfinite(radius) or radius < 0:
+        return []
+    return [Circle(center, radius)]
+
+
+def _wrap_longitude(delta: np.ndarray) -> np.ndarray:
+    return (delta + 180) % 360 - 180
+
+
+def bounding_box(shape: Circle) -> BoundingBox:
+    '''
+    Returns the smallest latitude/longitude box containing shape.
+    '''
+    lat, long = shape.center
+    dlat = shape.radius / NM_PER_DEGREE
+    dlong = min(180.0, dlat / max(math.cos(math.radians(lat)), 0.01))
+    return BoundingBox(max(lat - dlat, -90.0), long - dlong, min(lat + dlat, 90.0), long + dlong)
+
+
+def haversine(lat1: np.ndarray, long1: np.ndarray, lat2: np.ndarray, long2: np.ndarray) -> np.ndarray:
+    '''
+    Returns the great-circle distance in nautical miles between points, broadcasting over arrays.
+    '''
+    lat1, long1, lat2, long2 = map(np.radians, (lat1, long1, lat2, long2))
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((long2 - long1) / 2)**2
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _project(points: np.ndarray, origins: np.ndarray) -> np.ndarray:
+    '''
+    Projects points (P, 2) into the tangent plane of each origin (S, 2). Returns (P, S, 2) x/y offsets in nautical miles.
+    '''
+    scale = np.cos(np.radians(origins[:, 0]))
+    dlat = points[:, None, 0] - origins[None, :, 0]
+    dlong = _wrap_longitude(points[:, None, 1] - origins[None, :, 1])
+    return np.stack([dlong * scale * NM_PER_DEGREE, dlat * NM_PER_DEGREE], axis=-1)
+
+
+def distance_to_segments(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    '''
+    Returns the distance in nautical miles from each point (P, 2) to the nearest of the segments starts[i] -> ends[i] (S, 2).
+    '''
+    p = _project(points, starts) # (P, S, 2)
+    d = _project(ends, starts)[np.arange(len(starts)), np.arange(len(starts))] # (S, 2)
+    length_squared = np.maximum((d**2).sum(axis=-1), 1e-12)
+    t = np.clip((p * d).sum(axis=-1) / length_squared, 0, 1) # (P, S)
+    return np.linalg.norm(p - t[..., None] * d, axis=-1).min(axis=1)
+
+
+def polyline_distance(shape: Circle, waypoints: np.ndarray) -> float:
+    '''
+    Returns the distance in nautical miles from the edge of shape to the polyline through waypoints (W, 2), 0 if they overlap.
+    '''
+    if len(waypoints) == 1:
+        starts = ends = waypoints
+    else:
+        starts, ends = waypoints[:-1], waypoints[1:]
+
+    return max(0.0, float(distance_to_segments(np.array([shape.center]), starts, ends)[0]) - shape.radius)
+
+
+def point_distance(shape: Circle, lat: float, long: float) -> float:
+    '''
+    Returns the distance in nautical miles from (lat, long) to the edge of shape, 0 if the point is inside it.
+    '''
+    return max(0.0, float(haversine(lat, long, shape.center[0], shape.center[1])) - shape.radius)
+
+
+def in_bounding_box(shape: Circle, box: BoundingBox) -> bool:
+    '''
+    Returns whether shape overlaps box.
+    '''
+    shape_box = bounding_box(shape)
+    # Shift the shape by whole turns so its longitudes are comparable with box
+    shift = 360 * round((box.min_long + box.max_long - shape_box.min_long - shape_box.max_long) / 720)
+    if shape_box.min_lat > box.max_lat or shape_box.max_lat < box.min_lat:
+        return False
+    if shape_box.min_long + shift > box.max_long or shape_box.max_long + shift < box.min_long:
+        return False
+    lat, long = shape.center
+    long += shift
+    nearest_lat = min(max(lat, box.min_lat), box.max_lat)
+    nearest_long = min(max(long, box.min_long), box.max_long)
+    return float(haversine(lat, long, nearest_lat, nearest_long)) <= shape.radius
+
+
+def corridor_bounding_boxes(waypoints: Sequence[Tuple[float, float]], half_width: float) -> List[BoundingBox]:
+    '''
+    Returns one bounding box per segment of the polyline through waypoints, expanded by half_width nautical miles.
+    '''
+    points = list(waypoints)
+    pairs = list(zip(points[:-1], points[1:])) if len(points) > 1 else [(points[0], points[0])]
+    boxes = []
+    for (lat0, long0), (lat1, long1) in pairs:
+        long1 = long0 + float(_wrap_longitude(np.array(long1 - long0)))
+        dlat = half_width / NM_PER_DEGREE
+        min_lat, max_lat = max(min(lat0, lat1) - dlat, -90.0), min(max(lat0, lat1) + dlat, 90.0)
+        widest = max(abs(min_lat), abs(max_lat))
+        dlong = min(180.0, dlat / max(math.cos(math.radians(widest)), 0.01))
+        boxes.append(BoundingBox(min_lat, min(long0, long1) - dlong, max_lat, max(long0, long1) + dlong))
+    return boxes
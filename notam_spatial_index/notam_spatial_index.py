@@ -0,0 +1,172 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+import logging, math
+
+import numpy as np
+
+from notam_fetcher.api_schema import CoreNOTAMData
+from .geometry import (
+    bounding_box,
+    corridor_bounding_boxes,
+    in_bounding_box,
+    notam_shapes,
+    point_distance,
+    polyline_distance,
+)
+from .types import BoundingBox, Circle
+
+
+class NotamSpatialIndex:
+    '''
+    Spatial index of NOTAM areas.
+
+    Every area (see notam_shapes) is filed under each cell of a latitude/longitude grid its bounding box overlaps.
+    A query only tests the areas filed under the cells its own bounding box overlaps, so filtering stays fast as the
+    number of NOTAMs grows.
+
+    NOTAMs are indexed by the circle of Notam.coordinates and Notam.radius. NOTAMs without a location, or without
+    a radius, can not be ruled out, so every query returns them.
+    Query results keep the order NOTAMs were added in.
+    '''
+    logger = logging.getLogger("NotamSpatialIndex")
+    DEFAULT_CELL_SIZE: float = 1.0 # degrees, about 60 nautical miles of latitude
+
+    def __init__(self, notams: Iterable[CoreNOTAMData] = (), cell_size: float = DEFAULT_CELL_SIZE):
+        '''
+        Args:
+            notams (Iterable[CoreNOTAMData]): NOTAMs to index by Notam.coordinates and Notam.radius.
+            cell_size (float): Size of the grid cells in degrees.
+
+        Raises:
+            ValueError: If cell_size is not positive or does not divide 360.
+        '''
+        if cell_size <= 0 or not math.isclose(360 / cell_size, round(360 / cell_size)):
+            raise ValueError("cell_size must be greater than 0 and divide 360")
+        self.cell_size = cell_size
+        self._long_cells = round(360 / cell_size)
+        self._notams: List[CoreNOTAMData] = []
+        self._shapes: List[Tuple[int, Circle]] = [] # (notam position, area)
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list) # cell -> positions in _shapes
+        self._unlocated: List[int] = [] # positions in _notams of NOTAMs without a location
+
+        for notam in notams:
+            self.add(notam)
+
+    def __len__(self) -> int:
+        return len(self._notams)
+
+    def add(self, notam: CoreNOTAMData):
+        '''
+        Adds a NOTAM to the index.
+        '''
+        position = len(self._notams)
+        self._notams.append(notam)
+        shapes = notam_shapes(notam.notam)
+        if not shapes:
+            self._unlocated.append(position)
+            return
+        for shape in shapes:
+            shape_position = len(self._shapes)
+            self._shapes.append((position, shape))
+            for cell in self._cells_overlapping(bounding_box(shape)):
+                self._cells[cell].append(shape_position)
+
+    def query_point(self, lat: float, long: float, radius: float) -> List[CoreNOTAMData]:
+        '''
+        Returns the NOTAMs whose areas come within radius nautical miles of (lat, long).
+
+        Raises:
+            ValueError: If radius is negative.
+        '''
+        if radius < 0:
+            raise ValueError("radius must not be negative")
+        box = corridor_bounding_boxes([(lat, long)], radius)[0]
+        matches = {
+            self._shapes[shape_position][0]
+            for shape_position in self._candidates([box])
+            if point_distance(self._shapes[shape_position][1], lat, long) <= radius
+        }
+        return self._results(matches)
+
+    def query_bbox(self, min_lat: float, min_long: float, max_lat: float, max_long: float) -> List[CoreNOTAMData]:
+        '''
+        Returns the NOTAMs whose areas overlap a latitude/longitude box.
+
+        A box crossing the antimeridian has min_long greater than max_long.
+
+        Raises:
+            ValueError: If min_lat is greater than max_lat.
+        '''
+        if min_lat > max_lat:
+            raise ValueError("min_lat must not be greater than max_lat")
+        if max_long < min_long:
+            max_long += 360
+        box = BoundingBox(min_lat, min_long, max_lat, max_long)
+        matches = {
+            self._shapes[shape_position][0]
+            for shape_position in self._candidates([box])
+            if in_bounding_box(self._shapes[shape_position][1], box)
+        }
+        return self._results(matches)
+
+    def query_corridor(self, waypoints: Sequence[Tuple[float, float]], corridor_width: float) -> List[CoreNOTAMData]:
+        '''
+        Returns the NOTAMs whose areas come within corridor_width / 2 nautical miles of the route through waypoints.
+
+        The route is followed in straight segments between waypoints, so waypoints should be a few tens of miles
+        apart at most (ex: FlightPath.get_waypoints_by_gap).
+
+        Args:
+            waypoints (Sequence[(float, float)]): (latitude, longitude) points along the route, in order.
+            corridor_width (float): Total width of the corridor in nautical miles, half on each side of the route.
+
+        Raises:
+            ValueError: If waypoints is empty or corridor_width is negative.
+        '''
+        if not waypoints:
+            raise ValueError("waypoints must not be empty")
+        if corridor_width < 0:
+            raise ValueError("corridor_width must not be negative")
+        half_width = corridor_width / 2
+        route = np.array(waypoints, dtype=float)
+        boxes = corridor_bounding_boxes(waypoints, half_width)
+
+        # Only test each area against the parts of the route whose boxes share a cell with it
+        segment_cells = [set(self._cells_overlapping(box)) for box in boxes]
+        matches: Set[int] = set()
+        candidates = self._candidates(boxes)
+        for shape_position in candidates:
+            notam_position, shape = self._shapes[shape_position]
+            if notam_position in matches:
+                continue
+            shape_cells = set(self._cells_overlapping(bounding_box(shape)))
+            segments = [i for i, cells in enumerate(segment_cells) if cells & shape_cells]
+            if not segments:
+                continue
+            nearby_route = route[segments[0]:segments[-1] + 2]
+            if polyline_distance(shape, nearby_route) <= half_width:
+                matches.add(notam_position)
+
+        self.logger.debug(f"Corridor query tested {len(candidates)} of {len(self._shapes)} areas, "
+                          f"{len(matches)} NOTAMs intersect the corridor")
+        return self._results(matches)
+
+    def _cells_overlapping(self, box: BoundingBox) -> Iterable[Tuple[int, int]]:
+        min_row = math.floor(box.min_lat / self.cell_size)
+        max_row = math.floor(box.max_lat / self.cell_size)
+        min_column = math.floor(box.min_long / self.cell_size)
+        max_column = min(math.floor(box.max_long / self.cell_size), min_column + self._long_cells - 1)
+        for row in range(min_row, max_row + 1):
+            for column in range(min_column, max_column + 1):
+                yield (row, column % self._long_cells)
+
+    def _candidates(self, boxes: Iterable[BoundingBox]) -> Set[int]:
+        candidates: Set[int] = set()
+        for box in boxes:
+            for cell in self._cells_overlapping(box):
+                candidates.update(self._cells.get(cell, ()))
+        return candidates
+
+    def _results(self, matches: Set[int]) -> List[CoreNOTAMData]:
+        positions = sorted(matches.union(self._unlocated))
+        return [self._notams[position] for position in positions]
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Circle:
+    '''
+    A NOTAM area given by a center and radius. A point NOTAM is a circle of radius 0.
+    '''
+    center: Tuple[float, float] # (latitude, longitude)
+    radius: float # nautical miles
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    min_lat: float
+    min_long: float
+    max_lat: float
+    max_long: float # may exceed 180 when the box crosses the antimeridian
@@ -0,0 +1,56 @@
+from dotenv import load_dotenv
+import argparse, logging, os, sys
+
+from airport_data.airport_data import AirportData
+from notam_fetcher import NotamFetcher, RateLimiter, SQLiteNotamSyncStore
+from notam_prefetcher import NotamGrid, NotamPrefetcher
+
+logger = logging.getLogger("prefetch_driver")
+
+# Airports whose cells are refreshed most often
+BUSY_AIRPORTS = ["KATL", "KORD", "KDFW", "KDEN", "KLAS", "KLAX", "KCLT", "KJFK", "KSEA", "KMCO",
+                 "KSFO", "KPHX", "KIAH", "KMIA", "KEWR", "KBOS", "KMSP", "KDTW", "KPHL", "KLGA"]
+# Requests per minute left to the prefetcher, the rest of the shared budget is kept for live briefings
+PREFETCH_REQUESTS_PER_MINUTE = 10
+
+
+def main():
+    """
+    Keeps the NOTAMs of the continental United States fresh in notam_sync.sqlite3 until interrupted:
+    - Load environment variables for CLIENT_ID and CLIENT_SECRET
+    - Tiles the continental United States with 100 nm cells using NotamGrid
+    - Refreshes the cells with NotamPrefetcher, busy airports and changing cells first,
+      sharing the rate limiter of driver.py and briefing_server.py
+    """
+    parser = argparse.ArgumentParser(description="Keep a grid of NOTAMs over the continental United States fresh.")
+    parser.add_argument("--interval", type=float, default=3600, help="Seconds between refreshes of a quiet cell")
+    parser.add_argument("--requests-per-minute", type=int, default=PREFETCH_REQUESTS_PER_MINUTE,
+                        help="Most requests the prefetcher makes per minute")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(name)s] [%(levelname)s] %(message)s')
+
+    load_dotenv()
+    CLIENT_ID = os.getenv("CLIENT_ID")
+    CLIENT_SECRET = os.getenv("CLIENT_SECRET")
+
+    if CLIENT_ID is None:
+        logger.error("CLIENT_ID not set in .env file")
+        sys.exit("Error: CLIENT_ID not set in .env file")
+    if CLIENT_SECRET is None:
+        sys.exit("Error: CLIENT_SECRET not set in .env file")
+
+    notam_fetcher = NotamFetcher(CLIENT_ID, CLIENT_SECRET, timeout=300,
+                                 rate_limiter=RateLimiter.shared("notam_rate_limit.sqlite3"),
+                                 sync_store=SQLiteNotamSyncStore("notam_sync.sqlite3"))
+    prefetcher = NotamPrefetcher(notam_fetcher, NotamGrid(),
+                                 busy_airports=[AirportData.get_airport(code) for code in BUSY_AIRPORTS],
+                                 base_interval=args.interval,
+                                 budget=RateLimiter(args.requests_per_minute, 60))
+    try:
+        prefetcher.run()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from .route_briefing import BatchBriefer
+from .coverage import merge_query_circles
+from .types import BriefingCostReport, CoverageMerge, QueryCircle, RouteBriefing
+
+__all__ = ["BatchBriefer", "merge_query_circles", "BriefingCostReport", "CoverageMerge", "QueryCircle", "RouteBriefing"]
@@ -0,0 +1,83 @@
+'''
+Merging the NOTAM queries of many routes.
+
+Routes that share an airport or fly overlapping corridors plan query circles that lie inside each other. A circle
+centered on one planned circle and grown to contain others replaces them all with one request. Choosing the fewest
+such circles is a set cover problem, solved greedily: repeatedly take the circle containing the most planned circles
+not yet covered, preferring the smallest radius, which returns fewer NOTAMs from outside the corridors.
+'''
+from typing import List, Sequence
+
+import numpy as np
+
+from flight_path.flight_path import FlightPath
+from notam_spatial_index.geometry import haversine
+from .types import CoverageMerge, QueryCircle
+
+
+def _round_up_radius(radius: np.ndarray) -> np.ndarray:
+    # The API takes the radius as a decimal, round up to a tenth of a nautical mile like FlightPath.get_coverage_plan
+    return np.ceil(np.round(radius * 10, 6)) / 10
+
+
+def merge_query_circles(plans: Sequence[Sequence[QueryCircle]], max_radius: float = 100.0,
+                        safety_margin: float = FlightPath.COVERAGE_SAFETY_MARGIN) -> CoverageMerge:
+    '''
+    Merges the query circles planned for each route into fewer circles covering all of them.
+
+    Args:
+        plans (Sequence[Sequence[QueryCircle]]): The query circles planned for each route.
+        max_radius (float): The largest query radius in nautical miles. (The NOTAM API allows at most 100)
+        safety_margin (float): Fraction grown circles are enlarged by, to absorb the difference between
+            spherical distances and distances on the WGS84 ellipsoid.
+
+    Returns:
+        CoverageMerge: The merged queries, and which of them cover each route.
+
+    Raises:
+        ValueError: If a planned circle is larger than max_radius.
+    '''
+    planned = [circle for plan in plans for circle in plan]
+    owners = [route for route, plan in enumerate(plans) for _ in plan]
+    if not planned:
+        return CoverageMerge(queries=[], route_queries=[[] for _ in plans], planned_requests=0)
+    if max(circle.radius for circle in planned) > max_radius:
+        raise ValueError(f"Planned query radius is larger than max_radius {max_radius}")
+
+    centers = np.array([circle.center for circle in planned], dtype=float)
+    radii = np.array([circle.radius for circle in planned], dtype=float)
+    distances = haversine(centers[:, None, 0], centers[:, None, 1], centers[None, :, 0], centers[None, :, 1])
+
+    # needed[i, j]: radius of a circle centered on planned circle i that contains planned circle j
+    # (circles with the same center, ex: routes from the same airport, need no margin)
+    needed = np.where(distances == 0, radii[None, :], _round_up_radius((distances + radii[None, :]) / (1 - safety_margin)))
+
+    order = np.argsort(needed, axis=1, kind="stable")
+    sorted_needed = np.take_along_axis(needed, order, axis=1)
+    usable = sorted_needed <= max_radius
+    # A radius covers every planned circle up to the last one needing the same radius
+    last_of_radius = np.ones_like(usable)
+    last_of_radius[:, :-1] = sorted_needed[:, :-1] != sorted_needed[:, 1:]
+    candidates = usable & last_of_radius
+
+    uncovered = np.ones(len(planned), dtype=bool)
+    queries: List[QueryCircle] = []
+    covered_by: List[int] = [-1] * len(planned)
+    while uncovered.any():
+        gains = np.where(candidates, np.cumsum(uncovered[order], axis=1), -1)
+        best_gain = gains.max()
+        # Among the circles covering the most, the smallest
+        center, position = min(zip(*np.nonzero(gains == best_gain)), key=lambda candidate: sorted_needed[candidate])
+        contained = order[center, :position + 1]
+        newly_covered = contained[uncovered[contained]]
+        for planned_position in newly_covered:
+            covered_by[planned_position] = len(queries)
+        uncovered[newly_covered] = False
+        queries.append(QueryCircle(tuple(centers[center]), float(sorted_needed[center, position])))
+
+    route_queries: List[List[int]] = [[] for _ in plans]
+    for planned_position, route in enumerate(owners):
+        if covered_by[planned_position] not in route_queries[route]:
+            route_queries[route].append(covered_by[planned_position])
+    return CoverageMerge(queries=queries, route_queries=[sorted(positions) for positions in route_queries],
+                         planned_requests=len(planned))
@@ -0,0 +1,107 @@
+from typing import List, Sequence, Tuple
+import logging, time
+
+from airport_data.types import Airport
+from flight_path.flight_path import FlightPath
+from notam_fetcher import NotamFetcher
+from notam_fetcher.api_schema import CoreNOTAMData
+from notam_spatial_index import NotamSpatialIndex
+from .coverage import merge_query_circles
+from .types import BriefingCostReport, CoverageMerge, QueryCircle, RouteBriefing
+
+
+class BatchBriefer:
+    '''
+    Briefs many routes at once.
+
+    The query circles planned for every route (see FlightPath.get_coverage_plan) are merged across routes
+    (see merge_query_circles), each merged circle is fetched once, and the NOTAMs are handed back to every route
+    whose corridor they intersect.
+    '''
+    logger = logging.getLogger("BatchBriefer")
+
+    def __init__(self, notam_fetcher: NotamFetcher, corridor_width: float = 50, waypoint_gap: float = 20,
+                 max_radius: float = 100.0):
+        '''
+        Args:
+            notam_fetcher (NotamFetcher): Fetches the merged queries, under its rate limiter.
+            corridor_width (float): Total width in nautical miles of the corridor around each route, half on each side.
+            waypoint_gap (float): Distance in miles between the route waypoints NOTAM areas are tested against.
+            max_radius (float): The largest query radius in nautical miles. (The NOTAM API allows at most 100)
+        '''
+        self.notam_fetcher = notam_fetcher
+        self.corridor_width = corridor_width
+        self.waypoint_gap = waypoint_gap
+        self.max_radius = max_radius
+
+    def plan(self, routes: Sequence[Tuple[Airport, Airport]]) -> CoverageMerge:
+        '''
+        Plans the queries covering every route's corridor.
+
+        Raises:
+            ValueError: If corridor_width is too wide for max_radius to cover.
+        '''
+        plans = []
+        for departure, destination in routes:
+            coverage_plan = FlightPath(departure, destination).get_coverage_plan(self.corridor_width, self.max_radius)
+            plans.append([QueryCircle(center, coverage_plan.radius) for center in coverage_plan.waypoints])
+        return merge_query_circles(plans, self.max_radius)
+
+    def brief(self, routes: Sequence[Tuple[Airport, Airport]]) -> Tuple[List[RouteBriefing], BriefingCostReport]:
+        '''
+        Fetches the NOTAMs within the corridor of each route.
+
+        Args:
+            routes (Sequence[(Airport, Airport)]): (departure, destination) of each route.
+
+        Returns:
+            (List[RouteBriefing], BriefingCostReport): The briefing of each route, in the order of routes,
+                and what the batch cost.
+
+        Queries not fetched before the NotamFetcher's timeout are skipped, the routes they were planned for are
+        briefed with the NOTAMs of their other queries (see RouteBriefing.uncovered).
+
+        Raises:
+            ValueError: If corridor_width is too wide for max_radius to cover.
+            NotamFetcherUnauthenticatedError: If the NotamFetcher has invalid client id or secret.
+            NotamFetcherRequestError: If a requests error occurs while fetching from the API.
+        '''
+        start_time = time.perf_counter()
+        merge = self.plan(routes)
+        self.logger.info(f"Merged {merge.planned_requests} planned queries for {len(routes)} routes "
+                         f"into {len(merge.queries)} queries")
+
+        partial_results = self.notam_fetcher.fetch_notams_by_circles_partial(
+            [(query.center[0], query.center[1], query.radius) for query in merge.queries]
+        )
+        results = [notams or [] for notams in partial_results]
+
+        route_waypoints = FlightPath.get_waypoints_by_gap_bulk(
+            [(departure.coordinates, destination.coordinates) for departure, destination in routes], self.waypoint_gap
+        )
+        briefings: List[RouteBriefing] = []
+        for (departure, destination), query_positions, waypoints in zip(routes, merge.route_queries, route_waypoints):
+            notams: List[CoreNOTAMData] = []
+            seen_notams: set[str] = set()
+            for position in query_positions:
+                for notam in results[position]:
+                    if notam.notam.id not in seen_notams:
+                        seen_notams.add(notam.notam.id)
+                        notams.append(notam)
+            corridor_notams = NotamSpatialIndex(notams).query_corridor(waypoints, self.corridor_width)
+            uncovered = [merge.queries[position] for position in query_positions if partial_results[position] is None]
+            briefings.append(RouteBriefing(departure, destination, corridor_notams, uncovered))
+
+        report = BriefingCostReport(
+            routes=len(routes),
+            planned_requests=merge.planned_requests,
+            unique_requests=len(merge.queries),
+            notams_fetched=sum(len(notams) for notams in results),
+            unique_notams=len({notam.notam.id for notams in results for notam in notams}),
+            notams_delivered=sum(len(briefing.notams) for briefing in briefings),
+            seconds=time.perf_counter() - start_time,
+            uncovered_requests=sum(notams is None for notams in partial_results),
+        )
+        self.logger.info(f"Briefed {report.routes} routes with {report.unique_requests} queries, "
+                         f"saving {report.requests_saved} of {report.planned_requests}")
+        return briefings, report
@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from airport_data.types import Airport
+from notam_fetcher.api_schema import CoreNOTAMData
+
+
+@dataclass(frozen=True)
+class QueryCircle:
+    '''
+    A NOTAM radius query.
+    '''
+    center: Tuple[float, float] # (latitude, longitude)
+    radius: float # nautical miles
+
+
+@dataclass(frozen=True)
+class CoverageMerge:
+    '''
+    Query circles shared between routes.
+
+    Every circle planned for a route lies inside one of the circles in queries, so the merged queries cover
+    every route's corridor with fewer requests.
+    '''
+    queries: List[QueryCircle]
+    route_queries: List[List[int]] # per route, the positions in queries covering its planned circles
+    planned_requests: int
+
+
+@dataclass
+class RouteBriefing:
+    '''
+    The NOTAMs within the corridor of one route.
+
+    If some of the route's queries were not fetched in time, notams only holds the NOTAMs of the queries that were
+    and uncovered holds the others.
+    '''
+    departure: Airport
+    destination: Airport
+    notams: List[CoreNOTAMData] = field(default_factory=list)
+    uncovered: List[QueryCircle] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.uncovered
+
+
+@dataclass(frozen=True)
+class BriefingCostReport:
+    '''
+    What briefing a batch of routes together cost compared with briefing each route alone.
+    '''
+    routes: int
+    planned_requests: int # queries if each route were briefed alone
+    unique_requests: int # queries actually made
+    notams_fetched: int # NOTAMs returned across all queries, counting repeats
+    unique_notams: int
+    notams_delivered: int # NOTAMs in route corridors, summed over routes
+    seconds: float
+    uncovered_requests: int = 0 # queries not fetched before the NotamFetcher's timeout
+
+    @property
+    def requests_saved(self) -> int:
+        return self.planned_requests - self.unique_requests
+
+    def __str__(self) -> str:
+        saved_percent = 100 * self.requests_saved / self.planned_requests if self.planned_requests else 0.0
+        report = (
+            f"Routes briefed: {self.routes}\n"
+            f"Queries planned per route: {self.planned_requests}\n"
+            f"Queries made: {self.unique_requests}\n"
+            f"Requests saved: {self.requests_saved} ({saved_percent:.1f}%)\n"
+            f"NOTAMs fetched: {self.notams_fetched} ({self.unique_notams} unique)\n"
+            f"NOTAMs delivered to routes: {self.notams_delivered}\n"
+            f"Time: {self.seconds:.2f} seconds"
+        )
+        if self.uncovered_requests:
+            report += f"\nQueries not fetched in time: {self.uncovered_requests}"
+        return report
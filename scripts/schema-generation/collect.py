@@ -48,7 +48,7 @@ notam_fetcher = NotamFetcher(CLIENT_ID, CLIENT_SECRET)
 # Get API Responses for Lat Long
 for lat in linspace(US_TOP_LEFT["lat"], US_BOTTOM_RIGHT["lat"], STEPS):
     for long in linspace(US_TOP_LEFT["long"], US_BOTTOM_RIGHT["long"], STEPS):
-        file_path = os.path.join(COLLECTION_DIR, 'response-{lat}-{long}.json')
+        file_path = os.path.join(COLLECTION_DIR, f'response-{lat}-{long}.json')
         if os.path.exists(file_path):
             continue
         request : NotamLatLongRequest = NotamLatLongRequest(lat, long, 100)
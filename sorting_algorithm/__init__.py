@@ -1,3 +1,5 @@
-from .sorting_algorithm import Notam, NotamSorter
+from .sorting_algorithm import Notam, NotamSorter, RunningTopK
+from .batch_scoring import BatchScorer, NotamFeatures, ReloadingScorer, encode_features, score_batch
+from .rules import ScoringRules
 
-__all__ = ["Notam", "NotamSorter"]
\ No newline at end of file
+__all__ = ["Notam", "NotamSorter", "RunningTopK", "BatchScorer", "NotamFeatures", "ReloadingScorer", "ScoringRules", "encode_features", "score_batch"]
\ No newline at end of file
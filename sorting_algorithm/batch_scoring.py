@@ -0,0 +1,297 @@
+'''
+Scores many NOTAMs at once.
+
+Each NOTAM is encoded once into small integer features: an index per enum field and a bitmask per set field.
+Every scoring rule then becomes a lookup table indexed by one feature, so the score of a whole batch is a few
+NumPy gathers and additions. The tables are compiled from ScoringRules (see rules.py). Under the default rules
+they give the same scores as the per-NOTAM functions in sorting_algorithm.py.
+'''
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Type
+import logging, re, threading, time
+
+import numpy as np
+
+from notam_fetcher.api_schema import Notam, PurposeType, NotamType, Classification, ScopeType, Series
+from .rules import ScoringRules, SetRule, ValueRule
+
+
+def _codes(enum: Type[Enum]) -> Dict[Enum, int]:
+    '''
+    Returns the index of each member of enum. A missing value is encoded as len(enum).
+    '''
+    return {member: code for code, member in enumerate(enum)}
+
+def _bits(enum: Type[Enum]) -> Dict[Enum, int]:
+    '''
+    Returns the bit of each member of enum in a set bitmask.
+    '''
+    return {member: 1 << code for code, member in enumerate(enum)}
+
+_TYPE_CODES = _codes(NotamType)
+_CLASS_CODES = _codes(Classification)
+_SERIES_CODES = _codes(Series)
+_PURPOSE_BITS = _bits(PurposeType)
+_SCOPE_BITS = _bits(ScopeType)
+
+
+@dataclass(frozen=True)
+class NotamFeatures:
+    '''
+    The scored fields of a batch of NOTAMs, one array element per NOTAM.
+    '''
+    type: np.ndarray # index in NotamType, uint8
+    classification: np.ndarray # index in Classification, uint8
+    series: np.ndarray # index in Series, len(Series) if None, uint8
+    purpose: np.ndarray # bitmask of PurposeType, uint8
+    scope: np.ndarray # bitmask of ScopeType, uint8
+
+    def __len__(self) -> int:
+        return len(self.type)
+
+
+def _mask(values: Optional[Set[Enum]], bits: Dict[Enum, int]) -> int:
+    mask = 0
+    for value in values or ():
+        mask |= bits[value]
+    return mask
+
+def encode_features(notams: Iterable[Notam]) -> NotamFeatures:
+    '''
+    Encodes the fields used in scoring into integer arrays.
+
+    Args:
+        notams (Iterable[Notam]): NOTAMs to encode, ex: Notam or NotamSummary.
+
+    Returns:
+        NotamFeatures: The encoded fields, in the order of notams.
+    '''
+    no_series = len(_SERIES_CODES)
+    rows = [
+        (
+            _TYPE_CODES[notam.type],
+            _CLASS_CODES[notam.classification],
+            _SERIES_CODES[notam.series] if notam.series is not None else no_series,
+            _mask(notam.purpose, _PURPOSE_BITS),
+            _mask(notam.scope, _SCOPE_BITS),
+        )
+        for notam in notams
+    ]
+    columns = np.array(rows, dtype=np.uint8).reshape(-1, 5).T
+    return NotamFeatures(*columns)
+
+
+def _value_table(codes: Dict[Enum, int], rule: ValueRule, missing: bool = False) -> np.ndarray:
+    '''
+    Returns the score of each enum index, with a trailing entry for a missing value if missing is True.
+    '''
+    table = np.full(len(codes) + missing, rule.default, dtype=np.float64)
+    for member, code in codes.items():
+        table[code] = rule.scores.get(member, rule.default)
+    return table
+
+def _set_table(bits: Dict[Enum, int], rule: SetRule) -> np.ndarray:
+    '''
+    Returns the score of each bitmask under rule.
+    '''
+    table = np.zeros(1 << len(bits), dtype=np.float64)
+    for mask in range(len(table)):
+        matches = [score for member, score in rule.scores.items() if mask & bits[member]]
+        if rule.match == "first":
+            table[mask] = matches[0] if matches else 0
+        else:
+            table[mask] = sum(matches)
+    return table
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class BatchScorer:
+    '''
+    Scores batches of NOTAMs with ScoringRules compiled once.
+
+    Enum rules become lookup tables indexed by NotamFeatures, keyword rules become two regular expressions covering
+    every keyword, searched once per NOTAM text, and time windows are compared against the effective times of the
+    whole batch at once.
+    '''
+
+    def __init__(self, rules: Optional[ScoringRules] = None):
+        '''
+        Args:
+            rules (Optional[ScoringRules]): The rules to score by. Defaults to ScoringRules.default().
+        '''
+        self.rules = rules or ScoringRules.default()
+        self._type = _value_table(_TYPE_CODES, self.rules.type)
+        self._classification = _value_table(_CLASS_CODES, self.rules.classification)
+        self._series = _value_table(_SERIES_CODES, self.rules.series, missing=True)
+        self._purpose = _set_table(_PURPOSE_BITS, self.rules.purpose)
+        self._scope = _set_table(_SCOPE_BITS, self.rules.scope)
+
+        # Keywords are looked ahead for, so their matches can overlap. _keyword_starts finds every position a keyword
+        # matches at, _keywords then captures each keyword matching there in a group named after its position in
+        # rules.keywords (an alternation would stop at the first)
+        self._keyword_starts = None
+        self._keywords = None
+        if self.rules.keywords:
+            self._keyword_starts = re.compile(
+                "|".join(f"(?=(?P<k{position}>{rule.pattern}))" for position, rule in enumerate(self.rules.keywords)),
+                re.IGNORECASE,
+            )
+            self._keywords = re.compile(
+                "".join(f"(?:(?=(?P<k{position}>{rule.pattern})))?" for position, rule in enumerate(self.rules.keywords)),
+                re.IGNORECASE,
+            )
+        self._keyword_scores = {f"k{position}": rule.score for position, rule in enumerate(self.rules.keywords)}
+
+        self._window_starts = np.array([rule.start_hours * 3600 for rule in self.rules.time_windows], dtype=np.float64)
+        self._window_ends = np.array([rule.end_hours * 3600 for rule in self.rules.time_windows], dtype=np.float64)
+        self._window_scores = np.array([rule.score for rule in self.rules.time_windows], dtype=np.float64)
+
+    def score_features(self, features: NotamFeatures) -> np.ndarray:
+        '''
+        Returns the score of each encoded NOTAM under the enum rules as float64.
+        '''
+        return (self._purpose[features.purpose]
+                + self._type[features.type]
+                + self._classification[features.classification]
+                + self._series[features.series]
+                + self._scope[features.scope])
+
+    def score(self, notams: Iterable[Notam], now: Optional[datetime] = None) -> np.ndarray:
+        '''
+        Returns the score of each NOTAM as float64.
+
+        Args:
+            notams (Iterable[Notam]): NOTAMs to score, ex: Notam or NotamSummary.
+            now (Optional[datetime]): The time time windows are relative to. Defaults to the current time.
+        '''
+        notams = list(notams)
+        scores = self.score_features(encode_features(notams))
+        if self._keyword_starts is not None:
+            scores += self._score_keywords(notams)
+        if len(self._window_scores):
+            scores += self._score_time_windows(notams, now or datetime.now(timezone.utc))
+        return scores
+
+    def rank(self, notams: Sequence[Notam], now: Optional[datetime] = None) -> np.ndarray:
+        '''
+        Returns the positions of notams from highest to lowest score. Equal scores keep their order in notams.
+        '''
+        return np.argsort(-self.score(notams, now), kind="stable")
+
+    def _score_keywords(self, notams: List[Notam]) -> np.ndarray:
+        '''
+        Returns the sum of the scores of the keywords found in each NOTAM's text, each keyword counted once.
+
+        Keywords are found wherever they occur, including inside the match of another keyword.
+        '''
+        assert self._keyword_starts is not None and self._keywords is not None
+        scores = np.zeros(len(notams), dtype=np.float64)
+        for position, notam in enumerate(notams):
+            found: Set[str] = set()
+            for start in self._keyword_starts.finditer(notam.text):
+                groups = self._keywords.match(notam.text, start.start()).groupdict() # type: ignore[union-attr]
+                found.update(group for group, text in groups.items() if text is not None)
+            if found:
+                scores[position] = sum(self._keyword_scores[group] for group in found)
+        return scores
+
+    def _score_time_windows(self, notams: List[Notam], now: datetime) -> np.ndarray:
+        '''
+        Returns the sum of the scores of the time windows each NOTAM is in effect during.
+        '''
+        now_timestamp = _timestamp(now)
+        starts = np.array([_timestamp(notam.effective_start) for notam in notams], dtype=np.float64)
+        ends = np.array([
+            _timestamp(notam.effective_end) if isinstance(notam.effective_end, datetime) else np.inf # PERM
+            for notam in notams
+        ], dtype=np.float64)
+        in_effect = ((starts[:, None] <= now_timestamp + self._window_ends[None, :])
+                     & (ends[:, None] >= now_timestamp + self._window_starts[None, :]))
+        return in_effect.astype(np.float64) @ self._window_scores
+
+
+class ReloadingScorer:
+    '''
+    Scores NOTAMs with the rules in a JSON file, recompiling them when the file changes.
+
+    The file's modification time is checked at most once every check_interval seconds. If the changed file can not
+    be read or holds invalid rules, the error is logged and the previous rules stay in use.
+    '''
+    logger = logging.getLogger("ReloadingScorer")
+
+    def __init__(self, path: str | Path, check_interval: float = 1.0):
+        '''
+        Args:
+            path (str | Path): The rules file, see ScoringRules.
+            check_interval (float): Minimum seconds between checks of the file for changes.
+
+        Raises:
+            OSError: If the file can not be read.
+            ValueError: If the file does not hold valid rules.
+        '''
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = self.path.stat().st_mtime_ns
+        self._scorer = BatchScorer(ScoringRules.from_file(self.path))
+        self._checked_at = time.monotonic()
+
+    @property
+    def scorer(self) -> BatchScorer:
+        '''
+        The BatchScorer for the current rules, reloaded first if the file changed.
+        '''
+        with self._lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                self._reload_if_changed()
+            return self._scorer
+
+    def score(self, notams: Iterable[Notam], now: Optional[datetime] = None) -> np.ndarray:
+        '''
+        Returns the score of each NOTAM under the current rules, see BatchScorer.score.
+        '''
+        return self.scorer.score(notams, now)
+
+    def rank(self, notams: Sequence[Notam], now: Optional[datetime] = None) -> np.ndarray:
+        '''
+        Returns the positions of notams from highest to lowest score under the current rules, see BatchScorer.rank.
+        '''
+        return self.scorer.rank(notams, now)
+
+    def _reload_if_changed(self):
+        self._checked_at = time.monotonic()
+        try:
+            mtime = self.path.stat().st_mtime_ns
+            if mtime == self._mtime:
+                return
+            self._mtime = mtime
+            self._scorer = BatchScorer(ScoringRules.from_file(self.path))
+            self.logger.info(f"Reloaded scoring rules from {self.path}")
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Could not reload scoring rules from {self.path}, keeping the previous rules: {e}")
+
+
+_default_scorer: Optional[BatchScorer] = None
+
+def default_scorer() -> BatchScorer:
+    '''
+    Returns the BatchScorer for ScoringRules.default(), built on first use.
+    '''
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = BatchScorer()
+    return _default_scorer
+
+def score_batch(notams: Iterable[Notam], now: Optional[datetime] = None) -> np.ndarray:
+    '''
+    Returns the score of each NOTAM under the default rules as float64, equal to sorting_algorithm.score.
+    '''
+    return default_scorer().score(notams, now)
@@ -0,0 +1,125 @@
+'''
+Declarative scoring rules.
+
+Rules are read from a JSON file (see default_rules.json) and compiled by BatchScorer into lookup tables and
+regular expressions covering every keyword, so the cost of scoring a NOTAM does not grow with the number of rules.
+
+    {
+        "purpose": {"match": "first", "scores": {"N": 50, "B": 25}},
+        "type": {"scores": {"R": 50, "N": 20}, "default": 10},
+        "classification": {"scores": {"MIL": 10}},
+        "series": {"scores": {"R": 20}},
+        "scope": {"match": "sum", "scores": {"A": 20, "E": 10}},
+        "keywords": [{"pattern": "RWY \\\\S+ CLSD", "score": 30}, {"pattern": "\\\\bTFR\\\\b", "score": 40}],
+        "time_windows": [{"start_hours": 0, "end_hours": 6, "score": 15}]
+    }
+'''
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Generic, List, Literal, TypeVar
+import re
+
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+
+from notam_fetcher.api_schema import PurposeType, NotamType, Classification, ScopeType, Series
+
+DEFAULT_RULES_PATH = Path(__file__).with_name("default_rules.json")
+
+E = TypeVar("E")
+
+
+class ValueRule(BaseModel, Generic[E]):
+    '''
+    Scores a single valued field. Values not listed, and a missing value, score default.
+    '''
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+    scores: Dict[E, float] = {}
+    default: float = 0
+
+
+class SetRule(BaseModel, Generic[E]):
+    '''
+    Scores a set valued field.
+
+    With match "first" the score is that of the first listed value in the set, with match "sum" it is the sum of
+    the scores of every value in the set.
+    '''
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+    match: Literal["first", "sum"] = "sum"
+    scores: Dict[E, float] = {}
+
+
+class KeywordRule(BaseModel):
+    '''
+    Adds score once if pattern (a case insensitive regular expression) is found in Notam.text.
+    '''
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+    pattern: str
+    score: float
+
+    @field_validator('pattern')
+    @classmethod
+    def compiles(cls, pattern: str):
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"invalid pattern {pattern!r}: {e}")
+        return pattern
+
+
+class TimeWindowRule(BaseModel):
+    '''
+    Adds score if the NOTAM is in effect at any time from start_hours to end_hours after scoring.
+    '''
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+    start_hours: float = 0
+    end_hours: float
+    score: float
+
+    @model_validator(mode='after')
+    def ordered(self):
+        if self.end_hours < self.start_hours:
+            raise ValueError("end_hours must not be less than start_hours")
+        return self
+
+
+class ScoringRules(BaseModel):
+    '''
+    The rules a NOTAM's score is the sum of.
+    '''
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+    purpose: SetRule[PurposeType] = SetRule[PurposeType]()
+    type: ValueRule[NotamType] = ValueRule[NotamType]()
+    classification: ValueRule[Classification] = ValueRule[Classification]()
+    series: ValueRule[Series] = ValueRule[Series]()
+    scope: SetRule[ScopeType] = SetRule[ScopeType]()
+    keywords: List[KeywordRule] = []
+    time_windows: List[TimeWindowRule] = []
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "ScoringRules":
+        '''
+        Reads rules from a JSON file.
+
+        Raises:
+            OSError: If the file can not be read.
+            ValueError: If the file does not hold valid rules (a pydantic ValidationError).
+        '''
+        return cls.model_validate_json(Path(path).read_bytes())
+
+    @classmethod
+    def default(cls) -> "ScoringRules":
+        '''
+        Returns the rules in default_rules.json.
+        '''
+        return _default_rules()
+
+
+@lru_cache(maxsize=1)
+def _default_rules() -> ScoringRules:
+    return ScoringRules.from_file(DEFAULT_RULES_PATH)
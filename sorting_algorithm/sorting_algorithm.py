@@ -1,28 +1,27 @@
+from typing import Iterable, Iterator
+import heapq, itertools
+
 from notam_fetcher.api_schema import Notam, PurposeType, NotamType, Classification, ScopeType, Series
+from .batch_scoring import BatchScorer, ReloadingScorer, default_scorer
+from tracing import span
+from .weights import CLASS_SCORES, DEFAULT_CLASS_SCORE, DEFAULT_TYPE_SCORE, PURPOSE_SCORES, SCOPE_SCORES, SERIES_DEFAULT, SERIES_SCORES, TYPE_SCORES
 
 def score_by_purpose(notam: Notam) -> float:
     """
     Assigns a base score based on PurposeType.
     N = 50, B = 25, O = 10, M = 5
     """
-    if notam.purpose and PurposeType.N in notam.purpose:
-        return 50
-    elif notam.purpose and PurposeType.B in notam.purpose:
-        return 25
-    elif notam.purpose and PurposeType.O in notam.purpose:
-        return 10
-    elif notam.purpose and PurposeType.M in notam.purpose:
-        return 5
-    else:
-        return 0
+    for purpose, purpose_score in PURPOSE_SCORES.items():
+        if notam.purpose and purpose in notam.purpose:
+            return purpose_score
+    return 0
     
 def score_by_type(notam: Notam) -> float:
     """
     Scores based on NOTAM type: R=50, N=20, other=10.
     Refer to api_schema.py for details on the NotamType enum.
     """
-    TYPE_SCORES = {NotamType.R: 50, NotamType.N: 20}
-    return TYPE_SCORES.get(notam.type, 10)
+    return TYPE_SCORES.get(notam.type, DEFAULT_TYPE_SCORE)
 
 
 def score_by_classification(notam: Notam) -> float:
@@ -30,8 +29,7 @@ def score_by_classification(notam: Notam) -> float:
     Adjusts score for classifications: MIL/LMIL +10, others 0.
     Refer to api_schema.py for details on the Classification enum.
     """
-    CLASS_SCORES = {Classification.MIL: 10, Classification.LMIL: 10}
-    return CLASS_SCORES.get(notam.classification, 0)
+    return CLASS_SCORES.get(notam.classification, DEFAULT_CLASS_SCORE)
 
 
 def score_by_category_scope(notam: Notam) -> float:
@@ -41,15 +39,9 @@ def score_by_category_scope(notam: Notam) -> float:
     Refer to api_schema.py for details on the Series and ScopeType enums.
     """
     total = 0.0
-    if notam.series == Series.R:
-        total += 20
+    total += SERIES_SCORES.get(notam.series, SERIES_DEFAULT)
     for scope in (notam.scope or []):
-        if scope == ScopeType.A:
-            total += 20
-        elif scope == ScopeType.E:
-            total += 10
-        elif scope == ScopeType.W:
-            total += 5
+        total += SCOPE_SCORES.get(scope, 0)
     return total
 
 def score(notam: Notam) -> float:
@@ -65,11 +57,98 @@ def score(notam: Notam) -> float:
     return total_score
 
 class NotamSorter:
-    def __init__(self, notams: list[Notam]):
+    def __init__(self, notams: list[Notam], scorer: BatchScorer | ReloadingScorer | None = None):
+        """
+        Args:
+            notams (list[Notam]): The NOTAMs to rank.
+            scorer (BatchScorer | ReloadingScorer | None): Scores the NOTAMs. Defaults to the rules in default_rules.json.
+        """
         self.notams = notams
+        self.scorer = scorer or default_scorer()
 
     def sort_by_score(self) -> list[Notam]:
         """
         Sorts the NOTAMs in descending order of their scores.
+
+        NOTAMs are scored together by self.scorer, equal scores keep their order in self.notams.
+        """
+        with span("score", notams=len(self.notams)):
+            return [self.notams[position] for position in self.scorer.rank(self.notams)]
+
+    def top_k(self, k: int) -> list[Notam]:
+        """
+        Returns the k highest scoring NOTAMs, highest first, without sorting the rest.
+
+        Equal scores keep their order in self.notams, so the result is the first k of sort_by_score().
+
+        Raises:
+            ValueError: If k is negative.
+        """
+        if k < 0:
+            raise ValueError("k must not be negative")
+        with span("score", notams=len(self.notams)):
+            scores = self.scorer.score(self.notams).tolist()
+        positions = heapq.nsmallest(k, range(len(self.notams)), key=lambda position: (-scores[position], position))
+        return [self.notams[position] for position in positions]
+
+    def iter_ranked(self) -> Iterator[Notam]:
+        """
+        Yields the NOTAMs in the order of sort_by_score(), each found only when it is requested.
+
+        After scoring, the first NOTAM is available in linear time and each next one in logarithmic time, so
+        showing the first screenful does not wait for the whole list to be sorted.
+        """
+        with span("score", notams=len(self.notams)):
+            heap = [(-notam_score, position) for position, notam_score in enumerate(self.scorer.score(self.notams).tolist())]
+            heapq.heapify(heap)
+        while heap:
+            _, position = heapq.heappop(heap)
+            yield self.notams[position]
+
+class RunningTopK:
+    """
+    Keeps the k highest scoring NOTAMs seen so far, for ranking NOTAMs while they are still being fetched.
+
+    Ties keep the order NOTAMs were added in, so top() matches the first k of NotamSorter.sort_by_score() over every NOTAM added.
+    """
+    def __init__(self, k: int, scorer: BatchScorer | ReloadingScorer | None = None):
+        """
+        Args:
+            k (int): The number of NOTAMs to keep.
+            scorer (BatchScorer | ReloadingScorer | None): Scores the NOTAMs. Defaults to the rules in default_rules.json.
+
+        Raises:
+            ValueError: If k is not positive.
+        """
+        if k <= 0:
+            raise ValueError("k must be greater than 0")
+        self.k = k
+        self.scorer = scorer or default_scorer()
+        # min-heap of (score, -arrival, notam): the root is the lowest ranked NOTAM kept
+        self._heap: list[tuple[float, int, Notam]] = []
+        self._arrivals = itertools.count()
+
+    def add(self, notams: Iterable[Notam]) -> bool:
+        """
+        Adds NOTAMs to the ranking.
+
+        Returns:
+            bool: True if the top k changed.
+        """
+        notams = list(notams)
+        changed = False
+        for notam, notam_score in zip(notams, self.scorer.score(notams).tolist()):
+            entry = (notam_score, -next(self._arrivals), notam)
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+                changed = True
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+                changed = True
+        return changed
+
+    def top(self) -> list[Notam]:
+        """
+        Returns the k highest scoring NOTAMs added so far, highest first.
         """
-        return sorted(self.notams, key=score, reverse=True)  # Use the standalone score function
\ No newline at end of file
+        return [notam for _, _, notam in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
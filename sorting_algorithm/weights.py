@@ -0,0 +1,22 @@
+'''
+Score weights of the per-NOTAM scoring functions, read from default_rules.json.
+'''
+from .rules import ScoringRules
+
+_rules = ScoringRules.default()
+
+# Only the first purpose in this order counts
+PURPOSE_SCORES = _rules.purpose.scores
+
+TYPE_SCORES = _rules.type.scores
+DEFAULT_TYPE_SCORE = _rules.type.default
+
+CLASS_SCORES = _rules.classification.scores
+DEFAULT_CLASS_SCORE = _rules.classification.default
+
+SERIES_SCORES = _rules.series.scores
+# Also the score of NOTAMs without a series
+SERIES_DEFAULT = _rules.series.default
+
+# Every scope of a NOTAM counts
+SCOPE_SCORES = _rules.scope.scores
@@ -0,0 +1,9 @@
+import pytest
+
+from notam_fetcher.rate_limiter import RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_rate_limiters(monkeypatch: pytest.MonkeyPatch):
+    """Give each test its own process wide rate limiters so request budgets don't carry over between tests"""
+    monkeypatch.setattr(RateLimiter, "_shared", {})
@@ -1,8 +1,10 @@
+import pandas as pd
 import pytest
 
 import sys
 import os
 
+from airport_data.snapshot import load_snapshot
 from airport_data.types import Airport
 
 # Add the project root directory (parent of 'tests') to sys.path
@@ -103,4 +105,53 @@ def test_get_airport():
     assert jfk_airport == jfk_expected
 
     with pytest.raises(ValueError):
-        AirportData.get_airport('ZZZ')
\ No newline at end of file
+        AirportData.get_airport('ZZZ')
+
+def test_get_airports():
+    airports = AirportData.get_airports(["JFK", "KLAX", "MUGM"])
+    assert [airport.icao for airport in airports] == ["KJFK", "KLAX", "MUGM"]
+    assert airports[0] == AirportData.get_airport("KJFK")
+
+    with pytest.raises(ValueError) as e:
+        AirportData.get_airports(["JFK", "ZZZ", "QQQQ"])
+    assert "ZZZ" in str(e.value) and "QQQQ" in str(e.value)
+
+
+def test_index_matches_dataframe_scan():
+    """Test that every code resolves to the same row a scan of both code columns finds first"""
+    df = AirportData._read_source()
+    for code in df["IATA"].tolist()[::50] + df["ICAO"].tolist()[::50]:
+        if code == "\\N":
+            continue
+        expected = df[(df["IATA"] == code) | (df["ICAO"] == code)].iloc[0]
+        assert AirportData.get_airport_name(code) == expected["Name"]
+        assert AirportData.get_airport_latlong(code) == (expected["Latitude"], expected["Longitude"])
+
+
+def test_snapshot_rebuilt_when_source_changes(tmp_path):
+    """Test that the snapshot is reused until its source file changes"""
+    source = tmp_path / "codes.csv"
+    source.write_text("code,value\nAAA,1\n")
+    reads = 0
+    def read_source():
+        nonlocal reads
+        reads += 1
+        return pd.read_csv(source)
+
+    assert load_snapshot(str(source), ["code", "value"], read_source)["value"].tolist() == [1]
+    assert load_snapshot(str(source), ["code", "value"], read_source)["value"].tolist() == [1]
+    assert reads == 1
+
+    source.write_text("code,value\nAAA,1\nBBB,22\n")
+    data = load_snapshot(str(source), ["code", "value"], read_source)
+    assert reads == 2
+    assert data["code"].tolist() == [b"AAA", b"BBB"]
+    assert data["value"].tolist() == [1, 22]
+
+
+def test_missing_source_fails_on_first_use(monkeypatch):
+    """Test that a missing airports.dat raises RuntimeError on first lookup instead of on import"""
+    monkeypatch.setattr(AirportData, "source_path", "does-not-exist.dat")
+    monkeypatch.setattr(AirportData, "_data", None)
+    with pytest.raises(RuntimeError):
+        AirportData.get_airport("JFK")
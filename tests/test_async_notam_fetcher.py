@@ -0,0 +1,188 @@
+from typing import Any
+import asyncio
+
+import httpx
+import pytest
+
+from notam_fetcher.async_notam_fetcher import AsyncNotamFetcher
+from notam_fetcher.exceptions import NotamFetcherPageError, NotamFetcherRateLimitError, NotamFetcherRequestError, NotamFetcherTimeoutReached, NotamFetcherUnauthenticatedError
+
+
+def make_item(notam_id: str) -> dict[str, Any]:
+    return {
+        "type": "Feature",
+        "properties": {
+            "coreNOTAMData": {
+                "notamEvent": {"scenario": "6000"},
+                "notam": {
+                    "id": notam_id,
+                    "number": "A2157/24",
+                    "type": "N",
+                    "issued": "2024-10-02T19:54:00.000Z",
+                    "location": "ZJX",
+                    "effectiveStart": "2024-10-02T19:50:00.000Z",
+                    "effectiveEnd": "2024-10-14T22:00:00.000Z",
+                    "text": "EXAMPLE NOTAM TEXT",
+                    "classification": "INTL",
+                    "accountId": "KZJX",
+                    "lastUpdated": "2024-10-02T19:54:00.000Z",
+                },
+                "notamTranslation": [],
+            }
+        },
+        "geometry": {"type": "GeometryCollection"},
+    }
+
+
+def make_fetcher(handler: Any, **kwargs: Any) -> AsyncNotamFetcher:
+    return AsyncNotamFetcher("CLIENT_ID", "CLIENT_SECRET", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), **kwargs)
+
+
+def test_fetch_notams_by_airport_code_all_pages():
+    """Test that every page is fetched and params are sent"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["icaoLocation"] == "KDEN"
+        assert request.headers["client_id"] == "CLIENT_ID"
+        page_num = int(request.url.params["pageNum"])
+        return httpx.Response(200, json={
+            "pageSize": 1, "pageNum": page_num, "totalCount": 3, "totalPages": 3,
+            "items": [make_item(f"NOTAM_{page_num}")],
+        })
+
+    async def run():
+        async with make_fetcher(handler, page_size=1) as fetcher:
+            return await fetcher.fetch_notams_by_airport_code("KDEN")
+
+    notams = asyncio.run(run())
+    assert [notam.notam.id for notam in notams] == ["NOTAM_1", "NOTAM_2", "NOTAM_3"]
+
+
+def test_fetch_notams_by_latlong_list_dedupes_and_bounds_concurrency():
+    """Test that NOTAMs are deduplicated and no more than max_concurrency requests are in flight"""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        lat = request.url.params["locationLatitude"]
+        return httpx.Response(200, json={
+            "pageSize": 1000, "pageNum": 1, "totalCount": 2, "totalPages": 1,
+            "items": [make_item(f"NOTAM_{lat}"), make_item("NOTAM_SHARED")],
+        })
+
+    async def run():
+        async with make_fetcher(handler, max_concurrency=2) as fetcher:
+            return await fetcher.fetch_notams_by_latlong_list([(float(lat), 0.0) for lat in range(6)], 30)
+
+    notams = asyncio.run(run())
+    assert len(notams) == 7
+    assert max_in_flight == 2
+
+
+def test_fetch_notams_by_latlong_list_retries_rate_limit(monkeypatch: pytest.MonkeyPatch):
+    """Test that rate limited requests are retried"""
+    calls = 0
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return httpx.Response(429, json={"error": "Rate limit exceeded"})
+        return httpx.Response(200, json={"pageSize": 1000, "pageNum": 1, "totalCount": 1, "totalPages": 1, "items": [make_item("NOTAM_1")]})
+
+    monkeypatch.setattr(AsyncNotamFetcher, "MAX_BACKOFF_TIME", 0)
+
+    async def run():
+        async with make_fetcher(handler) as fetcher:
+            return await fetcher.fetch_notams_by_latlong_list([(0.0, 0.0)], 30)
+
+    assert len(asyncio.run(run())) == 1
+    assert calls == 2
+
+
+def test_fetch_notams_by_latlong_list_timeout():
+    """Test that NotamFetcherTimeoutReached is raised when the timeout passes"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, json={"error": "Rate limit exceeded"})
+
+    async def run():
+        async with make_fetcher(handler, timeout=0.1) as fetcher:
+            return await fetcher.fetch_notams_by_latlong_list([(0.0, 0.0)], 30)
+
+    with pytest.raises(NotamFetcherTimeoutReached):
+        asyncio.run(run())
+
+
+def test_fetch_notams_by_latlong_list_cancels_other_waypoints():
+    """Test that the other waypoints are cancelled when one fails"""
+    cancelled = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["locationLatitude"] == "1.0":
+            raise httpx.ConnectError("Connection refused")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(request.url.params["locationLatitude"])
+            raise
+        return httpx.Response(200, json={"pageSize": 1, "pageNum": 1, "totalCount": 0, "totalPages": 1, "items": []})
+
+    async def run():
+        async with make_fetcher(handler) as fetcher:
+            with pytest.raises(NotamFetcherRequestError):
+                await fetcher.fetch_notams_by_latlong_list([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)], 30)
+            # Cancelled before the call returns, not when the event loop closes
+            assert sorted(cancelled) == ["0.0", "2.0"]
+
+    asyncio.run(run())
+
+
+def test_fetch_errors():
+    """Test that the same exceptions as NotamFetcher are raised"""
+    def unauthorized(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"error": "Invalid client id or secret"})
+
+    def rate_limited(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, json={"error": "Rate limit exceeded"})
+
+    async def run(handler: Any):
+        async with make_fetcher(handler) as fetcher:
+            return await fetcher.fetch_notams_by_latlong(32, 32, 10)
+
+    with pytest.raises(NotamFetcherUnauthenticatedError):
+        asyncio.run(run(unauthorized))
+    with pytest.raises(NotamFetcherRateLimitError):
+        asyncio.run(run(rate_limited))
+
+
+def test_fetch_pages_concurrently_with_partial_result():
+    """Test that pages are fetched concurrently and a failed page raises NotamFetcherPageError holding the pages before it"""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        page_num = int(request.url.params["pageNum"])
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if page_num == 4:
+            return httpx.Response(500, text="Internal Server Error")
+        return httpx.Response(200, json={
+            "pageSize": 1, "pageNum": page_num, "totalCount": 5, "totalPages": 5,
+            "items": [make_item(f"NOTAM_{page_num}")],
+        })
+
+    async def run():
+        async with make_fetcher(handler, page_size=1) as fetcher:
+            return await fetcher.fetch_notams_by_airport_code("KDEN")
+
+    with pytest.raises(NotamFetcherPageError) as e:
+        asyncio.run(run())
+    assert e.value.failed_page == 4
+    assert [notam.notam.id for notam in e.value.notams] == ["NOTAM_1", "NOTAM_2", "NOTAM_3"]
+    assert max_in_flight > 1
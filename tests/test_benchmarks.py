@@ -0,0 +1,38 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks import bench_pipeline
+
+
+def test_pipeline_benchmark(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr(bench_pipeline, "TIME_BUDGET", 0.01)
+    results = bench_pipeline.run(scales=(1, 100), routes={"short": ("JFK", "BOS")})
+    assert set(results) == {"get_airport/8", "waypoints/short", "parse/1", "dedupe/1", "sort/1", "print/1",
+                            "parse/100", "dedupe/100", "sort/100", "print/100"}
+    assert all(timing["seconds"] > 0 and timing["repeat"] >= 1 for timing in results.values())
+
+    output = tmp_path / "results.json"
+    assert bench_pipeline.main(["--scales", "1", "--output", str(output)]) == 0
+    document = json.loads(output.read_text())
+    assert "python" in document["meta"] and "parse/1" in document["results"]
+
+    def write_baseline(seconds: float):
+        output.write_text(json.dumps({"meta": document["meta"], "results": {
+            name: {**timing, "seconds": seconds} for name, timing in document["results"].items()
+        }}))
+
+    monkeypatch.setattr(bench_pipeline, "MIN_SECONDS", 0)
+    write_baseline(100)
+    assert bench_pipeline.main(["--scales", "1", "--baseline", str(output)]) == 0
+    write_baseline(1e-9)
+    assert bench_pipeline.main(["--scales", "1", "--baseline", str(output)]) == 1
+
+def test_compare():
+    baseline = {"parse/100": {"seconds": 0.010}, "sort/100": {"seconds": 0.010}, "dedupe/100": {"seconds": 0.0001}}
+    results = {"parse/100": {"seconds": 0.012}, "sort/100": {"seconds": 0.030}, "dedupe/100": {"seconds": 0.001},
+               "print/100": {"seconds": 1.0}}
+    regressions = bench_pipeline.compare(results, baseline, tolerance=0.5)
+    assert len(regressions) == 1 and regressions[0].startswith("sort/100")
+    assert bench_pipeline.compare(results, baseline, tolerance=2.5) == []
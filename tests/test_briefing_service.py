@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any
+import json, threading, urllib.error, urllib.request
+
+import pytest
+
+from briefing_service import BriefingHTTPServer, BriefingService
+from notam_fetcher import AsyncNotamFetcher, MemoryNotamCache, MemoryNotamSyncStore
+from notam_fetcher.api_schema import Classification, CoreNOTAMData, Notam, NotamEvent, NotamType, PurposeType
+from notam_fetcher.exceptions import NotamFetcherRateLimitError, NotamFetcherRequestError, NotamFetcherTimeoutReached
+from notam_prefetcher import GridNotamStore, NotamGrid
+
+
+def make_core_notam(notam_id: str, lat: float, long: float, purpose: set[PurposeType]) -> CoreNOTAMData:
+    now = datetime.now(timezone.utc)
+    coordinates = f"{int(abs(lat)):02d}{round(abs(lat) % 1 * 60):02d}{'N' if lat >= 0 else 'S'}" \
+                  f"{int(abs(long)):03d}{round(abs(long) % 1 * 60):02d}{'E' if long >= 0 else 'W'}"
+    return CoreNOTAMData(
+        notam_event=NotamEvent(scenario=6000),
+        notam=Notam(
+            id=notam_id,
+            number="A0001/25",
+            type=NotamType.N,
+            location="KZNY",
+            text="EXAMPLE NOTAM TEXT",
+            classification=Classification.INTL,
+            account_id="KZNY",
+            issued=now,
+            effective_start=now,
+            effective_end=now + timedelta(days=1),
+            last_updated=now,
+            purpose=purpose,
+            coordinates=coordinates,
+            radius="001",
+        ),
+        notam_translation=[],
+    )
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch):
+    calls: list[tuple[float, float, float]] = []
+    lock = threading.Lock()
+
+    async def mock_fetch_notams_by_latlong(self: AsyncNotamFetcher, lat: float, long: float, radius: float = 100.0):
+        if lat < 35:
+            raise NotamFetcherRequestError("Failed to retrieve NOTAMs from the FAA API.")
+        with lock:
+            calls.append((lat, long, radius))
+        return [
+            make_core_notam(f"{lat:.3f},{long:.3f}", lat, long, {PurposeType.B}),
+            make_core_notam(f"{lat:.3f},{long:.3f}/N", lat, long, {PurposeType.N}),
+            make_core_notam("FAR", -40.0, 20.0, {PurposeType.N}),
+        ]
+
+    monkeypatch.setattr(AsyncNotamFetcher, "fetch_notams_by_latlong", mock_fetch_notams_by_latlong)
+
+    service = BriefingService(AsyncNotamFetcher("CLIENT_ID", "CLIENT_SECRET", cache=MemoryNotamCache()),
+                              airport_validator=lambda airport: airport.icao != "KLGA")
+    http_server = BriefingHTTPServer(service, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{http_server.server_address[1]}", calls
+    http_server.shutdown()
+    http_server.server_close()
+    service.close()
+
+
+def get(url: str) -> tuple[int, Any]:
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_briefing(server):
+    base_url, calls = server
+    assert get(f"{base_url}/health") == (200, {"status": "ok"})
+
+    status, briefing = get(f"{base_url}/briefing?departure=JFK&destination=ORD&limit=4")
+    assert status == 200
+    assert briefing["departure"]["icao"] == "KJFK" and briefing["destination"]["icao"] == "KORD"
+    assert len(calls) == briefing["queries"]
+    assert briefing["notams_in_corridor"] == 2 * briefing["queries"]
+    assert len(briefing["notams"]) == 4
+    assert [notam["score"] for notam in briefing["notams"]] == [70, 70, 70, 70]
+    assert all(notam["notam"]["purpose"] == ["N"] for notam in briefing["notams"])
+
+    status, briefing = get(f"{base_url}/briefing?departure=JFK&destination=ORD")
+    scores = [notam["score"] for notam in briefing["notams"]]
+    assert scores == sorted(scores, reverse=True) and len(scores) == briefing["notams_in_corridor"]
+    assert all(notam["notam"]["id"] != "FAR" for notam in briefing["notams"])
+
+
+def test_briefing_concurrent(server):
+    base_url, _ = server
+    routes = [("JFK", "ORD"), ("BOS", "ORD"), ("ORD", "JFK"), ("JFK", "BOS")] * 3
+    with ThreadPoolExecutor(max_workers=len(routes)) as executor:
+        results = list(executor.map(lambda route: get(f"{base_url}/briefing?departure={route[0]}&destination={route[1]}"), routes))
+    assert all(status == 200 for status, _ in results)
+    assert [notam["notam"]["id"] for notam in results[0][1]["notams"]] == [notam["notam"]["id"] for notam in results[-4][1]["notams"]]
+
+
+def test_briefing_errors(server):
+    base_url, _ = server
+    assert get(f"{base_url}/briefing?departure=JFK")[0] == 400
+    assert get(f"{base_url}/briefing?departure=JFK&destination=ORD&limit=x")[0] == 400
+    assert get(f"{base_url}/briefing?departure=JFK&destination=ZZ9Q")[0] == 400
+    assert get(f"{base_url}/briefing?departure=LGA&destination=ORD")[0] == 400
+    assert get(f"{base_url}/briefing?departure=MIA&destination=ATL")[0] == 502
+    assert get(f"{base_url}/unknown")[0] == 404
+
+
+def test_briefing_unavailable(server, monkeypatch: pytest.MonkeyPatch):
+    base_url, _ = server
+
+    def mock_brief(self: BriefingService, departure_code: str, destination_code: str, limit: int | None = None):
+        raise NotamFetcherRateLimitError() if departure_code == "JFK" else NotamFetcherTimeoutReached()
+
+    monkeypatch.setattr(BriefingService, "brief", mock_brief)
+    with pytest.raises(urllib.error.HTTPError) as rate_limited:
+        urllib.request.urlopen(f"{base_url}/briefing?departure=JFK&destination=ORD", timeout=30)
+    assert rate_limited.value.code == 503
+    assert rate_limited.value.headers["Retry-After"] == "60"
+    assert "rate limit" in json.loads(rate_limited.value.read())["error"]
+
+    with pytest.raises(urllib.error.HTTPError) as timed_out:
+        urllib.request.urlopen(f"{base_url}/briefing?departure=BOS&destination=ORD", timeout=30)
+    assert timed_out.value.code == 503
+    assert timed_out.value.headers["Retry-After"] is None
+    assert json.loads(timed_out.value.read()) == {"error": "NOTAMs could not be fetched in time"}
+
+
+def test_metrics(server):
+    base_url, _ = server
+    with urllib.request.urlopen(f"{base_url}/metrics", timeout=30) as response:
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert "# TYPE notam_fetcher_requests_total counter" in response.read().decode()
+
+
+def test_briefing_from_local_store(server):
+    _, calls = server
+    sync_store = MemoryNotamSyncStore()
+    local_store = GridNotamStore(NotamGrid(bounds=(38, -80, 45, -68)), sync_store)
+    service = BriefingService(AsyncNotamFetcher("CLIENT_ID", "CLIENT_SECRET"), local_store=local_store,
+                              airport_validator=lambda airport: True)
+    try:
+        briefing = service.brief("JFK", "BOS")
+        assert briefing["source"] == "api" and len(calls) == briefing["queries"]
+
+        now = datetime.now(timezone.utc)
+        for cell in local_store.grid.cells:
+            sync_store.put(cell.key, [make_core_notam(f"{cell.row},{cell.column}", *cell.center, {PurposeType.N})],
+                           now, full=True)
+        request_count = len(calls)
+        briefing = service.brief("JFK", "BOS")
+        assert briefing["source"] == "local" and briefing["queries"] == 0
+        assert len(calls) == request_count
+        assert briefing["notams_in_corridor"] > 0
+
+        # Routes leaving the grid are fetched from the API
+        assert service.brief("JFK", "ORD")["source"] == "api"
+    finally:
+        service.close()
@@ -1,7 +1,40 @@
+from pathlib import Path
 import os
-from driver import main
+import subprocess
+import sys
+
 import pytest
 
+import batch_driver
+import driver
+from airport_code_validator.airport_code_validator import AirportCodeValidator
+from airport_data.airport_data import AirportData
+from benchmarks.synthetic import make_page
+from driver import main
+from flight_input_parser.flight_input_parser import FlightInputParser
+from notam_fetcher import NotamFetcher
+from notam_fetcher.api_schema import APIResponseSuccess
+from notam_fetcher.exceptions import NotamFetcherRequestError
+
+
+@pytest.fixture
+def page_two_fails(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """Answers every query with two pages, failing the second with a network error"""
+    def fetch_page(self: NotamFetcher, request):
+        if request.page_num > 1:
+            raise NotamFetcherRequestError("Connection reset")
+        page = make_page(5)
+        page["totalPages"] = 2
+        return APIResponseSuccess.model_validate(page)
+
+    monkeypatch.setattr(NotamFetcher, "_fetch_notams", fetch_page)
+    monkeypatch.setattr(AirportCodeValidator, "is_valid", lambda airport: True)
+    monkeypatch.setenv("CLIENT_ID", "MOCK_CLIENT_ID")
+    monkeypatch.setenv("CLIENT_SECRET", "MOCK_CLIENT_SECRET")
+    # Keep the drivers' cache, sync store and rate limit files out of the repository
+    monkeypatch.setattr(AirportData, "source_path", os.path.abspath(AirportData.source_path))
+    monkeypatch.chdir(tmp_path)
+
 
 def test_invalid_env(monkeypatch: pytest.MonkeyPatch):
     """Tests if program exits on invalid env variables"""
@@ -24,3 +57,31 @@ def test_invalid_env(monkeypatch: pytest.MonkeyPatch):
     
 
 
+
+def test_batch_driver_invalid_env(monkeypatch: pytest.MonkeyPatch):
+    """Tests if the batch driver exits on invalid env variables"""
+    monkeypatch.setattr(os, "getenv", lambda var: None)
+
+    with pytest.raises(SystemExit) as e:
+        batch_driver.main()
+    assert str(e.value) == "Error: CLIENT_ID not set in .env file"
+
+
+def test_later_page_network_error(page_two_fails, monkeypatch: pytest.MonkeyPatch):
+    """Tests if the drivers exit cleanly when a page after the first fails"""
+    monkeypatch.setattr(FlightInputParser, "get_flight_input", lambda: ("JFK", "BOS"))
+    with pytest.raises(SystemExit) as e:
+        driver.main()
+    assert str(e.value) == "Failed to retrieve NOTAMs due to a network issue."
+
+    monkeypatch.setattr(batch_driver, "get_routes_input", lambda: [("JFK", "BOS")])
+    with pytest.raises(SystemExit) as e:
+        batch_driver.main()
+    assert str(e.value) == "Failed to retrieve NOTAMs due to a network issue."
+
+
+def test_batch_driver_does_not_import_driver():
+    """Tests that the batch driver and server don't run driver.py's logging setup, which truncates output.log"""
+    for module in ("batch_driver", "briefing_server"):
+        subprocess.run([sys.executable, "-c", f"import sys, {module}; assert 'driver' not in sys.modules"],
+                       cwd=Path(__file__).parent.parent, check=True)
@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import asyncio, json, threading
+
+import pytest
+
+from benchmarks.synthetic import make_page
+from fake_notam_api import APIProfile, FakeNotamAPIServer, RecordedNotams
+from notam_fetcher import AsyncNotamFetcher, MemoryNotamSyncStore, NotamFetcher, RateLimiter, ResponseRecording
+from notam_fetcher.sync_store import apply_delta
+from notam_fetcher.exceptions import NotamFetcherRateLimitError, NotamFetcherRequestError, NotamFetcherUnauthenticatedError
+
+ITEMS = make_page(3000)["items"]
+
+
+@pytest.fixture
+def start_server():
+    servers: list[FakeNotamAPIServer] = []
+
+    def start(notams: RecordedNotams, profile: APIProfile = APIProfile(), **kwargs) -> FakeNotamAPIServer:
+        server = FakeNotamAPIServer(notams, profile, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_fetcher(server: FakeNotamAPIServer, **kwargs) -> NotamFetcher:
+    return NotamFetcher("CLIENT_ID", "CLIENT_SECRET", rate_limiter=RateLimiter(1000, 1), api_url=server.url, **kwargs)
+
+
+def test_query():
+    notams = RecordedNotams(ITEMS + ITEMS[:10])
+    assert len(notams) == len(ITEMS)
+
+    matches = notams.query({"locationLatitude": "40", "locationLongitude": "-100", "locationRadius": "100"})
+    assert 0 < len(matches) < len(ITEMS)
+    assert notams.query({"icaoLocation": "kjfk"}) == list(range(len(ITEMS)))
+
+    since = sorted(item["properties"]["coreNOTAMData"]["notam"]["lastUpdated"] for item in ITEMS)[-100]
+    updated = notams.query({"icaoLocation": "KJFK", "lastUpdatedDate": since})
+    assert len(updated) >= 100
+    assert all(notams.items[index]["properties"]["coreNOTAMData"]["notam"]["lastUpdated"] >= since for index in updated)
+
+    page = json.loads(notams.page({"icaoLocation": "KJFK", "pageNum": "3", "pageSize": "1000"}))
+    assert (page["pageNum"], page["totalCount"], page["totalPages"]) == (3, len(ITEMS), 3)
+    assert page["items"] == ITEMS[2000:]
+
+    with pytest.raises(ValueError):
+        notams.page({"icaoLocation": "KJFK", "pageSize": "1001"})
+    with pytest.raises(ValueError):
+        notams.query({"locationLatitude": "40", "locationLongitude": "-100", "locationRadius": "101"})
+
+
+def test_from_directory(tmp_path: Path):
+    (tmp_path / "response-a.json").write_text(json.dumps(make_page(10, seed=1)))
+    (tmp_path / "response-b.json").write_text(json.dumps({"error": "Invalid client id or secret"}))
+    (tmp_path / "response-c.json").write_text("not json")
+    assert len(RecordedNotams.from_directory(tmp_path)) == 10
+
+
+def test_fetch_pages(start_server):
+    server = start_server(RecordedNotams(ITEMS))
+    notam_fetcher = make_fetcher(server, page_size=100)
+
+    notams = notam_fetcher.fetch_notams_by_airport_code("KJFK")
+    assert [notam.notam.id for notam in notams] == [item["properties"]["coreNOTAMData"]["notam"]["id"] for item in ITEMS]
+    assert server.stats.requests == 30
+
+    expected = RecordedNotams(ITEMS).query({"locationLatitude": "38", "locationLongitude": "-97", "locationRadius": "100"})
+    assert len(notam_fetcher.fetch_notams_by_latlong(38, -97, 100)) == len(expected)
+
+
+def test_async_fetch(start_server):
+    server = start_server(RecordedNotams(ITEMS))
+
+    async def fetch():
+        async with AsyncNotamFetcher("CLIENT_ID", "CLIENT_SECRET", page_size=500, rate_limiter=RateLimiter(1000, 1),
+                                     api_url=server.url) as notam_fetcher:
+            return await notam_fetcher.fetch_notams_by_airport_code("KJFK")
+
+    assert len(asyncio.run(fetch())) == len(ITEMS)
+
+
+def test_rate_limit_and_credentials(start_server):
+    server = start_server(RecordedNotams(ITEMS), APIProfile(max_requests=2, period=60), client_id="CLIENT_ID")
+    notam_fetcher = make_fetcher(server)
+    notam_fetcher.fetch_notams_by_latlong(38, -97, 100)
+    notam_fetcher.fetch_notams_by_latlong(38, -97, 100)
+    with pytest.raises(NotamFetcherRateLimitError):
+        notam_fetcher.fetch_notams_by_latlong(38, -97, 100)
+    assert (server.stats.requests, server.stats.throttled) == (3, 1)
+
+    server = start_server(RecordedNotams(ITEMS), client_id="OTHER_CLIENT_ID")
+    with pytest.raises(NotamFetcherUnauthenticatedError):
+        make_fetcher(server).fetch_notams_by_latlong(38, -97, 100)
+
+
+def test_throttled_requests_retried(start_server):
+    server = start_server(RecordedNotams(ITEMS), APIProfile(throttle_rate=0.5), seed=3)
+    notam_fetcher = make_fetcher(server)
+    notam_fetcher.MAX_BACKOFF_TIME = 0
+    notams = notam_fetcher.fetch_notams_by_latlong_list([(38, -97), (40, -100), (35, -90)], 100)
+    assert server.stats.throttled > 0
+    assert len(notams) > 0
+
+
+def test_record_and_replay(start_server, tmp_path: Path):
+    server = start_server(RecordedNotams(ITEMS))
+    recording = ResponseRecording(tmp_path / "recording", "record")
+    recorded = make_fetcher(server, page_size=200, recording=recording).fetch_notams_by_latlong(38, -97, 100)
+    assert len(list((tmp_path / "recording").glob("*.json"))) == server.stats.requests
+    server.shutdown()
+
+    # No server, no rate limiting
+    replay = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", page_size=200, rate_limiter=RateLimiter(1, 3600),
+                          recording=ResponseRecording(tmp_path / "recording", "replay"))
+    for _ in range(3):
+        assert replay.fetch_notams_by_latlong(38, -97, 100) == recorded
+    with pytest.raises(NotamFetcherRequestError):
+        replay.fetch_notams_by_latlong(40, -100, 100)
+
+    # Unrecorded delta requests are answered with the full response
+    replay.sync_store = MemoryNotamSyncStore()
+    now = datetime.now(timezone.utc)
+    replay.sync_store.put("latlong:38.0000:-97.0000:100", [], now, full=True)
+    assert replay.fetch_notams_by_latlong(38, -97, 100) == apply_delta([], recorded, now)
+
+    with pytest.raises(ValueError):
+        ResponseRecording(tmp_path, "rewind") # type: ignore
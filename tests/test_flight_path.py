@@ -1,4 +1,7 @@
+import numpy as np
 import pytest
+from flight_path import batch_geodesic
+from flight_path.batch_geodesic import geodesic_lines, positions, waypoints_along
 from flight_path.flight_path import FlightPath
 from geographiclib.geodesic import Geodesic
 from airport_data.airport_data import AirportData
@@ -50,3 +53,100 @@ def test_waypoints_on_great_circle(n):
 
         # Allow small margin of error because of floating point calculations
         assert abs(waypoint_bearing - expected_bearing) < 1.0, f"Waypoint {waypoint} deviates from the great-circle path."
+
+# Test that every point in the corridor lies inside one of the planned query circles
+@pytest.mark.parametrize("departure, destination, corridor_width", [
+    ("JFK", "LAX", 50), ("JFK", "LAX", 150), ("OKC", "DFW", 20), ("JFK", "LGA", 50), ("JFK", "JFK", 10),
+])
+def test_coverage_plan_covers_corridor(departure, destination, corridor_width):
+    flight_path = FlightPath(AirportData.get_airport(departure), AirportData.get_airport(destination))
+    plan = flight_path.get_coverage_plan(corridor_width)
+    assert plan.radius <= 100
+    assert plan.guaranteed_corridor_width >= corridor_width
+
+    nm = 1852
+    line = Geodesic.WGS84.InverseLine(*flight_path.departure_coords, *flight_path.destination_coords)
+    half_width = corridor_width / 2
+    samples = []
+    for i in range(201):
+        along = line.Position(line.s13 * i / 200)
+        for offset in [-half_width, -half_width / 2, 0, half_width / 2, half_width]:
+            point = Geodesic.WGS84.Direct(along["lat2"], along["lon2"], along["azi2"] + 90, offset * nm)
+            samples.append((point["lat2"], point["lon2"]))
+    # past each end of the route
+    for lat, long in [flight_path.departure_coords, flight_path.destination_coords]:
+        for azimuth in range(0, 360, 30):
+            point = Geodesic.WGS84.Direct(lat, long, azimuth, half_width * nm)
+            samples.append((point["lat2"], point["lon2"]))
+
+    for lat, long in samples:
+        distance = min(Geodesic.WGS84.Inverse(lat, long, center[0], center[1])["s12"] / nm for center in plan.waypoints)
+        assert distance <= plan.radius, f"({lat}, {long}) is not covered"
+
+# Test that the plan uses fewer queries than waypoints spaced by the query radius
+def test_coverage_plan_request_count():
+    flight_path = FlightPath(AirportData.get_airport("JFK"), AirportData.get_airport("LAX"))
+    plan = flight_path.get_coverage_plan(50)
+    assert plan.request_count == 13
+    assert plan.request_count < len(flight_path.get_waypoints_by_gap(40))
+
+def test_coverage_plan_invalid_width():
+    flight_path = FlightPath(AirportData.get_airport("JFK"), AirportData.get_airport("LAX"))
+    with pytest.raises(ValueError):
+        flight_path.get_coverage_plan(0)
+    with pytest.raises(ValueError):
+        flight_path.get_coverage_plan(200)
+
+# Test that vectorized waypoints match GeographicLib's scalar solution
+@pytest.mark.parametrize("departure, destination", [
+    ((40.6413, -73.7781), (33.9416, -118.4085)), ((-33.9461, 151.1772), (51.4700, -0.4543)),
+    ((10.0, 179.0), (10.0, -179.0)), ((0.0, 0.0), (0.0, 179.5)), ((89.0, 0.0), (-89.0, 0.0)),
+])
+def test_waypoints_match_geographiclib(departure, destination):
+    n = 25
+    waypoints = FlightPath.get_waypoints_by_num_bulk([(departure, destination)], n)[0]
+    line = Geodesic.WGS84.InverseLine(*departure, *destination)
+    assert waypoints[0] == departure and waypoints[-1] == destination
+    for i, (lat, long) in enumerate(waypoints[1:-1], start=1):
+        expected = line.Position(line.s13 * i / (n + 1))
+        assert abs(lat - expected["lat2"]) < 1e-9
+        assert abs((long - expected["lon2"] + 180) % 360 - 180) < 1e-9
+
+# positions reads GeodesicLine's private attributes, so a GeographicLib update that changes them fails here
+def test_positions_match_geographiclib_position():
+    routes = [((40.6413, -73.7781), (33.9416, -118.4085)), ((-33.9461, 151.1772), (51.4700, -0.4543)),
+              ((10.0, 179.0), (10.0, -179.0)), ((89.0, 0.0), (-89.0, 0.0)), ((0.0, 0.0), (0.5, 179.7))]
+    lines = geodesic_lines(routes)
+    line_indices = np.repeat(np.arange(len(lines)), 7)
+    fractions = np.tile([0, 0.01, 0.25, 0.5, 0.9, 1, 1.2], len(lines))
+    distances = np.array([lines[index].s13 for index in line_indices]) * fractions
+    lats, longs = positions(lines, line_indices, distances)
+    for index, distance, lat, long in zip(line_indices, distances, lats, longs):
+        expected = Geodesic.WGS84.InverseLine(*routes[index][0], *routes[index][1]).Position(distance)
+        assert abs(lat - expected["lat2"]) < 1e-9
+        assert abs((long - expected["lon2"] + 180) % 360 - 180) < 1e-9
+
+# Test that other GeographicLib versions fall back to GeodesicLine.Position and give the same waypoints
+def test_positions_fallback_matches_batched(monkeypatch: pytest.MonkeyPatch):
+    routes = [((40.6413, -73.7781), (33.9416, -118.4085)), ((10.0, 179.0), (10.0, -179.0)), ((40.0, -74.0), (40.0, -74.0))]
+    batched = waypoints_along(routes, [9, 4, 3])
+    monkeypatch.setattr(batch_geodesic, "_BATCHED", False)
+    fallback = waypoints_along(routes, [9, 4, 3])
+    assert [len(route) for route in fallback] == [len(route) for route in batched]
+    for fallback_route, batched_route in zip(fallback, batched):
+        for (lat, long), (expected_lat, expected_long) in zip(fallback_route, batched_route):
+            assert abs(lat - expected_lat) < 1e-9
+            assert abs((long - expected_long + 180) % 360 - 180) < 1e-9
+
+def test_waypoints_along_same_start_and_end():
+    assert waypoints_along([((40.0, -74.0), [40.0, -74.0])], [5]) == [[(40.0, -74.0)]]
+
+# Test that bulk generation matches generating each route separately
+def test_waypoints_bulk_matches_single():
+    codes = [("JFK", "LAX"), ("OKC", "DFW"), ("JFK", "JFK"), ("SEA", "MIA")]
+    flight_paths = [FlightPath(AirportData.get_airport(a), AirportData.get_airport(b)) for a, b in codes]
+    routes = [(path.departure_coords, path.destination_coords) for path in flight_paths]
+
+    assert FlightPath.get_waypoints_by_num_bulk(routes, 7) == [path.get_waypoints_by_num(7) for path in flight_paths]
+    assert FlightPath.get_waypoints_by_gap_bulk(routes, 40) == [path.get_waypoints_by_gap(40) for path in flight_paths]
+    assert FlightPath.get_waypoints_by_num_bulk(routes, 7)[2] == [flight_paths[2].departure_coords]
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from benchmarks.synthetic import make_page
+from fake_notam_api import APIProfile, FakeNotamAPIServer, RecordedNotams
+from notam_fetcher import FetcherMetrics, MemoryNotamCache, NotamFetcher, RateLimiter
+from notam_fetcher.metrics import Counter, Histogram
+
+ITEMS = make_page(3000)["items"]
+
+
+def test_counter():
+    counter = Counter("requests_total", "Requests.", labels=("status",))
+    counter.inc(status="200")
+    counter.inc(2, status="429")
+    assert (counter.value(), counter.value(status="200"), counter.value(status="500")) == (3, 1, 0)
+    assert counter.exposition() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{status="200"} 1',
+        'requests_total{status="429"} 2',
+    ]
+    with pytest.raises(ValueError):
+        counter.inc(-1, status="200")
+    with pytest.raises(ValueError):
+        counter.inc()
+
+    assert Counter("retries_total", "Retries.").exposition()[-1] == "retries_total 0"
+
+
+def test_histogram():
+    histogram = Histogram("latency_seconds", "Latency.", (0.1, 1, 10))
+    assert histogram.quantile(0.5) == 0
+    for value in (0.05, 0.5, 0.5, 0.5, 20):
+        histogram.observe(value)
+    assert (histogram.count, histogram.sum, histogram.max) == (5, 21.55, 20)
+    assert 0.1 < histogram.quantile(0.5) < 1
+    assert histogram.quantile(1) == 20
+    assert histogram.exposition()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 4',
+        'latency_seconds_bucket{le="10"} 4',
+        'latency_seconds_bucket{le="+Inf"} 5',
+        "latency_seconds_sum 21.55",
+        "latency_seconds_count 5",
+    ]
+
+
+def test_fetcher_metrics():
+    server = FakeNotamAPIServer(RecordedNotams(ITEMS), APIProfile(throttle_rate=0.3), seed=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        metrics = FetcherMetrics()
+        notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", page_size=100, cache=MemoryNotamCache(),
+                                     rate_limiter=RateLimiter(1000, 1), api_url=server.url, metrics=metrics)
+        notam_fetcher.MAX_BACKOFF_TIME = 0
+        waypoints = [(38, -97), (40, -100), (35, -90)]
+        notam_fetcher.fetch_notams_by_latlong_list(waypoints, 100)
+        notam_fetcher.cache.put("latlong:30.0000:-90.0000:100", [])
+        notam_fetcher.fetch_notams_by_latlong(30, -90, 100)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert metrics.requests.value() == server.stats.requests
+    assert metrics.rate_limited.value() == metrics.requests.value(status="429") == server.stats.throttled > 0
+    assert metrics.retries.value() > 0
+    assert metrics.request_seconds.count == server.stats.requests
+    # bytes_served only counts success responses
+    assert metrics.response_bytes.count == server.stats.requests
+    assert metrics.response_bytes.sum > server.stats.bytes_served
+    assert metrics.queries.value(source="api") == metrics.pages_per_query.count == 3
+    assert metrics.queries.value(source="cache") == 1
+    assert metrics.items_per_page.count == metrics.requests.value(status="200")
+    assert metrics.pages_per_query.sum == metrics.items_per_page.count
+
+    exposition = metrics.exposition()
+    assert f'notam_fetcher_requests_total{{status="429"}} {server.stats.throttled}' in exposition
+    assert "# TYPE notam_fetcher_request_seconds histogram" in exposition
+    assert len(metrics.summary()) == 3
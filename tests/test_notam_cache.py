@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+import json
+import time
+
+import pytest
+from pytest import MonkeyPatch
+import requests
+
+from notam_fetcher.api_schema import Classification, CoreNOTAMData, ICAOTranslation, Notam, NotamEvent, NotamType
+from notam_fetcher.cache import MemoryNotamCache, NotamCache, SQLiteNotamCache
+from notam_fetcher.notam_fetcher import NotamAirportCodeRequest, NotamFetcher, NotamLatLongRequest
+
+
+def make_core_notam(notam_id: str, last_updated: datetime, effective_end: datetime | None = None) -> CoreNOTAMData:
+    now = datetime.now(timezone.utc)
+    return CoreNOTAMData(
+        notam_event=NotamEvent(scenario=6000),
+        notam=Notam(
+            id=notam_id,
+            number="A0280/13",
+            type=NotamType.N,
+            location="FAOR",
+            text="EXAMPLE NOTAM TEXT",
+            classification=Classification.INTL,
+            account_id="FAORYNYX",
+            issued=last_updated,
+            effective_start=now - timedelta(hours=1),
+            effective_end=effective_end or now + timedelta(days=30),
+            last_updated=last_updated,
+        ),
+        notam_translation=[ICAOTranslation(type="ICAO", formatted_text="Mock Notam Translation Text")],
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request: pytest.FixtureRequest, tmp_path: Any):
+    def _make_cache(ttl: float = 300, max_entries: int = 1024) -> NotamCache:
+        if request.param == "memory":
+            return MemoryNotamCache(ttl=ttl, max_entries=max_entries)
+        return SQLiteNotamCache(str(tmp_path / "cache.sqlite3"), ttl=ttl, max_entries=max_entries)
+    return _make_cache
+
+
+def test_request_cache_keys_are_normalized():
+    assert NotamLatLongRequest(35.000001, -105.0, 30).cache_key() == NotamLatLongRequest(35.0, -105.000002, 30.0).cache_key()
+    assert NotamLatLongRequest(35.0, -105.0, 30).cache_key() != NotamLatLongRequest(35.0, -105.0, 50).cache_key()
+    assert NotamAirportCodeRequest(" kjfk").cache_key() == NotamAirportCodeRequest("KJFK").cache_key()
+
+
+def test_cache_round_trip(make_cache: Any):
+    cache = make_cache()
+    notams = [make_core_notam("NOTAM_1", datetime(2025, 1, 1, tzinfo=timezone.utc))]
+    assert cache.get("key") is None
+    cache.put("key", notams)
+    assert cache.get("key") == notams
+
+
+def test_cache_ttl(make_cache: Any, monkeypatch: MonkeyPatch):
+    cache = make_cache(ttl=10)
+    cache.put("key", [make_core_notam("NOTAM_1", datetime(2025, 1, 1, tzinfo=timezone.utc))])
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_cache_expires_with_notam_effective_end(make_cache: Any, monkeypatch: MonkeyPatch):
+    cache = make_cache(ttl=3600)
+    effective_end = datetime.now(timezone.utc) + timedelta(seconds=60)
+    cache.put("key", [make_core_notam("NOTAM_1", datetime(2025, 1, 1, tzinfo=timezone.utc), effective_end)])
+    assert cache.get("key") is not None
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get("key") is None
+
+
+def test_cache_lru_eviction(make_cache: Any, monkeypatch: MonkeyPatch):
+    cache = make_cache(max_entries=2)
+    clock = [time.time()]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    last_updated = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    for key in ["a", "b"]:
+        cache.put(key, [make_core_notam(f"NOTAM_{key}", last_updated)])
+        clock[0] += 1
+    cache.get("a")
+    clock[0] += 1
+    cache.put("c", [make_core_notam("NOTAM_c", last_updated)])
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_cache_invalidates_entries_with_outdated_notams(make_cache: Any):
+    cache = make_cache()
+    old = make_core_notam("NOTAM_1", datetime(2025, 1, 1, tzinfo=timezone.utc))
+    new = make_core_notam("NOTAM_1", datetime(2025, 1, 2, tzinfo=timezone.utc))
+
+    cache.put("a", [old, make_core_notam("NOTAM_2", datetime(2025, 1, 1, tzinfo=timezone.utc))])
+    cache.put("b", [old])
+    cache.put("c", [new])
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == [new]
+
+
+def test_cache_persists_between_instances(tmp_path: Any):
+    path = str(tmp_path / "cache.sqlite3")
+    notams = [make_core_notam("NOTAM_1", datetime(2025, 1, 1, tzinfo=timezone.utc))]
+    SQLiteNotamCache(path).put("key", notams)
+    assert SQLiteNotamCache(path).get("key") == notams
+
+
+def test_fetcher_serves_from_cache(monkeypatch: MonkeyPatch):
+    calls = 0
+    def return_empty(*args: Any, **kwargs: Any):
+        nonlocal calls
+        calls += 1
+        class Response:
+            status_code = 200
+            @property
+            def content(self) -> bytes:
+                return json.dumps(self.json()).encode()
+            def json(self) -> dict[str, Any]:
+                return {"pageSize": 1000, "pageNum": 1, "totalCount": 0, "totalPages": 0, "items": []}
+        return Response()
+    monkeypatch.setattr(requests, "get", return_empty)
+
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", cache=MemoryNotamCache())
+    assert notam_fetcher.fetch_notams_by_latlong(35, -105, 30) == []
+    assert notam_fetcher.fetch_notams_by_latlong(35, -105, 30) == []
+    assert calls == 1
+
+    notam_fetcher.fetch_notams_by_airport_code("KDEN")
+    assert calls == 2
@@ -1,10 +1,16 @@
 from datetime import datetime, timezone
+import json
+import threading
+import time
 from pytest import MonkeyPatch
 import pytest
 import requests
-from notam_fetcher.exceptions import NotamFetcherUnauthenticatedError, NotamFetcherUnexpectedError, NotamFetcherValidationError, NotamFetcherRateLimitError
+from notam_fetcher.exceptions import NotamFetcherUnauthenticatedError, NotamFetcherUnexpectedError, NotamFetcherValidationError, NotamFetcherRateLimitError, NotamFetcherPageError, NotamFetcherTimeoutReached
 from notam_fetcher.api_schema import Classification, CoreNOTAMData, ICAOTranslation, Notam, NotamEvent, NotamType
-from notam_fetcher.notam_fetcher import NotamFetcher
+from notam_fetcher.cache import MemoryNotamCache
+from notam_fetcher.notam_fetcher import NotamFetcher, _parse_response, _validate_response
+from notam_fetcher.projection import NotamSummary, ProjectedNOTAMData
+from notam_fetcher.sync_store import MemoryNotamSyncStore
 
 from typing import Any, Optional, Dict
 
@@ -29,6 +35,10 @@ class MockResponse:
     def json(self) -> Dict[str, Any]:
         return self.response
 
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self.response).encode()
+
 
 @pytest.fixture
 def mock_api_returns_response_error(monkeypatch: MonkeyPatch):
@@ -200,6 +210,40 @@ def test_fetch_notams_latlong_list(monkeypatch: pytest.MonkeyPatch):
     assert(len(set(unique_notam_ids)) == 10)
 
 
+def test_iter_notams_by_latlong_list(monkeypatch: pytest.MonkeyPatch):
+    """Test that each waypoint's NOTAMs are yielded once, without NOTAMs yielded before"""
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET")
+
+    def mock_fetch_items_by_latlong(self: NotamFetcher, lat: float, long: float, radius: float = 100.0):
+        return [
+            CoreNOTAMData(
+                notam_event=NotamEvent(scenario=6000),
+                notam=Notam(
+                    id=f"NOTAM_{i}_{lat}",
+                    number="A0280/13",
+                    type=NotamType.N,
+                    location="FAOR",
+                    text="EXAMPLE NOTAM TEXT",
+                    classification=Classification.INTL,
+                    account_id="FAORYNYX",
+                    issued=datetime(2025, 1, 24, 16, 0, tzinfo=timezone.utc),
+                    effective_start=datetime(2025, 1, 24, 15, 56, tzinfo=timezone.utc),
+                    effective_end=datetime(2025, 4, 24, 23, 0, tzinfo=timezone.utc),
+                    last_updated=datetime(2025, 1, 24, 16, 0, tzinfo=timezone.utc),
+                ),
+                notam_translation=[],
+            )
+            for i in range(3)
+        ]
+
+    monkeypatch.setattr(NotamFetcher, "fetch_notams_by_latlong", mock_fetch_items_by_latlong)
+    batches = list(notam_fetcher.iter_notams_by_latlong_list([(0.0, 0.0), (0.0, 0.0), (10.0, 10.0)]))
+    assert len(batches) == 3
+    assert sorted(len(batch) for batch in batches) == [0, 3, 3]
+    all_ids = [core_notam.notam.id for batch in batches for core_notam in batch]
+    assert len(all_ids) == len(set(all_ids)) == 6
+
+
 
 def test_fetch_notams_by_latlong_invalid_json(mock_api_returns_invalid_json: None):
     """Test that an invalid schema from the API raises validation error"""
@@ -214,6 +258,20 @@ def test_fetch_notams_by_latlong_invalid_json(mock_api_returns_invalid_json: Non
     )
 
 
+def test_parse_response_matches_validate_response(mock_valid_response: None):
+    """Test that validating raw bytes gives the same result as validating decoded JSON"""
+    content = requests.get("URL").content
+    assert _parse_response(content) == _validate_response(json.loads(content))
+
+
+def test_parse_response_not_json():
+    """Test that a body that is not JSON raises NotamFetcherUnexpectedError"""
+    with pytest.raises(NotamFetcherUnexpectedError):
+        _parse_response(b"<html>Service Unavailable</html>")
+    with pytest.raises(NotamFetcherUnexpectedError):
+        _parse_response(b'{"items": [')
+
+
 def test_fetch_notams_by_latlong_unexpected_response(mock_unexpected_response: None):
     """Test that fetch_notams_by_latlong filters a non-notam object in the NOTAMs API response"""
     notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET")
@@ -377,4 +435,166 @@ def test_fetch_notams_by_latlong_rate_limit(mock_rate_limit_response: None):
     with pytest.raises(NotamFetcherRateLimitError):
         notam_fetcher.fetch_notams_by_latlong(32.0, -97.0, 50.0)
     
-    
\ No newline at end of file
+    
+
+def make_page_response(page_num: int, total_pages: int) -> MockResponse:
+    """Returns a success response with one NOTAM whose id is NOTAM_{page_num}"""
+    return MockResponse({
+        "pageSize": 1,
+        "pageNum": page_num,
+        "totalCount": total_pages,
+        "totalPages": total_pages,
+        "items": [{
+            "type": "Feature",
+            "properties": {
+                "coreNOTAMData": {
+                    "notamEvent": {"scenario": "6000"},
+                    "notam": {
+                        "id": f"NOTAM_{page_num}",
+                        "number": "A2157/24",
+                        "type": "N",
+                        "issued": "2024-10-02T19:54:00.000Z",
+                        "location": "ZJX",
+                        "effectiveStart": "2024-10-02T19:50:00.000Z",
+                        "effectiveEnd": "2024-10-14T22:00:00.000Z",
+                        "text": "EXAMPLE NOTAM TEXT",
+                        "classification": "INTL",
+                        "accountId": "KZJX",
+                        "lastUpdated": "2024-10-02T19:54:00.000Z",
+                    },
+                    "notamTranslation": [],
+                }
+            },
+            "geometry": {"type": "GeometryCollection"},
+        }],
+    })
+
+
+def test_fetch_all_pages_concurrently_in_order(monkeypatch: MonkeyPatch):
+    """Test that pages after the first are fetched concurrently and returned in page order"""
+    total_pages = 6
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def return_page(*args: Any, **kwargs: Any) -> MockResponse:
+        nonlocal in_flight, max_in_flight
+        page_num = int(kwargs["params"]["pageNum"])
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # earlier pages take longer so they finish out of order
+        time.sleep(0.01 * (total_pages - page_num))
+        with lock:
+            in_flight -= 1
+        return make_page_response(page_num, total_pages)
+
+    monkeypatch.setattr(requests, "get", return_page)
+
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", page_size=1)
+    notams = notam_fetcher.fetch_notams_by_airport_code("KJFK")
+    assert [notam.notam.id for notam in notams] == [f"NOTAM_{i}" for i in range(1, total_pages + 1)]
+    assert max_in_flight > 1
+
+
+def test_fetch_all_pages_partial_result(monkeypatch: MonkeyPatch):
+    """Test that a failed page raises NotamFetcherPageError holding the pages before it"""
+
+    def return_page(*args: Any, **kwargs: Any) -> MockResponse:
+        page_num = int(kwargs["params"]["pageNum"])
+        if page_num == 3:
+            return MockResponse({"error": "Response returned an error"})
+        return make_page_response(page_num, 5)
+
+    monkeypatch.setattr(requests, "get", return_page)
+
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", page_size=1)
+    with pytest.raises(NotamFetcherPageError) as e:
+        notam_fetcher.fetch_notams_by_latlong(32, 32, 10)
+    assert e.value.failed_page == 3
+    assert [notam.notam.id for notam in e.value.notams] == ["NOTAM_1", "NOTAM_2"]
+    assert isinstance(e.value.__cause__, NotamFetcherUnexpectedError)
+
+
+def test_projection_returns_summaries(mock_valid_response: None):
+    """Test that projection mode returns NOTAM summaries whose full models match a normal fetch"""
+    projected = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", projection=True).fetch_notams_by_airport_code("KJFK")
+    full = NotamFetcher("CLIENT_ID", "CLIENT_SECRET").fetch_notams_by_airport_code("KJFK")
+
+    assert len(projected) == 1
+    assert isinstance(projected[0], ProjectedNOTAMData)
+    assert isinstance(projected[0].notam, NotamSummary)
+    assert projected[0].notam.id == full[0].notam.id
+    assert projected[0].notam.selection_code == full[0].notam.selection_code
+    assert projected[0].full() == full[0]
+
+
+def test_projection_full_invalid_item():
+    """Test that full() raises NotamFetcherValidationError when fields outside the summary are invalid"""
+    content = make_page_response(1, 1).content.replace(b'"notamTranslation": []', b'"notamTranslation": "INVALID"')
+    page = _parse_response(content, projection=True)
+    assert page.notams[0].notam.id == "NOTAM_1"
+    with pytest.raises(NotamFetcherValidationError):
+        page.notams[0].full()
+
+
+def test_projection_not_combined_with_stores():
+    with pytest.raises(ValueError):
+        NotamFetcher("CLIENT_ID", "CLIENT_SECRET", cache=MemoryNotamCache(), projection=True)
+    with pytest.raises(ValueError):
+        NotamFetcher("CLIENT_ID", "CLIENT_SECRET", sync_store=MemoryNotamSyncStore(), projection=True)
+
+
+def test_fetch_deadline_partial_result(monkeypatch: MonkeyPatch):
+    """Test that a hung request neither blocks past the timeout nor loses the NOTAMs of the other waypoints"""
+    release = threading.Event()
+    timeouts: list[tuple[float, float]] = []
+
+    def return_page(*args: Any, **kwargs: Any) -> MockResponse:
+        timeouts.append(kwargs["timeout"])
+        if kwargs["params"].get("locationLatitude") == "1.0":
+            release.wait(5) # a socket that never answers, ignoring the timeout
+        return make_page_response(1, 1)
+
+    monkeypatch.setattr(requests, "get", return_page)
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", timeout=0.5)
+    try:
+        start = time.monotonic()
+        result = notam_fetcher.fetch_notams_by_latlong_list_partial([(0.0, 0.0), (1.0, 1.0), (2.0, 2.0)], 10)
+        assert time.monotonic() - start < 1.5
+        assert [notam.notam.id for notam in result.notams] == ["NOTAM_1"]
+        assert result.uncovered_waypoints == [(1.0, 1.0)] and not result.complete
+        assert all(0 < connect <= 0.5 and 0 < read <= 0.5 for connect, read in timeouts)
+
+        with pytest.raises(NotamFetcherTimeoutReached) as e:
+            notam_fetcher.fetch_notams_by_latlong_list([(0.0, 0.0), (1.0, 1.0)], 10)
+        assert e.value.uncovered_waypoints == [(1.0, 1.0)] and len(e.value.notams) == 1
+
+        batches = notam_fetcher.iter_notams_by_latlong_list([(1.0, 1.0), (2.0, 2.0)], 10)
+        assert [notam.notam.id for notam in next(batches)] == ["NOTAM_1"]
+        with pytest.raises(NotamFetcherTimeoutReached) as e:
+            next(batches)
+        assert e.value.uncovered_waypoints == [(1.0, 1.0)]
+    finally:
+        release.set()
+
+    timeouts.clear()
+    notam_fetcher.fetch_notams_by_latlong(0.0, 0.0, 10)
+    assert timeouts == [(NotamFetcher.CONNECT_TIMEOUT, NotamFetcher.READ_TIMEOUT)]
+
+
+def test_fetch_deadline_read_timeout(monkeypatch: MonkeyPatch):
+    """Test that a request timing out at the deadline raises NotamFetcherTimeoutReached, not a request error"""
+
+    def time_out(*args: Any, **kwargs: Any) -> MockResponse:
+        time.sleep(kwargs["timeout"][1])
+        raise requests.exceptions.ReadTimeout()
+
+    monkeypatch.setattr(requests, "get", time_out)
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", timeout=0.2)
+    result = notam_fetcher.fetch_notams_by_latlong_list_partial([(0.0, 0.0)], 10)
+    assert result.notams == [] and result.uncovered_waypoints == [(0.0, 0.0)]
+    assert notam_fetcher.fetch_notams_by_circles_partial([(0.0, 0.0, 10)]) == [None]
+    with pytest.raises(NotamFetcherTimeoutReached) as e:
+        notam_fetcher.fetch_notams_by_circles([(0.0, 0.0, 10)])
+    assert e.value.uncovered_waypoints == [(0.0, 0.0)]
@@ -0,0 +1,196 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from geographiclib.geodesic import Geodesic
+
+from airport_data.airport_data import AirportData
+from flight_path.flight_path import FlightPath
+from notam_fetcher import MemoryNotamCache, MemoryNotamSyncStore, NotamFetcher
+from notam_fetcher.api_schema import Classification, CoreNOTAMData, Notam, NotamEvent, NotamType
+from notam_fetcher.exceptions import NotamFetcherRateLimitError
+from notam_fetcher.notam_fetcher import NotamLatLongRequest
+from notam_prefetcher import GridNotamStore, NotamGrid, NotamPrefetcher
+from notam_spatial_index.geometry import corridor_bounding_boxes
+
+METERS_PER_NM = 1852
+
+
+def make_core_notam(notam_id: str, lat: float, long: float, last_updated: datetime | None = None) -> CoreNOTAMData:
+    now = datetime.now(timezone.utc)
+    lat_hemi, long_hemi = ("N" if lat >= 0 else "S"), ("E" if long >= 0 else "W")
+    lat, long = abs(lat), abs(long)
+    coordinates = f"{int(lat):02d}{round(lat % 1 * 60):02d}{lat_hemi}{int(long):03d}{round(long % 1 * 60):02d}{long_hemi}"
+    return CoreNOTAMData(
+        notam_event=NotamEvent(scenario=6000),
+        notam=Notam(
+            id=notam_id,
+            number="A0001/25",
+            type=NotamType.N,
+            location="KZNY",
+            text="EXAMPLE NOTAM TEXT",
+            classification=Classification.INTL,
+            account_id="KZNY",
+            issued=now,
+            effective_start=now,
+            effective_end=now + timedelta(days=1),
+            last_updated=last_updated or now,
+            coordinates=coordinates,
+            radius="001",
+        ),
+        notam_translation=[],
+    )
+
+
+@pytest.fixture
+def fake_api(monkeypatch: pytest.MonkeyPatch):
+    '''
+    Answers each query with one NOTAM at its center, stored in the fetcher's sync store like a real fetch.
+    The NOTAM's last_updated is looked up in versions by query center, so tests can make cells change.
+    '''
+    calls: list[tuple[float, float, float]] = []
+    versions: dict[tuple[float, float], datetime] = {}
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def mock_fetch_notams_by_latlong(self: NotamFetcher, lat: float, long: float, radius: float = 100.0):
+        calls.append((lat, long, radius))
+        notams = [make_core_notam(f"{lat:.3f},{long:.3f}", lat, long, versions.get((lat, long), created))]
+        assert self.sync_store is not None
+        self.sync_store.put(NotamLatLongRequest(lat, long, radius).cache_key(), notams, datetime.now(timezone.utc), full=True)
+        return notams
+
+    monkeypatch.setattr(NotamFetcher, "fetch_notams_by_latlong", mock_fetch_notams_by_latlong)
+    return calls, versions
+
+
+def test_grid_covers_conus():
+    grid = NotamGrid()
+    assert len(grid) > 0
+    for cell in grid.cells:
+        assert cell.radius <= 100
+        # Every corner of the cell is within the query radius
+        for lat in (cell.min_lat, cell.max_lat):
+            for long in (cell.min_long, cell.max_long):
+                distance = Geodesic.WGS84.Inverse(cell.center[0], cell.center[1], lat, long)["s12"] / METERS_PER_NM
+                assert distance <= cell.radius
+
+    for lat, long in [(24.5, -125.0), (49.5, -66.5), (40.64, -73.78), (33.94, -118.41), (37.0, -95.0)]:
+        cell = grid.cell_at(lat, long)
+        assert cell is not None
+        assert cell.min_lat <= lat <= cell.max_lat and cell.min_long <= long <= cell.max_long
+    assert grid.cell_at(51.47, -0.45) is None
+
+
+def test_grid_validation():
+    with pytest.raises(ValueError):
+        NotamGrid(cell_size=0)
+    with pytest.raises(ValueError):
+        NotamGrid(cell_size=200)
+    with pytest.raises(ValueError):
+        NotamGrid(bounds=(40, -70, 30, -80))
+
+
+def test_cells_for_corridor_matches_brute_force():
+    grid = NotamGrid()
+    for departure, destination in [("JFK", "LAX"), ("JFK", "ORD"), ("SEA", "MIA"), ("BOS", "BOS")]:
+        flight_path = FlightPath(AirportData.get_airport(departure), AirportData.get_airport(destination))
+        waypoints = flight_path.get_waypoints_by_gap(20)
+        boxes = list(corridor_bounding_boxes(waypoints, 25))
+        expected = [
+            cell for cell in grid.cells
+            if any(box.min_lat <= cell.max_lat and box.max_lat >= cell.min_lat
+                   and box.min_long <= cell.max_long and box.max_long >= cell.min_long for box in boxes)
+        ]
+        assert set(grid.cells_for_corridor(waypoints, 50)) == set(expected)
+
+    with pytest.raises(ValueError):
+        grid.cells_for_corridor([], 50)
+
+
+def test_prefetcher_requires_sync_store():
+    with pytest.raises(ValueError):
+        NotamPrefetcher(NotamFetcher("CLIENT_ID", "CLIENT_SECRET"))
+    with pytest.raises(ValueError):
+        NotamPrefetcher(NotamFetcher("CLIENT_ID", "CLIENT_SECRET", cache=MemoryNotamCache(),
+                                     sync_store=MemoryNotamSyncStore()))
+
+
+def test_busy_airport_cells_first(fake_api):
+    calls, _ = fake_api
+    grid = NotamGrid()
+    jfk, lax = AirportData.get_airport("KJFK"), AirportData.get_airport("KLAX")
+    prefetcher = NotamPrefetcher(NotamFetcher("CLIENT_ID", "CLIENT_SECRET", sync_store=MemoryNotamSyncStore()), grid,
+                                 busy_airports=[jfk, lax, AirportData.get_airport("KLGA")])
+
+    first, second = prefetcher.refresh_next(), prefetcher.refresh_next()
+    # Both New York airports share a cell, which outranks the cell of Los Angeles
+    assert first == grid.cell_at(*jfk.coordinates)
+    assert second == grid.cell_at(*lax.coordinates)
+    assert calls == [(first.center[0], first.center[1], first.radius), (second.center[0], second.center[1], second.radius)]
+    assert prefetcher.interval(first) < prefetcher.interval(second) < prefetcher.interval(grid.cells[0])
+    assert prefetcher.interval(grid.cells[0]) == prefetcher.base_interval
+
+
+def test_churn_shortens_interval(fake_api):
+    _, versions = fake_api
+    grid = NotamGrid(bounds=(30, -100, 33, -97))
+    prefetcher = NotamPrefetcher(NotamFetcher("CLIENT_ID", "CLIENT_SECRET", sync_store=MemoryNotamSyncStore()), grid,
+                                 base_interval=3600, min_interval=60)
+
+    for _ in range(len(grid)):
+        prefetcher.refresh_next()
+    assert all(prefetcher.interval(cell) == 3600 for cell in grid.cells)
+
+    changing = grid.cells[0]
+    versions[changing.center] = datetime(2025, 2, 1, tzinfo=timezone.utc)
+    # Only the changing cell is refreshed, the rest are not due
+    prefetcher._queue = [(0, 0, 0, changing)]
+    assert prefetcher.refresh_next() == changing
+    assert prefetcher.interval(changing) < 3600
+    assert all(prefetcher.interval(cell) == 3600 for cell in grid.cells[1:])
+
+
+def test_rate_limited_cell_retried(monkeypatch: pytest.MonkeyPatch):
+    def mock_fetch_notams_by_latlong(self: NotamFetcher, lat: float, long: float, radius: float = 100.0):
+        raise NotamFetcherRateLimitError()
+
+    monkeypatch.setattr(NotamFetcher, "fetch_notams_by_latlong", mock_fetch_notams_by_latlong)
+    grid = NotamGrid(bounds=(30, -100, 31, -99))
+    prefetcher = NotamPrefetcher(NotamFetcher("CLIENT_ID", "CLIENT_SECRET", sync_store=MemoryNotamSyncStore()), grid,
+                                 min_interval=300)
+    cell = prefetcher.refresh_next()
+    assert 0 < prefetcher.next_due() <= 300 / 5
+    assert prefetcher._queue[0][3] == cell
+
+
+def test_corridor_answered_locally(fake_api):
+    calls, _ = fake_api
+    sync_store = MemoryNotamSyncStore()
+    grid = NotamGrid()
+    store = GridNotamStore(grid, sync_store, max_staleness=600)
+    flight_path = FlightPath(AirportData.get_airport("JFK"), AirportData.get_airport("BOS"))
+    waypoints = flight_path.get_waypoints_by_gap(20)
+
+    local = store.notams_for_corridor(waypoints, 50)
+    assert not local.complete
+    assert set(local.missing_cells) == set(grid.cells_for_corridor(waypoints, 50))
+
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", sync_store=sync_store)
+    for cell in local.missing_cells:
+        notam_fetcher.fetch_notams_by_latlong(cell.center[0], cell.center[1], cell.radius)
+    request_count = len(calls)
+
+    local = store.notams_for_corridor(waypoints, 50)
+    assert local.complete
+    assert len(calls) == request_count
+    # Only the cell centers within 25 nm of the route are kept
+    for core in local.notams:
+        lat, long = map(float, core.notam.id.split(","))
+        assert min(Geodesic.WGS84.Inverse(lat, long, *waypoint)["s12"] for waypoint in waypoints) / METERS_PER_NM < 40
+
+    # Cells go stale
+    later = datetime.now(timezone.utc) + timedelta(seconds=601)
+    assert not store.notams_for_corridor(waypoints, 50, later).complete
+
+    # Corridors leaving the grid are never complete
+    small_store = GridNotamStore(NotamGrid(bounds=(40, -75, 42, -70)), sync_store)
+    assert small_store.notams_for_corridor(waypoints, 50).outside_grid
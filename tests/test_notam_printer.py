@@ -1,7 +1,9 @@
+from io import StringIO
 import sys
 import os
 import pytest
 from pytest import CaptureFixture
+from rich.console import Console
 from typing import List
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from notam_printer.notam_printer import Notam, NotamPrinter
@@ -129,3 +131,12 @@ def test_print_notams(sample_notams: List[Notam], capsys: CaptureFixture[str]):
     assert "ID: 2" in printed_output, "Number: A151/24" in printed_output
     assert "ID: 3" in printed_output, "Number: A149/24" in printed_output
 
+
+def test_print_notams_live(sample_notams: List[Notam]):
+    output = StringIO()
+    printer = NotamPrinter(print_all_fields=True)
+    printer.print_notams_live([sample_notams[:1], sample_notams[1:]], console=Console(file=output, width=120, force_terminal=True))
+
+    printed_output = output.getvalue()
+    assert "ID: 1" in printed_output
+    assert "ID: 3" in printed_output
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+import random
+
+import pytest
+from geographiclib.geodesic import Geodesic
+
+from notam_fetcher.api_schema import Classification, CoreNOTAMData, Notam, NotamEvent, NotamType
+from notam_spatial_index import Circle, NotamSpatialIndex, notam_shapes, parse_notam_coordinates
+from notam_spatial_index.geometry import point_distance
+
+
+def make_core_notam(notam_id: str, coordinates: str | None = None, radius: str | None = None) -> CoreNOTAMData:
+    now = datetime.now(timezone.utc)
+    return CoreNOTAMData(
+        notam_event=NotamEvent(scenario=6000),
+        notam=Notam(
+            id=notam_id,
+            number="A0001/25",
+            type=NotamType.N,
+            location="KZNY",
+            text="EXAMPLE NOTAM TEXT",
+            classification=Classification.INTL,
+            account_id="KZNY",
+            issued=now,
+            effective_start=now,
+            effective_end=now + timedelta(days=1),
+            last_updated=now,
+            coordinates=coordinates,
+            radius=radius,
+        ),
+        notam_translation=[],
+    )
+
+
+def ids(notams: list[CoreNOTAMData]) -> list[str]:
+    return [notam.notam.id for notam in notams]
+
+
+def test_parse_notam_coordinates():
+    assert parse_notam_coordinates("4038N07346W") == pytest.approx((40 + 38 / 60, -(73 + 46 / 60)))
+    assert parse_notam_coordinates("335630S1511038E") == pytest.approx((-(33 + 56 / 60 + 30 / 3600), 151 + 10 / 60 + 38 / 3600))
+    assert parse_notam_coordinates("UNKNOWN") is None
+
+
+def test_notam_shapes():
+    notam = make_core_notam("1", "4038N07346W", "005").notam
+    assert notam_shapes(notam) == [Circle(pytest.approx((40 + 38 / 60, -(73 + 46 / 60))), 5.0)]
+    assert notam_shapes(make_core_notam("2").notam) == []
+
+
+def test_notam_without_radius_is_not_filtered():
+    index = NotamSpatialIndex([
+        make_core_notam("NORADIUS", "4038N07346W"),
+        make_core_notam("BADRADIUS", "4038N07346W", "UNKNOWN"),
+        make_core_notam("JFK", "4038N07346W", "005"),
+    ])
+    assert ids(index.query_corridor([(34.0, -118.4), (37.6, -122.4)], 10)) == ["NORADIUS", "BADRADIUS"]
+    assert ids(index.query_point(40.7, -73.8, 5)) == ["NORADIUS", "BADRADIUS", "JFK"]
+
+
+def test_query_point_and_bbox():
+    index = NotamSpatialIndex([
+        make_core_notam("JFK", "4038N07346W", "005"),
+        make_core_notam("LAX", "3356N11824W", "010"),
+        make_core_notam("UNLOCATED"),
+    ])
+    assert ids(index.query_point(40.7, -73.9, 5)) == ["JFK", "UNLOCATED"]
+    assert ids(index.query_point(34.0, -118.4, 1)) == ["LAX", "UNLOCATED"]
+    assert ids(index.query_bbox(30, -125, 45, -70)) == ["JFK", "LAX", "UNLOCATED"]
+    assert ids(index.query_bbox(0, -10, 10, 10)) == ["UNLOCATED"]
+
+
+def test_query_antimeridian():
+    index = NotamSpatialIndex([make_core_notam("DATELINE", "1000N17959W", "030")])
+    assert ids(index.query_point(10, 179.9, 10)) == ["DATELINE"]
+    assert ids(index.query_bbox(9, 179, 11, -179)) == ["DATELINE"]
+    assert ids(index.query_corridor([(10, 178), (10, -178)], 10)) == ["DATELINE"]
+
+
+# Test that corridor queries agree with testing every NOTAM against the route
+def test_query_corridor_matches_brute_force():
+    rng = random.Random(10)
+    line = Geodesic.WGS84.InverseLine(40.64, -73.78, 33.94, -118.41)
+    waypoints = [(line.Position(line.s13 * i / 100)["lat2"], line.Position(line.s13 * i / 100)["lon2"]) for i in range(101)]
+
+    notams = []
+    for i in range(500):
+        lat, long = rng.uniform(30, 45), rng.uniform(-120, -70)
+        coordinates = f"{int(lat):02d}{int(lat % 1 * 60):02d}N{int(-long):03d}{int(-long % 1 * 60):02d}W"
+        notams.append(make_core_notam(str(i), coordinates, f"{rng.randint(0, 30):03d}"))
+    index = NotamSpatialIndex(notams, cell_size=0.5)
+
+    corridor_width = 50
+    expected = []
+    for notam in notams:
+        center = notam_shapes(notam.notam)[0]
+        distance = min(point_distance(center, lat, long) for lat, long in waypoints)
+        expected.append((notam.notam.id, distance))
+
+    result = set(ids(index.query_corridor(waypoints, corridor_width)))
+    for notam_id, distance in expected:
+        # waypoints are ~22 nm apart so distances to the waypoints overestimate distances to the route by up to ~2 nm
+        if distance <= corridor_width / 2:
+            assert notam_id in result
+        elif distance > corridor_width / 2 + 2:
+            assert notam_id not in result
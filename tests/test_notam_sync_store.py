@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+import json
+
+import pytest
+from pytest import MonkeyPatch
+import requests
+
+from notam_fetcher.api_schema import Classification, CoreNOTAMData, ICAOTranslation, Notam, NotamEvent, NotamType
+from notam_fetcher.notam_fetcher import NotamFetcher, NotamLatLongRequest
+from notam_fetcher.sync_store import (
+    MemoryNotamSyncStore,
+    NotamSyncStore,
+    SQLiteNotamSyncStore,
+    apply_delta,
+    referenced_notam_number,
+)
+
+NOW = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def make_core_notam(notam_id: str, number: str, last_updated: datetime, notam_type: NotamType = NotamType.N,
+                    text: str = "EXAMPLE NOTAM TEXT", effective_end: datetime | None = None) -> CoreNOTAMData:
+    return CoreNOTAMData(
+        notam_event=NotamEvent(scenario=6000),
+        notam=Notam(
+            id=notam_id,
+            number=number,
+            type=notam_type,
+            location="FAOR",
+            text=text,
+            classification=Classification.INTL,
+            account_id="FAORYNYX",
+            issued=last_updated,
+            effective_start=last_updated,
+            effective_end=effective_end or datetime.now(timezone.utc) + timedelta(days=30),
+            last_updated=last_updated,
+        ),
+        notam_translation=[ICAOTranslation(type="ICAO", formatted_text=f"{number} NOTAM{notam_type.value} {text}")],
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request: pytest.FixtureRequest, tmp_path: Any):
+    def _make_store(max_age: float = 86400) -> NotamSyncStore:
+        if request.param == "memory":
+            return MemoryNotamSyncStore(max_age=max_age)
+        return SQLiteNotamSyncStore(str(tmp_path / "sync.sqlite3"), max_age=max_age)
+    return _make_store
+
+
+def test_last_updated_since_query_param():
+    request = NotamLatLongRequest(35, -105, 30)
+    assert "lastUpdatedDate" not in request.query_params()
+    request.last_updated_since = datetime(2025, 3, 1, 7, 30, tzinfo=timezone(timedelta(hours=-5)))
+    assert request.query_params()["lastUpdatedDate"] == "2025-03-01T12:30:00Z"
+
+
+def test_referenced_notam_number():
+    replacement = make_core_notam("2", "A0002/25", NOW, NotamType.R, text="A0002/25 NOTAMR A0001/25 RWY 03L CLSD")
+    assert referenced_notam_number(replacement) == "A0001/25"
+    assert referenced_notam_number(make_core_notam("1", "A0001/25", NOW)) is None
+
+
+def test_apply_delta_replacements_and_cancellations():
+    a = make_core_notam("1", "A0001/25", NOW - timedelta(days=2))
+    b = make_core_notam("2", "A0002/25", NOW - timedelta(days=2))
+    c = make_core_notam("3", "A0003/25", NOW - timedelta(days=2))
+    expired = make_core_notam("4", "A0004/25", NOW - timedelta(days=2), effective_end=NOW - timedelta(minutes=1))
+
+    replaces_a = make_core_notam("5", "A0005/25", NOW - timedelta(hours=1), NotamType.R, text="A0005/25 NOTAMR A0001/25")
+    cancels_b = make_core_notam("6", "A0006/25", NOW - timedelta(hours=1), NotamType.C, text="A0006/25 NOTAMC A0002/25")
+    updated_c = make_core_notam("3", "A0003/25", NOW - timedelta(hours=1), text="UPDATED")
+    new = make_core_notam("7", "A0007/25", NOW - timedelta(hours=1))
+
+    merged = apply_delta([a, b, c, expired], [new, updated_c, cancels_b, replaces_a], NOW)
+    assert [core.notam.id for core in merged] == ["3", "7", "6", "5"]
+    assert merged[0].notam.text == "UPDATED"
+
+    # an older version of a held NOTAM does not replace it
+    assert apply_delta([updated_c], [c], NOW) == [updated_c]
+
+
+def test_store_round_trip(make_store: Any):
+    store = make_store()
+    notams = [make_core_notam("1", "A0001/25", NOW - timedelta(days=1))]
+    assert store.get("key", NOW) is None
+
+    store.put("key", notams, NOW, full=True)
+    state = store.get("key", NOW + timedelta(hours=1))
+    assert state.notams == notams
+    assert state.last_synced == NOW
+    assert state.since == NOW - NotamSyncStore.SYNC_OVERLAP
+
+
+def test_store_forces_full_fetch_after_max_age(make_store: Any):
+    store = make_store(max_age=3600)
+    store.put("key", [], NOW, full=True)
+    store.put("key", [], NOW + timedelta(minutes=50), full=False)
+    assert store.get("key", NOW + timedelta(minutes=55)) is not None
+    # the delta does not extend the age of the last full fetch
+    assert store.get("key", NOW + timedelta(minutes=61)) is None
+
+
+def test_fetcher_requests_deltas_after_first_sync(monkeypatch: MonkeyPatch):
+    responses = [
+        [make_core_notam("1", "A0001/25", NOW - timedelta(days=2)), make_core_notam("2", "A0002/25", NOW - timedelta(days=2))],
+        [make_core_notam("3", "A0003/25", NOW, NotamType.C, text="A0003/25 NOTAMC A0001/25")],
+    ]
+    params_sent: list[dict[str, str]] = []
+
+    def mock_get(*args: Any, params: dict[str, str], **kwargs: Any):
+        params_sent.append(params)
+        notams = responses[len(params_sent) - 1]
+        class Response:
+            status_code = 200
+            @property
+            def content(self) -> bytes:
+                return json.dumps(self.json()).encode()
+            def json(self) -> dict[str, Any]:
+                return {
+                    "pageSize": 1000, "pageNum": 1, "totalCount": len(notams), "totalPages": 1,
+                    "items": [{
+                        "type": "Feature",
+                        "properties": {"coreNOTAMData": notam.model_dump(mode="json", by_alias=True)},
+                        "geometry": {"type": "GeometryCollection"},
+                    } for notam in notams],
+                }
+        return Response()
+    monkeypatch.setattr(requests, "get", mock_get)
+
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", sync_store=MemoryNotamSyncStore())
+    assert [core.notam.id for core in notam_fetcher.fetch_notams_by_latlong(35, -105, 30)] == ["1", "2"]
+    assert "lastUpdatedDate" not in params_sent[0]
+
+    assert [core.notam.id for core in notam_fetcher.fetch_notams_by_latlong(35, -105, 30)] == ["2", "3"]
+    assert "lastUpdatedDate" in params_sent[1]
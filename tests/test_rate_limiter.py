@@ -0,0 +1,90 @@
+from typing import Any
+import json
+import time
+
+import pytest
+from pytest import MonkeyPatch
+
+from notam_fetcher.async_notam_fetcher import AsyncNotamFetcher
+from notam_fetcher.notam_fetcher import NotamFetcher
+from notam_fetcher.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def fake_clock(monkeypatch: MonkeyPatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_limiter(request: pytest.FixtureRequest, tmp_path: Any):
+    def _make_limiter(max_requests: int, period: float) -> RateLimiter:
+        path = str(tmp_path / "limiter.sqlite3") if request.param == "sqlite" else None
+        return RateLimiter(max_requests, period, path=path)
+    return _make_limiter
+
+
+def test_reserve_paces_requests_over_rolling_window(make_limiter: Any, fake_clock: list[float]):
+    limiter = make_limiter(3, 60)
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+    # The window is full so the next requests wait for the earliest reservations to leave it
+    assert limiter.reserve() == 60
+    fake_clock[0] += 10
+    assert limiter.reserve() == 50
+    fake_clock[0] += 60
+    assert limiter.reserve() == 0
+
+
+def test_stats_report_queue_wait(make_limiter: Any, fake_clock: list[float]):
+    limiter = make_limiter(1, 10)
+    limiter.reserve()
+    limiter.reserve()
+    limiter.reserve()
+
+    stats = limiter.stats
+    assert stats.requests == 3
+    assert stats.total_wait == 30
+    assert stats.max_wait == 20
+    assert stats.average_wait == 10
+
+
+def test_sqlite_limiter_is_shared_between_instances(tmp_path: Any, fake_clock: list[float]):
+    path = str(tmp_path / "limiter.sqlite3")
+    first, second = RateLimiter(2, 60, path=path), RateLimiter(2, 60, path=path)
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert first.reserve() == 60
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        RateLimiter(0, 60)
+    with pytest.raises(ValueError):
+        RateLimiter(10, 0)
+
+
+def test_fetchers_share_the_process_limiter():
+    assert RateLimiter.shared() is RateLimiter.shared()
+    first, second = NotamFetcher("CLIENT_ID", "CLIENT_SECRET"), NotamFetcher("CLIENT_ID", "CLIENT_SECRET")
+    assert first.rate_limiter is second.rate_limiter is RateLimiter.shared()
+    assert AsyncNotamFetcher("CLIENT_ID", "CLIENT_SECRET").rate_limiter is RateLimiter.shared()
+
+
+def test_fetcher_acquires_before_each_request(monkeypatch: MonkeyPatch):
+    limiter = RateLimiter(100, 60)
+    def return_empty(*args: Any, **kwargs: Any):
+        class Response:
+            status_code = 200
+            @property
+            def content(self) -> bytes:
+                return json.dumps(self.json()).encode()
+            def json(self) -> dict[str, Any]:
+                return {"pageSize": 1000, "pageNum": 1, "totalCount": 0, "totalPages": 0, "items": []}
+        return Response()
+    monkeypatch.setattr("requests.get", return_empty)
+
+    notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", rate_limiter=limiter)
+    notam_fetcher.fetch_notams_by_latlong_list([(0.0, 0.0), (1.0, 1.0)], 30)
+    assert limiter.stats.requests == 2
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+import threading
+
+import pytest
+from geographiclib.geodesic import Geodesic
+
+from airport_data.airport_data import AirportData
+from notam_fetcher import NotamFetcher
+from notam_fetcher.exceptions import NotamFetcherTimeoutReached
+from notam_fetcher.api_schema import Classification, CoreNOTAMData, Notam, NotamEvent, NotamType
+from notam_spatial_index import parse_notam_coordinates
+from route_briefing import BatchBriefer, QueryCircle, merge_query_circles
+
+ROUTES = [("JFK", "LAX"), ("JFK", "ORD"), ("JFK", "ATL"), ("LGA", "ORD"), ("ORD", "LAX"), ("JFK", "LAX"), ("BOS", "ORD")]
+
+
+def make_core_notam(notam_id: str, lat: float, long: float) -> CoreNOTAMData:
+    now = datetime.now(timezone.utc)
+    lat_hemi, long_hemi = ("N" if lat >= 0 else "S"), ("E" if long >= 0 else "W")
+    lat, long = abs(lat), abs(long)
+    coordinates = f"{int(lat):02d}{round(lat % 1 * 60):02d}{lat_hemi}{int(long):03d}{round(long % 1 * 60):02d}{long_hemi}"
+    return CoreNOTAMData(
+        notam_event=NotamEvent(scenario=6000),
+        notam=Notam(
+            id=notam_id,
+            number="A0001/25",
+            type=NotamType.N,
+            location="KZNY",
+            text="EXAMPLE NOTAM TEXT",
+            classification=Classification.INTL,
+            account_id="KZNY",
+            issued=now,
+            effective_start=now,
+            effective_end=now + timedelta(days=1),
+            last_updated=now,
+            coordinates=coordinates,
+            radius="001",
+        ),
+        notam_translation=[],
+    )
+
+
+def airports(codes: list[tuple[str, str]]):
+    return [(AirportData.get_airport(departure), AirportData.get_airport(destination)) for departure, destination in codes]
+
+
+def test_merge_covers_every_planned_circle():
+    briefer = BatchBriefer(NotamFetcher("CLIENT_ID", "CLIENT_SECRET"))
+    routes = airports(ROUTES)
+    plans = [briefer.plan([route]).queries for route in routes]
+    merge = merge_query_circles(plans)
+
+    assert merge.planned_requests == sum(len(plan) for plan in plans)
+    assert len(merge.queries) < merge.planned_requests
+    # The repeated route and the shared airports need no queries of their own
+    assert len(merge.queries) <= merge.planned_requests - len(plans[0]) - 4
+    for plan, query_positions in zip(plans, merge.route_queries):
+        for circle in plan:
+            containing = [
+                merge.queries[position] for position in query_positions
+                if Geodesic.WGS84.Inverse(*circle.center, *merge.queries[position].center)["s12"] / 1852 + circle.radius
+                <= merge.queries[position].radius
+            ]
+            assert containing, f"{circle} is not covered"
+    assert all(query.radius <= 100 for query in merge.queries)
+
+
+def test_merge_edge_cases():
+    assert merge_query_circles([[], []]).route_queries == [[], []]
+    circle = QueryCircle((40.0, -74.0), 30.0)
+    merge = merge_query_circles([[circle], [QueryCircle((40.0, -74.0), 20.0)]])
+    assert merge.queries == [circle]
+    assert merge.route_queries == [[0], [0]]
+    with pytest.raises(ValueError):
+        merge_query_circles([[QueryCircle((40.0, -74.0), 120.0)]])
+
+
+def test_brief_fetches_each_query_once(monkeypatch: pytest.MonkeyPatch):
+    lock = threading.Lock()
+    queried: list[tuple[float, float, float]] = []
+
+    def mock_fetch_notams_by_latlong(self: NotamFetcher, lat: float, long: float, radius: float = 100.0):
+        with lock:
+            queried.append((lat, long, radius))
+        # One NOTAM at the query center, and one far outside every corridor
+        return [make_core_notam(f"{lat:.4f},{long:.4f}", lat, long), make_core_notam("FAR", -40.0, 20.0)]
+
+    monkeypatch.setattr(NotamFetcher, "fetch_notams_by_latlong", mock_fetch_notams_by_latlong)
+
+    briefer = BatchBriefer(NotamFetcher("CLIENT_ID", "CLIENT_SECRET"))
+    routes = airports(ROUTES)
+    briefings, report = briefer.brief(routes)
+
+    assert len(queried) == report.unique_requests == len(set(queried))
+    assert report.requests_saved > 0
+    assert report.routes == len(routes)
+    assert report.unique_notams == report.unique_requests + 1
+
+    jfk = AirportData.get_airport("JFK").coordinates
+    for briefing, (departure, destination) in zip(briefings, routes):
+        assert (briefing.departure, briefing.destination) == (departure, destination)
+        ids = [notam.notam.id for notam in briefing.notams]
+        assert "FAR" not in ids
+        assert len(ids) == len(set(ids))
+        if departure.icao == "KJFK":
+            # The query at JFK is shared by every route from JFK
+            located = [parse_notam_coordinates(notam.notam.coordinates) for notam in briefing.notams]
+            assert any(abs(lat - jfk[0]) < 0.1 and abs(long - jfk[1]) < 0.1 for lat, long in located)
+    assert briefings[0].notams == briefings[5].notams
+    assert "Requests saved" in str(report)
+
+
+
+def test_brief_skips_queries_not_fetched_in_time(monkeypatch: pytest.MonkeyPatch):
+    routes = airports([("JFK", "ORD"), ("LAX", "SFO")])
+    lax = AirportData.get_airport("LAX").coordinates
+
+    def mock_fetch_notams_by_latlong(self: NotamFetcher, lat: float, long: float, radius: float = 100.0):
+        if abs(lat - lax[0]) < 1 and abs(long - lax[1]) < 1:
+            raise NotamFetcherTimeoutReached
+        return [make_core_notam(f"{lat:.4f},{long:.4f}", lat, long)]
+
+    monkeypatch.setattr(NotamFetcher, "fetch_notams_by_latlong", mock_fetch_notams_by_latlong)
+    briefings, report = BatchBriefer(NotamFetcher("CLIENT_ID", "CLIENT_SECRET")).brief(routes)
+
+    assert briefings[0].complete and briefings[0].notams
+    assert not briefings[1].complete
+    assert all(abs(query.center[0] - lax[0]) < 1 and abs(query.center[1] - lax[1]) < 1 for query in briefings[1].uncovered)
+    assert len(briefings[1].notams) > 0
+    assert report.uncovered_requests == len(briefings[1].uncovered) > 0
+    assert "not fetched in time" in str(report)
@@ -1,7 +1,13 @@
+import json
+import os
 import pytest
 from datetime import datetime, timedelta, UTC
-from notam_fetcher.api_schema import Notam, PurposeType, NotamType, Classification, ScopeType, Series
-from sorting_algorithm.sorting_algorithm import NotamSorter, score_by_purpose, score, score_by_type, score_by_classification, score_by_category_scope
+from benchmarks.synthetic import make_page
+from notam_fetcher.api_schema import APIResponseSuccess, Notam, PurposeType, NotamType, Classification, ScopeType, Series
+from sorting_algorithm.sorting_algorithm import NotamSorter, RunningTopK, score_by_purpose, score, score_by_type, score_by_classification, score_by_category_scope
+from sorting_algorithm import sorting_algorithm
+from sorting_algorithm.batch_scoring import BatchScorer, ReloadingScorer, score_batch
+from sorting_algorithm.rules import ScoringRules, ValueRule
 
 @pytest.fixture
 def sample_notam_1():
@@ -144,4 +150,91 @@ def test_sort_by_score(sample_notam_1: Notam, sample_notam_2: Notam, sample_nota
     sorted_notams = sorter.sort_by_score()
 
     # Verify the order of sorted NOTAMs by their scores
-    assert [notam.id for notam in sorted_notams] == ["004", "001", "002", "005", "003"]
\ No newline at end of file
+    assert [notam.id for notam in sorted_notams] == ["004", "001", "002", "005", "003"]
+def test_running_top_k(sample_notam_1: Notam, sample_notam_2: Notam, sample_notam_3: Notam, sample_notam_4: Notam, sample_notam_5: Notam):
+    notams = [sample_notam_3, sample_notam_5, sample_notam_1, sample_notam_4, sample_notam_2]
+    for k in range(1, 7):
+        top_k = RunningTopK(k)
+        for notam in notams:
+            top_k.add([notam])
+        assert top_k.top() == NotamSorter(notams).sort_by_score()[:k]
+
+    top_k = RunningTopK(1)
+    assert top_k.add([sample_notam_1])
+    assert not top_k.add([sample_notam_3])
+    with pytest.raises(ValueError):
+        RunningTopK(0)
+
+def test_score_batch_matches_score(sample_notam_1: Notam, sample_notam_2: Notam, sample_notam_3: Notam, sample_notam_4: Notam, sample_notam_5: Notam):
+    notams = [sample_notam_1, sample_notam_2, sample_notam_3, sample_notam_4, sample_notam_5]
+    notams += [item.properties.coreNOTAMData.notam for item in APIResponseSuccess.model_validate(make_page(200)).items]
+    assert score_batch(notams).tolist() == [score(notam) for notam in notams]
+    assert len(score_batch([])) == 0
+
+def test_series_default_matches_batch_scorer(monkeypatch: pytest.MonkeyPatch, sample_notam_1: Notam, sample_notam_4: Notam, sample_notam_5: Notam):
+    """Test that score and BatchScorer agree when series has a default score"""
+    rules = ScoringRules.default()
+    rules = rules.model_copy(update={"series": ValueRule[Series](scores=rules.series.scores, default=3)})
+    monkeypatch.setattr(sorting_algorithm, "SERIES_DEFAULT", 3)
+
+    notams = [sample_notam_1, sample_notam_4, sample_notam_5] # no series, R, C
+    assert score_by_category_scope(sample_notam_1) == 3
+    assert BatchScorer(rules).score(notams).tolist() == [score(notam) for notam in notams]
+
+def test_sort_by_score_matches_sorted(sample_notam_1: Notam, sample_notam_2: Notam, sample_notam_3: Notam, sample_notam_4: Notam, sample_notam_5: Notam):
+    """Test that batch sorting keeps the order of equal scores, like sorted()"""
+    notams = [sample_notam_2, sample_notam_3, sample_notam_1, sample_notam_4, sample_notam_5] * 3
+    assert NotamSorter(notams).sort_by_score() == sorted(notams, key=score, reverse=True)
+    assert NotamSorter([]).sort_by_score() == []
+
+def test_top_k_and_iter_ranked(sample_notam_1: Notam, sample_notam_2: Notam, sample_notam_3: Notam, sample_notam_4: Notam, sample_notam_5: Notam):
+    notams = [sample_notam_3, sample_notam_5, sample_notam_1, sample_notam_4, sample_notam_2] * 2
+    sorter = NotamSorter(notams)
+    ranked = sorter.sort_by_score()
+    for k in range(0, len(notams) + 2):
+        assert sorter.top_k(k) == ranked[:k]
+    assert list(sorter.iter_ranked()) == ranked
+
+    ranking = sorter.iter_ranked()
+    assert next(ranking).id == "004"
+    assert next(ranking).id == "004"
+    assert NotamSorter([]).top_k(3) == []
+    with pytest.raises(ValueError):
+        sorter.top_k(-1)
+
+def test_scoring_rules_keywords_and_time_windows(sample_notam_1: Notam, sample_notam_2: Notam, sample_notam_3: Notam):
+    rules = ScoringRules.model_validate({
+        "keywords": [{"pattern": r"runway \S+ closed", "score": 30}, {"pattern": "closed", "score": 5}, {"pattern": "obstacle", "score": 7}],
+        "time_windows": [{"start_hours": 0, "end_hours": 2, "score": 1}, {"start_hours": 2, "end_hours": 4, "score": 10}],
+    })
+    now = datetime.now(UTC)
+    scores = BatchScorer(rules).score([sample_notam_1, sample_notam_2, sample_notam_3], now)
+    # 1: runway closed, in effect for 5 hours; 2: taxiway closed, 3 hours; 3: obstacle, 1 hour
+    assert scores.tolist() == [30 + 5 + 1 + 10, 5 + 1 + 10, 7 + 1]
+    assert BatchScorer(rules).score([sample_notam_1], now + timedelta(hours=6)).tolist() == [30 + 5]
+    # Keywords matching at the same position are all found
+    rules = ScoringRules.model_validate({"keywords": [{"pattern": r"runway \S+ closed", "score": 30}, {"pattern": "runway", "score": 2}]})
+    assert BatchScorer(rules).score([sample_notam_1, sample_notam_2], now).tolist() == [30 + 2, 0]
+
+    with pytest.raises(ValueError):
+        ScoringRules.model_validate({"keywords": [{"pattern": "(", "score": 1}]})
+    with pytest.raises(ValueError):
+        ScoringRules.model_validate({"type": {"scores": {"X": 1}}})
+    with pytest.raises(ValueError):
+        ScoringRules.model_validate({"time_windows": [{"start_hours": 2, "end_hours": 1, "score": 1}]})
+
+def test_reloading_scorer(tmp_path, sample_notam_1: Notam, sample_notam_2: Notam):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"purpose": {"scores": {"N": 1, "B": 2}}}))
+    scorer = ReloadingScorer(path, check_interval=0)
+    sorter = NotamSorter([sample_notam_1, sample_notam_2], scorer)
+    assert [notam.id for notam in sorter.sort_by_score()] == ["002", "001"]
+
+    path.write_text(json.dumps({"purpose": {"scores": {"N": 3, "B": 2}}}))
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    assert [notam.id for notam in sorter.sort_by_score()] == ["001", "002"]
+
+    # Invalid rules are not loaded
+    path.write_text("{")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 2 * 10**9))
+    assert scorer.score([sample_notam_1, sample_notam_2]).tolist() == [3, 2]
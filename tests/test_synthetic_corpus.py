@@ -0,0 +1,50 @@
+from pathlib import Path
+import json
+
+from benchmarks.synthetic import iter_corpus, main, paginate, read_ndjson, write_json, write_ndjson
+from fake_notam_api import RecordedNotams
+from notam_fetcher.api_schema import APIResponseSuccess, ItemGeometry
+from notam_fetcher.notam_fetcher import _parse_response
+
+ITEMS = list(iter_corpus(2000, seed=7))
+
+
+def test_pages_are_valid_responses():
+    pages = list(paginate(ITEMS, len(ITEMS), page_size=300))
+    assert [page["pageNum"] for page in pages] == [1, 2, 3, 4, 5, 6, 7]
+    assert len(pages[-1]["items"]) == 200
+    for page in pages:
+        response = _parse_response(json.dumps(page).encode())
+        assert isinstance(response, APIResponseSuccess)
+        for item in page["items"]:
+            ItemGeometry.model_validate(item["geometry"])
+
+
+def test_distributions():
+    notams = [item["properties"]["coreNOTAMData"]["notam"] for item in ITEMS]
+    assert {notam["type"] for notam in notams} == {"N", "R", "C"}
+    assert {notam["classification"] for notam in notams} >= {"DOM", "INTL", "FDC", "MIL"}
+    assert 0.03 < sum(notam["effectiveEnd"] == "PERM" for notam in notams) / len(notams) < 0.15
+    assert len({notam["id"] for notam in notams}) == len(notams)
+
+    geometries = [geometry["type"] for item in ITEMS for geometry in item["geometry"].get("geometries", [])]
+    assert {"Point", "Polygon"} <= set(geometries)
+    translations = {translation["type"] for item in ITEMS for translation in item["properties"]["coreNOTAMData"]["notamTranslation"]}
+    assert translations == {"LOCAL_FORMAT", "ICAO"}
+
+
+def test_seeded():
+    assert list(iter_corpus(100, seed=7)) == ITEMS[:100]
+    assert list(iter_corpus(100, seed=8)) != ITEMS[:100]
+
+
+def test_write_and_read(tmp_path: Path):
+    write_ndjson(tmp_path / "corpus.ndjson", 250, seed=7)
+    assert list(read_ndjson(tmp_path / "corpus.ndjson")) == ITEMS[:250]
+
+    paths = write_json(tmp_path / "pages", 250, seed=7, page_size=100)
+    assert len(paths) == 3
+    assert RecordedNotams.from_directory(tmp_path / "pages").items == ITEMS[:250]
+
+    main(["--count", "10", "--ndjson", str(tmp_path / "cli.ndjson")])
+    assert len(list(read_ndjson(tmp_path / "cli.ndjson"))) == 10
@@ -0,0 +1,111 @@
+from pathlib import Path
+import json, threading
+
+import pytest
+
+from benchmarks.synthetic import make_page
+from fake_notam_api import FakeNotamAPIServer, RecordedNotams
+from notam_fetcher import NotamFetcher, RateLimiter
+from tracing import (JSONLinesSpanExporter, MemorySpanExporter, OTLPJSONSpanExporter, Tracer, current_span,
+                     in_current_context, set_tracer, span)
+
+
+@pytest.fixture
+def exporter():
+    exporter = MemorySpanExporter()
+    set_tracer(Tracer([exporter]))
+    yield exporter
+    set_tracer(None)
+
+
+def test_disabled():
+    def function():
+        pass
+
+    with span("stage", attribute=1) as disabled_span:
+        disabled_span.set_attribute("other", 2)
+        assert current_span() is None
+    assert span("other") is disabled_span
+    assert in_current_context(function) is function
+
+
+def test_nesting(exporter: MemorySpanExporter):
+    with span("briefing", route="JFK-BOS") as root:
+        with span("fetch") as fetch:
+            fetch.set_attribute("notams", 3)
+            assert current_span() is fetch
+        with pytest.raises(ValueError):
+            with span("render"):
+                raise ValueError("no NOTAMs")
+    assert current_span() is None
+
+    fetch_span, render_span, root_span = exporter.spans
+    assert root_span is root and root.parent_id is None and root.attributes == {"route": "JFK-BOS"}
+    assert fetch_span.parent_id == render_span.parent_id == root.span_id
+    assert {fetch_span.trace_id, render_span.trace_id} == {root.trace_id}
+    assert fetch_span.attributes == {"notams": 3} and fetch_span.error is None
+    assert render_span.error == "ValueError: no NOTAMs"
+    assert 0 <= fetch_span.duration <= root.duration
+
+    with span("next briefing") as other:
+        pass
+    assert other.trace_id != root.trace_id
+
+
+def test_fetcher_spans(exporter: MemorySpanExporter):
+    server = FakeNotamAPIServer(RecordedNotams(make_page(500)["items"]))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        notam_fetcher = NotamFetcher("CLIENT_ID", "CLIENT_SECRET", page_size=2, rate_limiter=RateLimiter(1000, 1),
+                                     api_url=server.url)
+        with span("briefing") as root:
+            notam_fetcher.fetch_notams_by_latlong_list([(38, -97), (40, -100)], 100)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Spans opened on the executor threads belong to the caller's trace
+    by_id = {finished.span_id: finished for finished in exporter.spans}
+    assert {finished.trace_id for finished in exporter.spans} == {root.trace_id}
+    requests = [finished for finished in exporter.spans if finished.name == "http.request"]
+    assert len(requests) == server.stats.requests > 2
+    for request in requests:
+        assert request.attributes["http.response.status_code"] == 200
+        page = by_id[request.parent_id]
+        assert page.name == "notam_fetcher.page"
+        assert by_id[page.parent_id].name == "notam_fetcher.fetch_all"
+    names = {finished.name for finished in exporter.spans}
+    assert {"notam_fetcher.fetch_latlong_list", "notam_fetcher.query", "notam_fetcher.validate",
+            "notam_fetcher.dedupe", "rate_limiter.acquire"} <= names
+
+
+def test_export(tmp_path: Path):
+    otlp = OTLPJSONSpanExporter(tmp_path / "trace.otlp.json", service_name="test")
+    tracer = Tracer([JSONLinesSpanExporter(tmp_path / "trace.jsonl"), otlp])
+    set_tracer(tracer)
+    try:
+        with span("briefing", notams=2, ratio=0.5, local=True, route="JFK-BOS"):
+            with span("fetch"):
+                pass
+    finally:
+        set_tracer(None)
+        tracer.shutdown()
+
+    lines = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["fetch", "briefing"]
+    assert lines[0]["parent_id"] == lines[1]["span_id"]
+
+    request = json.loads((tmp_path / "trace.otlp.json").read_text())
+    resource_spans = request["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "test"}}]
+    fetch, briefing = resource_spans["scopeSpans"][0]["spans"]
+    assert len(briefing["traceId"]) == 32 and len(briefing["spanId"]) == 16 and "parentSpanId" not in briefing
+    assert fetch["parentSpanId"] == briefing["spanId"]
+    assert int(briefing["endTimeUnixNano"]) >= int(briefing["startTimeUnixNano"])
+    assert briefing["attributes"] == [
+        {"key": "notams", "value": {"intValue": "2"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "local", "value": {"boolValue": True}},
+        {"key": "route", "value": {"stringValue": "JFK-BOS"}},
+    ]
+    assert briefing["status"] == {"code": 1}
@@ -0,0 +1,4 @@
+from .tracing import Span, Tracer, span, current_span, get_tracer, set_tracer, in_current_context
+from .exporters import SpanExporter, MemorySpanExporter, JSONLinesSpanExporter, OTLPJSONSpanExporter
+
+__all__ = ["Span", "Tracer", "span", "current_span", "get_tracer", "set_tracer", "in_current_context", "SpanExporter", "MemorySpanExporter", "JSONLinesSpanExporter", "OTLPJSONSpanExporter"]
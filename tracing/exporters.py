@@ -0,0 +1,129 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+import json, logging
+
+if TYPE_CHECKING:
+    from .tracing import Span
+
+# OpenTelemetry span kind and status codes, see opentelemetry/proto/trace/v1/trace.proto
+_SPAN_KIND_INTERNAL = 1
+_STATUS_CODE_OK = 1
+_STATUS_CODE_ERROR = 2
+
+
+class SpanExporter(ABC):
+    """
+    Base class for destinations of finished spans.
+
+    export is called once per span as it finishes, never concurrently.
+    """
+    @abstractmethod
+    def export(self, span: "Span"):
+        pass
+
+    def shutdown(self):
+        """
+        Writes out anything buffered. Spans exported after shutdown may be lost.
+        """
+        pass
+
+
+class MemorySpanExporter(SpanExporter):
+    """
+    Keeps finished spans in a list, ex: for tests.
+    """
+    def __init__(self):
+        self.spans: list["Span"] = []
+
+    def export(self, span: "Span"):
+        self.spans.append(span)
+
+
+class JSONLinesSpanExporter(SpanExporter):
+    """
+    Appends each finished span to a file as one JSON object per line (see Span.to_dict).
+
+    Children finish before their parents, so a trace's root span is its last line.
+    """
+    logger = logging.getLogger("JSONLinesSpanExporter")
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = open(self.path, "a")
+
+    def export(self, span: "Span"):
+        self._file.write(json.dumps(span.to_dict()) + "\n")
+        self._file.flush()
+
+    def shutdown(self):
+        self._file.close()
+        self.logger.info(f"Wrote spans to {self.path}")
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    # bool first, bool is a subclass of int. 64 bit integers are strings in OTLP JSON
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_span(span: "Span") -> dict[str, Any]:
+    """
+    Returns span in the OpenTelemetry protocol's JSON encoding.
+    """
+    otlp: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+        "status": {"code": _STATUS_CODE_OK} if span.error is None else {"code": _STATUS_CODE_ERROR, "message": span.error},
+    }
+    if span.parent_id is not None:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+class OTLPJSONSpanExporter(SpanExporter):
+    """
+    Writes every span as an OpenTelemetry ExportTraceServiceRequest in the OTLP/JSON encoding on shutdown.
+
+    The file can be POSTed as is to an OpenTelemetry collector's /v1/traces endpoint, or loaded by tools that read
+    OTLP JSON (ex: Jaeger's UI).
+    """
+    logger = logging.getLogger("OTLPJSONSpanExporter")
+
+    def __init__(self, path: str | Path, service_name: str = "notam-briefing"):
+        """
+        Args:
+            path (str | Path): The file written on shutdown, replacing any earlier file.
+            service_name (str): The service.name resource attribute the spans are reported under.
+        """
+        self.path = Path(path)
+        self.service_name = service_name
+        self._spans: list[dict[str, Any]] = []
+
+    def export(self, span: "Span"):
+        self._spans.append(otlp_span(span))
+
+    def request(self) -> dict[str, Any]:
+        """
+        Returns the ExportTraceServiceRequest holding every span exported so far.
+        """
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "tracing"}, "spans": self._spans}],
+            }]
+        }
+
+    def shutdown(self):
+        self.path.write_text(json.dumps(self.request()))
+        self.logger.info(f"Wrote {len(self._spans)} spans to {self.path}")
@@ -0,0 +1,198 @@
+from contextvars import ContextVar, Token, copy_context
+from typing import Any, Callable, Iterable, Optional, TypeVar
+import functools, logging, os, threading, time
+
+from .exporters import SpanExporter
+
+T = TypeVar("T")
+
+AttributeValue = str | int | float | bool
+
+# The span code running in this thread or task belongs to
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+# Spans are only recorded while a tracer is set, see set_tracer
+_tracer: Optional["Tracer"] = None
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+class Span:
+    """
+    A timed operation, ex: one HTTP request, with the attributes it was run with.
+
+    Spans opened while another span is current (in the same thread, or in a thread started with in_current_context)
+    are its children and share its trace_id. Use as a context manager: the span is current and running inside the
+    with block, and is exported when it exits. An exception leaving the block marks the span as failed.
+    """
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_time", "end_time", "attributes", "error",
+                 "_tracer", "_token", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: dict[str, AttributeValue]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else _new_id(16)
+        self.span_id = _new_id(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        self.start_time = 0 # nanoseconds since epoch
+        self.end_time = 0
+        self.error: str | None = None # the exception that ended the span, if any
+        self._tracer = tracer
+        self._token: Token | None = None
+        self._start = 0
+
+    @property
+    def duration(self) -> float:
+        """
+        Seconds the span ran for, measured on a monotonic clock.
+        """
+        return (self.end_time - self.start_time) / 1e9
+
+    def set_attribute(self, key: str, value: AttributeValue):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: AttributeValue):
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.start_time = time.time_ns()
+        self._start = time.perf_counter_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Wall clock start, monotonic duration, so clock adjustments never make a span negative
+        self.end_time = self.start_time + time.perf_counter_ns() - self._start
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc_value}"
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self._tracer._finish(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """
+    The span returned while tracing is disabled. Records nothing.
+    """
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: AttributeValue):
+        pass
+
+    def set_attributes(self, **attributes: AttributeValue):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Creates spans and hands every finished span to its exporters.
+    """
+    logger = logging.getLogger("Tracer")
+
+    def __init__(self, exporters: Iterable[SpanExporter]):
+        """
+        Args:
+            exporters (Iterable[SpanExporter]): Receive each span as it finishes.
+        """
+        self.exporters = list(exporters)
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes: AttributeValue) -> Span:
+        """
+        Returns a new span, a child of the current span if there is one. It starts when its with block is entered.
+        """
+        return Span(self, name, _current_span.get(), attributes)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            for exporter in self.exporters:
+                try:
+                    exporter.export(span)
+                except Exception:
+                    self.logger.exception(f"Failed to export span {span.name}")
+
+    def shutdown(self):
+        """
+        Flushes and closes every exporter.
+        """
+        with self._lock:
+            for exporter in self.exporters:
+                exporter.shutdown()
+
+
+def set_tracer(tracer: Tracer | None):
+    """
+    Records spans with tracer from now on, or disables tracing if None.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Tracer | None:
+    return _tracer
+
+
+def span(name: str, **attributes: AttributeValue) -> Span | _NoopSpan:
+    """
+    Returns a span for an operation, to be used as a context manager:
+
+        with span("notam_fetcher.page", page_num=2) as page_span:
+            ...
+            page_span.set_attribute("items", len(items))
+
+    While no tracer is set this returns a shared span that records nothing, so instrumented code costs only this call.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.span(name, **attributes)
+
+
+def current_span() -> Span | None:
+    """
+    Returns the span the calling code runs in, if any.
+    """
+    return _current_span.get()
+
+
+def in_current_context(function: Callable[..., T]) -> Callable[..., T]:
+    """
+    Returns function bound to the caller's current span, for running it on another thread, ex:
+
+        executor.submit(in_current_context(fetch), request)
+
+    Threads do not inherit context variables, so without this spans opened by function would start new traces.
+    While tracing is disabled function is returned as is.
+    """
+    if _tracer is None:
+        return function
+    context = copy_context()
+
+    @functools.wraps(function)
+    def run(*args: Any, **kwargs: Any) -> T:
+        # A context can only be entered by one thread at a time, each call gets its own copy
+        return context.copy().run(function, *args, **kwargs)
+    return run